@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the Lambda entry point
+
+Imports the app in fresh interpreters with -X importtime and reports the
+import time per module, then times client pre-warming separately. Run from
+the backend directory.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --module writers_block_service.core.logging --top 30
+    python benchmarks/import_time.py --runs 5 --warm
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PACKAGE = "writers_block_service"
+
+WARM_SNIPPET = """
+import time
+start = time.perf_counter()
+from writers_block_service.main import llm_service
+from writers_block_service.core.logging import cloudwatch_logger
+imported = time.perf_counter()
+llm_service.warm()
+cloudwatch_logger.warm()
+warmed = time.perf_counter()
+print(f"{(imported - start) * 1000:.1f} {(warmed - imported) * 1000:.1f}")
+"""
+
+
+def run_python(args, env_overrides=None) -> subprocess.CompletedProcess:
+    env = {**os.environ, **(env_overrides or {})}
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
+def import_times(module: str):
+    """
+    Import module in a fresh interpreter and parse -X importtime output
+
+    Returns:
+        List of (module, self_us, cumulative_us) in import order
+    """
+    result = run_python(["-X", "importtime", "-c", f"import {module}"])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def report_imports(module: str, top: int):
+    rows = import_times(module)
+    total_us = next((cumulative for name, _, cumulative in rows if name == module), 0)
+    print(f"Import of {module}: {total_us / 1000:.1f} ms ({len(rows)} modules)\n")
+
+    print(f"{PACKAGE} modules (cumulative):")
+    for name, _, cumulative in sorted((r for r in rows if r[0].startswith(PACKAGE)),
+                                      key=lambda r: r[2], reverse=True):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    # Top-level third-party packages, cumulative
+    packages = {}
+    for name, _, cumulative in rows:
+        if "." not in name and not name.startswith(PACKAGE):
+            packages[name] = max(packages.get(name, 0), cumulative)
+    print(f"\nTop {top} top-level packages (cumulative):")
+    for name, cumulative in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    print(f"\nTop {top} modules (self time):")
+    for name, self_us, _ in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+
+def report_warm(runs: int):
+    """Time import and client pre-warming across fresh interpreters"""
+    import_ms, warm_ms = [], []
+    for _ in range(runs):
+        output = run_python(["-c", WARM_SNIPPET]).stdout.split()
+        import_ms.append(float(output[-2]))
+        warm_ms.append(float(output[-1]))
+    print(f"\nFresh-interpreter timings over {runs} runs (median):")
+    print(f"  import main: {statistics.median(import_ms):8.1f} ms")
+    print(f"  warm():      {statistics.median(warm_ms):8.1f} ms  (Lambda init phase)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import time per module")
+    parser.add_argument("--module", default=f"{PACKAGE}.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=15, help="Rows per section")
+    parser.add_argument("--warm", action="store_true",
+                        help="Also time client pre-warming (needs AWS credentials for real clients)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs for --warm timings")
+    args = parser.parse_args()
+
+    report_imports(args.module, args.top)
+    if args.warm:
+        report_warm(args.runs)
+
+
+if __name__ == "__main__":
+    main()
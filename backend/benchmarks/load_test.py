@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Load test for the text processing API
+
+Runs the FastAPI app in-process against the Bedrock simulator (no AWS access
+needed), or against a running server with --url. Requires httpx (dev extra).
+
+Usage:
+    python benchmarks/load_test.py --requests 2000 --concurrency 100
+    SIMULATOR_THROTTLE_RATE=0.05 python benchmarks/load_test.py --unique 0.3
+    python benchmarks/load_test.py --url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SAMPLE_SENTENCES = [
+    "This are a sentence with grammer mistakes.",
+    "Their going to the store tomorow to buy some grocerys.",
+    "Hey, can you get this done ASAP? We need it for the meeting.",
+    "The quarterly results was better then expected in most regions.",
+    "I has been working on this project for three weeks now."
+]
+
+ACTIONS = [
+    ("grammar_fix", {}),
+    ("rephrase", {"tone": "professional"}),
+    ("rephrase", {"tone": "casual"}),
+    ("rephrase", {"custom_prompt": "Make this more concise: {selected_text}"})
+]
+
+
+def build_payload(index: int, unique_ratio: float, sentences: int) -> dict:
+    """Build a request payload; a share of requests repeats earlier text"""
+    unique = random.random() < unique_ratio
+    rng = random.Random(index if unique else -(index % 10))
+    action, parameters = rng.choice(ACTIONS)
+    text = " ".join(rng.choice(SAMPLE_SENTENCES) for _ in range(sentences))
+    if unique:
+        text = f"{text} (#{index})"
+    return {"selected_text": text, "action": action, "parameters": parameters}
+
+
+def outcome(response) -> str:
+    """Read success from a JSON response or the final SSE event"""
+    try:
+        body = response.text
+        if body.startswith("event:"):
+            body = body.rsplit("data: ", 1)[1]
+        return "ok" if json.loads(body).get("success") else "failed"
+    except (ValueError, IndexError, AttributeError):
+        return "unparsed"
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(args):
+    import httpx
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=120)
+    else:
+        os.environ.setdefault("BEDROCK_TRANSPORT", "simulator")
+        os.environ.setdefault("ENABLE_CLOUDWATCH_LOGGING", "false")
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        from writers_block_service.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://load-test",
+            timeout=120
+        )
+
+    path = "/api/v1/process-text/stream" if args.stream else "/api/v1/process-text"
+    latencies, statuses = [], Counter()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(index: int):
+        payload = build_payload(index, args.unique, args.sentences)
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=payload)
+                await response.aread()
+                statuses[f"{response.status_code} {outcome(response)}"] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+                return
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    async with client:
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    print(f"Requests:     {args.requests} ({args.concurrency} concurrent, {path})")
+    print(f"Elapsed:      {elapsed:.2f}s")
+    print(f"Throughput:   {args.requests / elapsed:.1f} req/s")
+    print(f"Statuses:     {dict(statuses)}")
+    if latencies:
+        print(f"Latency ms:   mean={statistics.mean(latencies):.1f} "
+              f"p50={percentile(latencies, 50):.1f} p95={percentile(latencies, 95):.1f} "
+              f"p99={percentile(latencies, 99):.1f} max={max(latencies):.1f}")
+
+    if not args.url:
+        from writers_block_service.controller.routes import llm_service
+
+        if llm_service.result_cache is not None:
+            print(f"Result cache: {llm_service.result_cache.stats()}")
+        if llm_service.single_flight is not None:
+            print(f"Single flight: {llm_service.single_flight.stats()}")
+        print(f"Resilience:   {llm_service.resilience_stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the text processing API")
+    parser.add_argument("--requests", type=int, default=500, help="Total requests")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent requests")
+    parser.add_argument("--unique", type=float, default=1.0,
+                        help="Share of requests with unique text (rest repeat, hitting the cache)")
+    parser.add_argument("--sentences", type=int, default=3, help="Sentences per request")
+    parser.add_argument("--stream", action="store_true", help="Use the streaming endpoint")
+    parser.add_argument("--url", help="Target a running server instead of the in-process app")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for per-request structured logging cost
+
+Times the request_start + request_success log calls of one request, with
+CloudWatch shipping stubbed out, so only the in-process work is measured
+(entry building, sanitizing, hashing, JSON encoding, sampling). "legacy" is
+the previous implementation of that path, reproduced inline for comparison.
+
+Usage:
+    python benchmarks/logging_overhead.py
+    python benchmarks/logging_overhead.py --requests 50000 --sample-rate 0.05
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from writers_block_service.core import logging as wb_logging  # noqa: E402
+from writers_block_service.core.config import settings  # noqa: E402
+from writers_block_service.core.log_encoder import orjson  # noqa: E402
+
+TEMPLATE = "Rewrite this for an executive summary, keep it under three sentences: {selected_text}"
+
+
+def legacy_sanitize(value, max_length=100):
+    if value is None:
+        return "[null]"
+    text = str(value)
+    sanitized = re.sub(r'[\r\n\t\x00-\x1f\x7f-\x9f]', ' ', text)
+    if len(sanitized) > max_length:
+        text_hash = hashlib.sha256(text.encode()).hexdigest()[:8]
+        return f"{sanitized[:max_length]}...[hash:{text_hash}]"
+    return sanitized
+
+
+def legacy_request(session_id: str, sink: list):
+    """Previous request_start + request_success logging path"""
+    def entry(event, **kwargs):
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "level": "INFO",
+            "event": event,
+            "session_id": legacy_sanitize(session_id, 12),
+            "environment": settings.ENVIRONMENT,
+            **kwargs
+        }
+
+    start = {"action": "rephrase", "text_length": 240, "has_custom_prompt": True,
+             "prompt_template": legacy_sanitize(TEMPLATE, 200),
+             "prompt_template_hash": hashlib.sha256(TEMPLATE.encode()).hexdigest()[:8]}
+    stream_name = f"lambda-{datetime.utcnow().strftime('%Y-%m-%d')}"
+    sink.append((stream_name, json.dumps(entry("request_start", **start))))
+    success = {"action": "rephrase", "processing_time_ms": round(812.3456, 2),
+               "output_length": 230, "status": "success"}
+    stream_name = f"lambda-{datetime.utcnow().strftime('%Y-%m-%d')}"
+    sink.append((stream_name, json.dumps(entry("request_success", **success))))
+
+
+def current_request(logger, session_id: str):
+    logger.log_request_start(session_id, "rephrase", 240, has_custom_prompt=True,
+                             prompt_template=TEMPLATE)
+    logger.log_request_success(session_id, "rephrase", 812.3456, 230)
+
+
+def make_logger(sample_rate: float, sink: list):
+    settings.ENABLE_CLOUDWATCH_LOGGING = True
+    settings.CLOUDWATCH_LOG_MODE = "api"
+    settings.LOG_SAMPLE_RATES = (
+        f"request_start={sample_rate},request_success={sample_rate}" if sample_rate < 1 else ""
+    )
+    logger = wb_logging.CloudWatchLogger()
+    logger.shipper.submit = lambda stream, timestamp_ms, message: sink.append(message)
+    return logger
+
+
+def measure(label: str, fn, session_ids, sink: list):
+    sink.clear()
+    start = time.perf_counter()
+    for session_id in session_ids:
+        fn(session_id)
+    elapsed = time.perf_counter() - start
+    per_request_us = elapsed / len(session_ids) * 1e6
+    print(f"  {label:<32} {per_request_us:7.2f} us/request  ({len(sink)} lines)")
+    return per_request_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-request logging cost")
+    parser.add_argument("--requests", type=int, default=20000, help="Simulated requests")
+    parser.add_argument("--sample-rate", type=float, default=0.1,
+                        help="Keep rate for routine events in the sampled run")
+    args = parser.parse_args()
+
+    session_ids = [f"session_{uuid.uuid4().hex[:12]}" for _ in range(args.requests)]
+    sink: list = []
+    print(f"Logging cost per request ({args.requests} requests, "
+          f"encoder: {'orjson' if orjson else 'stdlib json'})")
+
+    baseline = measure("legacy", lambda sid: legacy_request(sid, sink), session_ids, sink)
+    logger = make_logger(1.0, sink)
+    current = measure("current (no sampling)", lambda sid: current_request(logger, sid),
+                      session_ids, sink)
+    sampled_logger = make_logger(args.sample_rate, sink)
+    sampled = measure(f"current (sample {args.sample_rate:g})",
+                      lambda sid: current_request(sampled_logger, sid), session_ids, sink)
+
+    print(f"\n  speedup: {baseline / current:.1f}x unsampled, {baseline / sampled:.1f}x sampled")
+
+
+if __name__ == "__main__":
+    main()
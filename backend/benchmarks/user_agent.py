@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for user-agent classification
+
+Classifies a weighted corpus of real-world User-Agent strings (extension
+users are mostly desktop Chrome, with Edge, Safari, Firefox, Opera and a few
+mobile browsers). "legacy" is the previous FeedbackService parser,
+reproduced inline; "uncached" is the single-pass classifier with its memo
+cleared before every call, "memoized" the classifier as used in the service.
+Rows where the two disagree are listed after the timings.
+
+Usage:
+    python benchmarks/user_agent.py
+    python benchmarks/user_agent.py --lookups 200000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from writers_block_service.utils import user_agent as wb_user_agent  # noqa: E402
+
+# (weight, user agent)
+CORPUS = [
+    (40, "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+         "Chrome/126.0.0.0 Safari/537.36"),
+    (18, "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) "
+         "Chrome/126.0.0.0 Safari/537.36"),
+    (12, "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+         "Chrome/126.0.0.0 Safari/537.36 Edg/126.0.2592.87"),
+    (6, "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/125.0.0.0 Safari/537.36"),
+    (5, "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+        "Version/17.5 Safari/605.1.15"),
+    (5, "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:127.0) Gecko/20100101 Firefox/127.0"),
+    (4, "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/126.0.0.0 Safari/537.36 OPR/111.0.0.0"),
+    (3, "Mozilla/5.0 (X11; CrOS x86_64 14541.0.0) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/126.0.0.0 Safari/537.36"),
+    (2, "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0"),
+    (2, "Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/126.0.0.0 Mobile Safari/537.36"),
+    (1, "Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 "
+        "(KHTML, like Gecko) Version/17.5 Mobile/15E148 Safari/604.1"),
+    (1, "Mozilla/5.0 (iPad; CPU OS 17_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+        "CriOS/126.0.6478.54 Mobile/15E148 Safari/604.1"),
+    (1, "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/126.0.0.0 Mobile Safari/537.36 EdgA/126.0.2592.80"),
+]
+
+
+def legacy_extract_browser_info(user_agent):
+    """Previous FeedbackService._extract_browser_info"""
+    if not user_agent:
+        return {"browser": "unknown", "version": "unknown", "platform": "unknown"}
+    browser_patterns = {
+        "Chrome": r"Chrome/(\d+\.\d+)",
+        "Firefox": r"Firefox/(\d+\.\d+)",
+        "Safari": r"Safari/(\d+\.\d+)",
+        "Edge": r"Edg/(\d+\.\d+)",
+        "Opera": r"OPR/(\d+\.\d+)"
+    }
+    browser = "unknown"
+    version = "unknown"
+    for browser_name, pattern in browser_patterns.items():
+        match = re.search(pattern, user_agent)
+        if match:
+            browser = browser_name
+            version = match.group(1)
+            break
+    platform = "unknown"
+    if "Windows" in user_agent:
+        platform = "Windows"
+    elif "Macintosh" in user_agent or "Mac OS" in user_agent:
+        platform = "macOS"
+    elif "Linux" in user_agent:
+        platform = "Linux"
+    elif "Android" in user_agent:
+        platform = "Android"
+    elif "iPhone" in user_agent or "iPad" in user_agent:
+        platform = "iOS"
+    return {"browser": browser, "version": version, "platform": platform}
+
+
+def uncached(user_agent):
+    wb_user_agent._classify.cache_clear()
+    return wb_user_agent.classify_user_agent(user_agent)
+
+
+def measure(label: str, fn, lookups) -> float:
+    start = time.perf_counter()
+    for user_agent in lookups:
+        fn(user_agent)
+    per_lookup_us = (time.perf_counter() - start) / len(lookups) * 1e6
+    print(f"  {label:<12} {per_lookup_us:7.2f} us/lookup")
+    return per_lookup_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure user-agent classification cost")
+    parser.add_argument("--lookups", type=int, default=100000, help="Classifications to time")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus sampling seed")
+    args = parser.parse_args()
+
+    weights, user_agents = zip(*CORPUS)
+    lookups = random.Random(args.seed).choices(user_agents, weights=weights, k=args.lookups)
+    print(f"User-agent classification ({args.lookups} lookups, {len(CORPUS)} distinct UAs)")
+
+    baseline = measure("legacy", legacy_extract_browser_info, lookups)
+    single_pass = measure("uncached", uncached, lookups)
+    wb_user_agent._classify.cache_clear()
+    memoized = measure("memoized", wb_user_agent.classify_user_agent, lookups)
+    print(f"\n  speedup: {baseline / single_pass:.1f}x uncached, {baseline / memoized:.1f}x memoized")
+
+    print("\n  classification changes (legacy -> current):")
+    for user_agent in user_agents:
+        old = legacy_extract_browser_info(user_agent)
+        new = wb_user_agent.classify_user_agent(user_agent)
+        old_row = (old["browser"], old["version"], old["platform"])
+        if old_row != tuple(new):
+            print(f"    {'/'.join(old_row):<28} -> {'/'.join(new):<28} {user_agent[:60]}...")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Shared test configuration
+Runs the service against the local Bedrock simulator with fast timings
+"""
+
+import os
+
+# Must be set before writers_block_service.core.config is imported
+os.environ.setdefault("BEDROCK_TRANSPORT", "simulator")
+os.environ.setdefault("SIMULATOR_TTFT_MS", "5")
+os.environ.setdefault("SIMULATOR_LATENCY_SIGMA", "0")
+os.environ.setdefault("SIMULATOR_TOKENS_PER_SECOND", "100000")
+os.environ.setdefault("ENABLE_CLOUDWATCH_LOGGING", "false")
+os.environ.setdefault("ENABLE_RESULT_CACHE", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
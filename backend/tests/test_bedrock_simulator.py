@@ -0,0 +1,53 @@
+"""
+Tests for the simulated Bedrock transport's echo of the text to process
+"""
+
+import pytest
+
+from writers_block_service.services.bedrock_simulator import SimulatorTransport
+from writers_block_service.services.llm_service import LLMService
+
+MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+LONG_TEXT = " ".join(f'Sentence {i} says "hi".' for i in range(1500))
+
+
+def body_for(prompt: str) -> dict:
+    return {"max_tokens": 4096, "system": "", "messages": [{"role": "user", "content": prompt}]}
+
+
+def test_chunk_prompt_echoes_only_the_text():
+    service = LLMService()
+    prompt = service._build_chunk_prompt('He said "hello"', 1, 3, "grammar_fix", {}, "session")
+
+    text, _, _ = SimulatorTransport("us-east-1", seed=1)._generate(MODEL_ID, body_for(prompt))
+
+    assert text == 'He said "hello"'
+
+
+def test_custom_prompt_is_echoed_whole():
+    prompt = "Make this shorter: some text"
+
+    text, _, _ = SimulatorTransport("us-east-1", seed=1)._generate(MODEL_ID, body_for(prompt))
+
+    assert text == prompt
+
+
+@pytest.mark.asyncio
+async def test_chunked_request_returns_the_original_text():
+    service = LLMService()
+    service.result_cache = None
+
+    result = await service.process_text(LONG_TEXT, "grammar_fix", {}, "session")
+
+    assert result == LONG_TEXT
+
+
+@pytest.mark.asyncio
+async def test_chunked_stream_returns_the_original_text():
+    service = LLMService()
+    service.result_cache = None
+
+    parts = [delta async for delta in service.stream_text(LONG_TEXT, "grammar_fix", {}, "session")]
+
+    assert "".join(parts).strip() == LONG_TEXT
@@ -0,0 +1,143 @@
+"""
+Tests for the asyncio HTTP Bedrock transport: signing, error mapping and stream decoding
+"""
+
+import asyncio
+import base64
+import json
+import struct
+import zlib
+
+import httpx
+import pytest
+from botocore.exceptions import ClientError
+
+from writers_block_service.services.bedrock_transport import AsyncHttpTransport, BedrockTransport
+
+MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+BODY = {"max_tokens": 64, "messages": [{"role": "user", "content": "Hi"}]}
+
+
+def encode_event(headers: dict, payload: bytes) -> bytes:
+    """Encode one AWS event-stream message with string-valued headers"""
+    encoded_headers = b""
+    for name, value in headers.items():
+        name_bytes, value_bytes = name.encode(), value.encode()
+        encoded_headers += (struct.pack("!B", len(name_bytes)) + name_bytes +
+                            struct.pack("!BH", 7, len(value_bytes)) + value_bytes)
+    total_length = 12 + len(encoded_headers) + len(payload) + 4
+    prelude = struct.pack("!II", total_length, len(encoded_headers))
+    message = prelude + struct.pack("!I", zlib.crc32(prelude)) + encoded_headers + payload
+    return message + struct.pack("!I", zlib.crc32(message))
+
+
+def chunk_event(event: dict) -> bytes:
+    payload = json.dumps({"bytes": base64.b64encode(json.dumps(event).encode()).decode()}).encode()
+    return encode_event({":message-type": "event", ":event-type": "chunk",
+                         ":content-type": "application/json"}, payload)
+
+
+@pytest.fixture
+def requests_seen():
+    return []
+
+
+@pytest.fixture
+def make_transport(monkeypatch, requests_seen):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIDEXAMPLE")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+    monkeypatch.delenv("AWS_SESSION_TOKEN", raising=False)
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+
+    def factory(handler) -> AsyncHttpTransport:
+        def record(request: httpx.Request) -> httpx.Response:
+            requests_seen.append(request)
+            return handler(request)
+
+        transport = AsyncHttpTransport("us-east-1")
+        transport._client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        transport._client_loop = asyncio.get_running_loop()
+        return transport
+
+    return factory
+
+
+def test_partial_transport_cannot_be_created():
+    class InvokeOnly(BedrockTransport):
+        async def invoke_model(self, model_id, body):
+            return {}
+
+    with pytest.raises(TypeError):
+        InvokeOnly("us-east-1")
+
+
+@pytest.mark.asyncio
+async def test_invoke_signs_request_and_returns_body(make_transport, requests_seen):
+    transport = make_transport(lambda request: httpx.Response(200, json={"content": [{"text": "ok"}]}))
+
+    result = await transport.invoke_model(MODEL_ID, BODY)
+    await transport.close()
+
+    assert result == {"content": [{"text": "ok"}]}
+    request = requests_seen[0]
+    assert request.url.path == f"/model/{MODEL_ID}/invoke"
+    assert request.url.host == "bedrock-runtime.us-east-1.amazonaws.com"
+    assert json.loads(request.content) == BODY
+    authorization = request.headers["authorization"]
+    assert authorization.startswith("AWS4-HMAC-SHA256 Credential=AKIDEXAMPLE/")
+    assert "/us-east-1/bedrock/aws4_request" in authorization
+    assert "x-amz-date" in request.headers
+
+
+@pytest.mark.asyncio
+async def test_throttling_error_is_raised_as_client_error(make_transport):
+    transport = make_transport(lambda request: httpx.Response(
+        400,
+        headers={"x-amzn-errortype": "ThrottlingException:http://internal.amazon.com/coral/"},
+        json={"message": "Too many requests"}
+    ))
+
+    with pytest.raises(ClientError) as raised:
+        await transport.invoke_model(MODEL_ID, BODY)
+    await transport.close()
+
+    error = raised.value.response
+    assert error["Error"] == {"Code": "ThrottlingException", "Message": "Too many requests"}
+    assert error["ResponseMetadata"]["HTTPStatusCode"] == 400
+
+
+@pytest.mark.asyncio
+async def test_stream_decodes_chunk_events(make_transport, requests_seen):
+    events = [
+        {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hello"}},
+        {"type": "message_stop"}
+    ]
+    stream = b"".join(chunk_event(event) for event in events)
+
+    async def split_stream():
+        # Split mid-message so the decoder has to buffer partial frames
+        for part in (stream[:7], stream[7:40], stream[40:]):
+            yield part
+
+    transport = make_transport(lambda request: httpx.Response(200, content=split_stream()))
+
+    received = [event async for event in transport.invoke_model_stream(MODEL_ID, BODY)]
+    await transport.close()
+
+    assert received == events
+    assert requests_seen[0].url.path == f"/model/{MODEL_ID}/invoke-with-response-stream"
+    assert requests_seen[0].headers["accept"] == "application/vnd.amazon.eventstream"
+
+
+@pytest.mark.asyncio
+async def test_stream_exception_event_is_raised_as_client_error(make_transport):
+    stream = encode_event({":message-type": "exception", ":exception-type": "throttlingException",
+                           ":content-type": "application/json"},
+                          json.dumps({"message": "Slow down"}).encode())
+    transport = make_transport(lambda request: httpx.Response(200, content=stream))
+
+    with pytest.raises(ClientError) as raised:
+        [event async for event in transport.invoke_model_stream(MODEL_ID, BODY)]
+    await transport.close()
+
+    assert raised.value.response["Error"] == {"Code": "throttlingException", "Message": "Slow down"}
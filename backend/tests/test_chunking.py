@@ -0,0 +1,62 @@
+"""
+Tests for sentence-aware chunking and reassembly
+"""
+
+import random
+
+import pytest
+
+from writers_block_service.utils.chunking import join_chunks, split_text
+
+PARAGRAPHS = (
+    "The first paragraph has a few sentences. It keeps going for a while! "
+    "Does it end here? Not quite…  It ends now.\n\n"
+    "Second paragraph:\tindented words, double  spaces and a trailing newline.\n"
+    "\n  \n"
+    "A third paragraph with averyveryverylongwordthatcannotbesplitanywhereelse in it.\n"
+)
+
+
+def reassemble(chunks):
+    return join_chunks([text for text, _ in chunks], [separator for _, separator in chunks])
+
+
+@pytest.mark.parametrize("max_chars", [10, 25, 60, 200, 10000])
+def test_round_trip_reproduces_text(max_chars):
+    chunks = split_text(PARAGRAPHS, max_chars)
+
+    assert reassemble(chunks) == PARAGRAPHS
+
+
+@pytest.mark.parametrize("max_chars", [10, 25, 60, 200])
+def test_chunks_respect_max_chars(max_chars):
+    chunks = split_text(PARAGRAPHS, max_chars)
+
+    assert all(len(text) <= max_chars for text, _ in chunks)
+
+
+def test_short_text_is_one_chunk():
+    assert split_text("Just one sentence. ", 100) == [("Just one sentence. ", "")]
+
+
+def test_splits_at_sentence_boundaries_first():
+    chunks = split_text("One two three. Four five six. Seven eight nine.", 30)
+
+    assert [text for text, _ in chunks] == ["One two three. Four five six.", "Seven eight nine."]
+
+
+def test_overlong_word_is_hard_cut():
+    chunks = split_text("x" * 25, 10)
+
+    assert [text for text, _ in chunks] == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_random_text_round_trips_within_limit():
+    rng = random.Random(3)
+    tokens = ["word", "sentence.", "end!", "what?", "x" * 40, " ", "  ", "\n", "\n\n", "\t"]
+    text = "".join(rng.choice(tokens) for _ in range(2000))
+
+    for max_chars in (15, 50, 400):
+        chunks = split_text(text, max_chars)
+        assert reassemble(chunks) == text
+        assert all(len(chunk) <= max_chars for chunk, _ in chunks)
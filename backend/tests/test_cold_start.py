@@ -0,0 +1,23 @@
+"""
+Tests that importing the app leaves the AWS SDK unloaded
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_CHECK = """
+import sys
+import writers_block_service.main
+loaded = sorted(name for name in sys.modules if name.split(".")[0] in ("boto3", "botocore"))
+assert not loaded, loaded
+"""
+
+
+def test_importing_main_does_not_load_the_aws_sdk():
+    result = subprocess.run([sys.executable, "-c", IMPORT_CHECK], cwd=BACKEND_DIR,
+                            capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
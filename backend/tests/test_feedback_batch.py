@@ -0,0 +1,70 @@
+"""
+Tests for feedback submission idempotency and POST /api/v1/feedback/batch
+"""
+
+import uuid
+
+from fastapi.testclient import TestClient
+
+from writers_block_service.main import app
+
+client = TestClient(app)
+
+
+def feedback(**overrides) -> dict:
+    item = {"type": "bug", "rating": 4, "message": "Works well", "idempotency_key": f"fb-{uuid.uuid4()}"}
+    item.update(overrides)
+    return item
+
+
+def submit_batch(*items):
+    response = client.post("/api/v1/feedback/batch", json={"items": list(items)})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_replayed_key_returns_original_feedback_id():
+    item = feedback()
+
+    first = submit_batch(item)["results"][0]
+    replay = submit_batch(item)
+
+    assert first["success"] and not first["duplicate"]
+    assert replay["results"][0] == {**first, "duplicate": True}
+    assert (replay["accepted"], replay["duplicates"], replay["failed"]) == (0, 1, 0)
+
+
+def test_reused_key_with_different_content_is_rejected_and_original_kept():
+    item = feedback()
+    original = submit_batch(item)["results"][0]
+
+    reused = submit_batch({**item, "rating": 1})["results"][0]
+    retry = submit_batch(item)["results"][0]
+
+    assert not reused["success"]
+    assert "Idempotency key" in reused["error"]
+    assert retry["duplicate"] and retry["feedback_id"] == original["feedback_id"]
+
+
+def test_reused_key_on_single_submission_returns_422():
+    item = feedback()
+    assert client.post("/api/v1/feedback", json=item).status_code == 200
+
+    response = client.post("/api/v1/feedback", json={**item, "message": "Changed my mind"})
+
+    assert response.status_code == 422
+
+
+def test_mixed_valid_and_invalid_items():
+    body = submit_batch(
+        feedback(),
+        feedback(rating=9),
+        {"rating": 3},
+        feedback(type="general", idempotency_key=None)
+    )
+
+    assert [result["index"] for result in body["results"]] == [0, 1, 2, 3]
+    assert [result["success"] for result in body["results"]] == [True, False, False, True]
+    assert "rating" in body["results"][1]["error"]
+    assert "type" in body["results"][2]["error"]
+    assert (body["success"], body["accepted"], body["failed"]) == (False, 2, 2)
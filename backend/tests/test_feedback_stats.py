@@ -0,0 +1,90 @@
+"""
+Tests for incremental feedback rollups and their persistence
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from writers_block_service.models.schemas import FeedbackRequest
+from writers_block_service.services import feedback_service as feedback_service_module
+from writers_block_service.services.feedback_service import FeedbackService
+from writers_block_service.services.feedback_stats import (
+    OTHER_KEY,
+    FeedbackRollups,
+    load_rollups,
+    write_snapshot
+)
+
+MONDAY_9AM = datetime(2026, 10, 12, 9, 30)
+CHROME_UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+             "Chrome/126.0.0.0 Safari/537.36")
+
+
+def test_record_updates_totals_dimensions_and_time_buckets():
+    rollups = FeedbackRollups()
+    rollups.record(5, MONDAY_9AM, type="bug", extension_version="1.2.0", browser="Chrome", platform="Windows")
+    rollups.record(2, MONDAY_9AM, type="bug", extension_version=None, browser="Chrome", platform="Windows")
+
+    summary = rollups.summary()
+
+    assert (summary["total"], summary["average_rating"]) == (2, 3.5)
+    assert summary["ratings"] == {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1}
+    assert summary["by_type"]["bug"]["count"] == 2
+    assert summary["by_extension_version"]["unknown"]["ratings"]["2"] == 1
+    assert summary["by_hour_of_day"][9] == 2
+    assert summary["by_day_of_week"]["Monday"] == 2
+
+
+def test_dimension_values_beyond_max_keys_count_as_other():
+    rollups = FeedbackRollups(max_keys=2)
+    for version in ("1.0", "1.1", "1.2", "1.3", "1.0"):
+        rollups.record(4, MONDAY_9AM, extension_version=version)
+
+    by_version = rollups.summary()["by_extension_version"]
+
+    assert {key: stats["count"] for key, stats in by_version.items()} == {"1.0": 2, "1.1": 1, OTHER_KEY: 2}
+
+
+def test_snapshot_restore_round_trip(tmp_path):
+    rollups = FeedbackRollups()
+    rollups.record(3, MONDAY_9AM, type="feature", browser="Firefox", platform="Linux")
+    path = str(tmp_path / "stats" / "snapshot.json")
+
+    write_snapshot(path, rollups.snapshot())
+    restored = load_rollups(path)
+
+    assert restored.summary() == rollups.summary()
+    assert rollups.updates_since_snapshot == 0
+
+
+def test_restore_rejects_unknown_version():
+    with pytest.raises(ValueError):
+        FeedbackRollups().restore({"version": 99})
+
+
+def test_unreadable_snapshot_starts_from_zero(tmp_path):
+    path = tmp_path / "snapshot.json"
+    path.write_text(json.dumps({"version": 1, "totals": [1, 2]}))
+
+    assert load_rollups(str(path)).summary()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_accepted_feedback_is_counted_even_if_analytics_job_is_dropped(monkeypatch):
+    async def drop(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(feedback_service_module.background_work, "submit", drop)
+    service = FeedbackService()
+    feedback = FeedbackRequest(type="bug", rating=1, user_agent=CHROME_UA, idempotency_key="k1")
+
+    await service.process_feedback(feedback)
+    await service.process_feedback(feedback)  # replayed key: not counted again
+    await service.process_feedback_batch([FeedbackRequest(type="general", rating=5)])
+
+    summary = service.get_stats()
+    assert summary["total"] == 2
+    assert summary["by_browser"]["Chrome"]["count"] == 1
+    assert summary["by_platform"]["Windows"]["ratings"]["1"] == 1
@@ -0,0 +1,144 @@
+"""
+Tests for the append-only feedback store
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+from writers_block_service.services.feedback_store import FeedbackStore
+
+
+def record(index: int, padding: int = 0) -> dict:
+    return {"feedback_id": f"fb-{index}", "rating": index % 5 + 1, "comment": "x" * padding}
+
+
+def segments(directory) -> list:
+    return sorted(name for name in os.listdir(directory) if name.endswith(".jsonl"))
+
+
+def read_lines(path) -> list:
+    with open(path, "rb") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def open_store(tmp_path):
+    stores = []
+
+    def factory(**kwargs) -> FeedbackStore:
+        kwargs.setdefault("fsync", False)
+        store = FeedbackStore(str(tmp_path), **kwargs)
+        stores.append(store)
+        return store
+
+    yield factory
+    for store in stores:
+        store.close()
+
+
+def hold_writer(store: FeedbackStore) -> threading.Event:
+    """Keep the writer thread from committing until the returned event is set"""
+    release = threading.Event()
+    open_store = store._open_store
+
+    def delayed_open():
+        release.wait(5)
+        open_store()
+
+    store._open_store = delayed_open
+    return release
+
+
+def test_queued_records_are_group_committed(open_store):
+    store = open_store(max_batch_records=500)
+    release = hold_writer(store)
+    for index in range(50):
+        assert store.append(record(index))
+
+    release.set()
+    assert store.flush()
+
+    stats = store.stats()
+    assert (stats["written"], stats["commits"], stats["queued"]) == (50, 1, 0)
+
+
+def test_group_commit_is_capped_at_max_batch_records(open_store):
+    store = open_store(max_batch_records=20)
+    release = hold_writer(store)
+    for index in range(50):
+        store.append(record(index))
+
+    release.set()
+    assert store.flush()
+
+    assert store.stats()["commits"] == 3
+
+
+def test_pending_records_are_served_before_commit(open_store):
+    store = open_store()
+    release = hold_writer(store)
+    store.append(record(1))
+
+    assert store.get("fb-1") == record(1)
+
+    release.set()
+    assert store.flush()
+    assert store.get("fb-1") == record(1)
+
+
+def test_get_reads_committed_records_and_misses_unknown_ids(open_store, tmp_path):
+    store = open_store()
+    for index in range(10):
+        store.append(record(index))
+    assert store.flush()
+
+    assert store.get("fb-7") == record(7)
+    assert store.get("fb-unknown") is None
+    assert read_lines(tmp_path / segments(tmp_path)[0]) == [record(index) for index in range(10)]
+
+
+def test_segments_rotate_at_max_size(open_store, tmp_path):
+    store = open_store(max_segment_bytes=300)
+    for index in range(10):
+        store.append(record(index, padding=100))
+        assert store.flush()
+
+    names = segments(tmp_path)
+    assert len(names) == 5
+    assert all(os.path.getsize(tmp_path / name) <= 300 for name in names)
+    assert [store.get(f"fb-{index}") for index in range(10)] == [record(index, 100) for index in range(10)]
+
+
+def test_index_is_rebuilt_on_restart(open_store, tmp_path):
+    store = open_store(max_segment_bytes=300)
+    for index in range(6):
+        store.append(record(index, padding=100))
+        assert store.flush()
+    store.close()
+
+    reopened = open_store(max_segment_bytes=300)
+    assert reopened.get("fb-0") == record(0, 100)
+    assert reopened.stats()["indexed"] == 6
+
+    reopened.append(record(6, padding=100))
+    assert reopened.flush()
+    assert len(segments(tmp_path)) == 4
+    assert reopened.get("fb-6") == record(6, 100)
+
+
+def test_torn_final_line_is_truncated_on_recovery(open_store, tmp_path):
+    complete = b"".join(json.dumps(record(index)).encode() + b"\n" for index in range(2))
+    with open(tmp_path / "feedback-000001.jsonl", "wb") as f:
+        f.write(complete + b'{"feedback_id": "fb-2", "rat')
+
+    store = open_store()
+    assert store.get("fb-1") == record(1)
+    assert store.get("fb-2") is None
+    assert os.path.getsize(tmp_path / "feedback-000001.jsonl") == len(complete)
+
+    store.append(record(3))
+    assert store.flush()
+    assert read_lines(tmp_path / "feedback-000001.jsonl") == [record(0), record(1), record(3)]
@@ -0,0 +1,108 @@
+"""
+Tests for batched CloudWatch log shipping and its fallback
+"""
+
+import logging
+
+import pytest
+from botocore.exceptions import ClientError
+
+from writers_block_service.core.log_shipper import CloudWatchLogShipper
+
+
+class FakeLogsClient:
+    def __init__(self, error_code: str = None):
+        self.error_code = error_code
+        self.streams = []
+        self.batches = []
+
+    def create_log_stream(self, logGroupName, logStreamName):
+        self.streams.append(logStreamName)
+
+    def put_log_events(self, logGroupName, logStreamName, logEvents):
+        if self.error_code:
+            raise ClientError({"Error": {"Code": self.error_code}}, "PutLogEvents")
+        self.batches.append((logStreamName, [event["message"] for event in logEvents]))
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def fallback():
+    handler = ListHandler()
+    logger = logging.getLogger("tests.log_shipper.fallback")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    yield logger, handler
+    logger.removeHandler(handler)
+
+
+@pytest.fixture
+def open_shipper():
+    shippers = []
+
+    def factory(client, fallback_logger, **kwargs) -> CloudWatchLogShipper:
+        # A long interval: only batch size and flush() ship events
+        kwargs.setdefault("flush_interval", 60)
+        shipper = CloudWatchLogShipper(lambda: client, "group", fallback_logger, **kwargs)
+        shippers.append(shipper)
+        return shipper
+
+    yield factory
+    for shipper in shippers:
+        shipper.close()
+
+
+def test_full_batches_ship_and_flush_sends_the_rest(open_shipper, fallback):
+    client = FakeLogsClient()
+    shipper = open_shipper(client, fallback[0], max_batch_events=3)
+    for index in range(7):
+        shipper.submit("stream", 1000 + index, f"event {index}")
+
+    assert shipper.flush()
+
+    assert [len(messages) for _, messages in client.batches] == [3, 3, 1]
+    assert client.streams == ["stream"]
+    stats = shipper.stats()
+    assert (stats["sent"], stats["batches"], stats["failed"]) == (7, 3, 0)
+
+
+def test_batch_events_are_sent_in_timestamp_order(open_shipper, fallback):
+    client = FakeLogsClient()
+    shipper = open_shipper(client, fallback[0])
+    for timestamp, message in ((3000, "third"), (1000, "first"), (2000, "second")):
+        shipper.submit("stream", timestamp, message)
+
+    assert shipper.flush()
+
+    assert client.batches == [("stream", ["first", "second", "third"])]
+
+
+def test_failed_put_falls_back_to_standard_logging(open_shipper, fallback):
+    logger, handler = fallback
+    shipper = open_shipper(FakeLogsClient(error_code="AccessDeniedException"), logger)
+    shipper.submit("stream", 1000, "kept locally")
+
+    assert shipper.flush()
+
+    assert handler.messages == ["CloudWatch logging failed: AccessDeniedException", "kept locally"]
+    assert (shipper.stats()["sent"], shipper.stats()["failed"]) == (0, 1)
+
+
+def test_missing_client_falls_back_without_counting_a_failure(open_shipper, fallback):
+    logger, handler = fallback
+    shipper = open_shipper(None, logger)
+    shipper.submit("stream", 1000, "no client")
+
+    assert shipper.flush()
+
+    assert handler.messages == ["no client"]
+    assert shipper.stats()["failed"] == 0
@@ -0,0 +1,34 @@
+"""
+Tests for logging setup
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_CHECK = """
+import logging, threading
+root = logging.getLogger()
+handlers = list(root.handlers)
+import writers_block_service.services.llm_service
+import writers_block_service.services.feedback_service
+assert root.handlers == handlers, root.handlers
+assert not any("QueueListener" in repr(t) or t.name.startswith("Thread-") for t in threading.enumerate()), threading.enumerate()
+"""
+
+
+def test_importing_services_leaves_logging_unconfigured():
+    result = subprocess.run([sys.executable, "-c", IMPORT_CHECK], cwd=BACKEND_DIR,
+                            capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_app_configures_queued_logging():
+    from writers_block_service.core import logging as wb_logging
+    from writers_block_service.main import app  # noqa: F401
+
+    assert wb_logging._queue_handler is not None
+    assert wb_logging._queue_handler in wb_logging.logging.getLogger().handlers
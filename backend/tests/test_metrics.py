@@ -0,0 +1,43 @@
+"""
+Tests for the in-process metrics registry and its Prometheus rendering
+"""
+
+import pytest
+
+from writers_block_service.core.metrics import MetricsRegistry, _Metric
+
+
+def test_metric_without_value_holder_cannot_be_created():
+    class Incomplete(_Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "No _new_child")
+
+
+def test_labelled_counter_renders_each_combination():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ["route"])
+    requests.labels("batch").inc()
+    requests.labels("batch").inc(2)
+    requests.labels("single").inc()
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP requests_total Requests", "# TYPE requests_total counter"]
+    assert 'requests_total{route="batch"} 3' in lines
+    assert 'requests_total{route="single"} 1' in lines
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_count 4" in lines
@@ -0,0 +1,72 @@
+"""
+Tests for target ordering and error-rate recovery in the model router
+"""
+
+import pytest
+
+from writers_block_service.services import model_router as model_router_module
+from writers_block_service.services.model_router import ModelRouter, Route, RouteTarget
+
+PRIMARY = RouteTarget("model-a", "us-east-1")
+SECONDARY = RouteTarget("model-a", "us-west-2")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(model_router_module.time, "monotonic", fake)
+    return fake
+
+
+def demote(router: ModelRouter, target: RouteTarget, failures: int = 10):
+    for _ in range(failures):
+        router.begin(target)
+        router.end(target, None, False)
+
+
+def test_failing_target_is_demoted(clock):
+    router = ModelRouter([Route("default", [PRIMARY, SECONDARY])], max_error_rate=0.5)
+    demote(router, PRIMARY)
+
+    assert router.candidates(router.routes[0]) == [SECONDARY, PRIMARY]
+
+
+def test_demoted_target_recovers_without_traffic(clock):
+    router = ModelRouter([Route("default", [PRIMARY, SECONDARY])], max_error_rate=0.5,
+                         error_half_life=30)
+    demote(router, PRIMARY)
+    error_rate = router.stats()[PRIMARY.key]["error_rate"]
+
+    clock.now += 30
+    assert router.stats()[PRIMARY.key]["error_rate"] == pytest.approx(error_rate / 2, abs=1e-3)
+
+    clock.now += 30
+    assert router.candidates(router.routes[0])[0] == PRIMARY
+
+
+def test_decay_disabled_keeps_target_demoted(clock):
+    router = ModelRouter([Route("default", [PRIMARY, SECONDARY])], max_error_rate=0.5,
+                         error_half_life=0)
+    demote(router, PRIMARY)
+
+    clock.now += 3600
+    assert router.candidates(router.routes[0]) == [SECONDARY, PRIMARY]
+
+
+def test_outcome_after_idle_period_updates_decayed_rate(clock):
+    router = ModelRouter([Route("default", [PRIMARY])], error_half_life=30)
+    demote(router, PRIMARY, failures=1)
+
+    clock.now += 30
+    router.begin(PRIMARY)
+    router.end(PRIMARY, 100.0, True)
+
+    assert router.stats()[PRIMARY.key]["error_rate"] == pytest.approx(0.1 / 2 * 0.9, abs=1e-3)
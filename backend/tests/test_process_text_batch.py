@@ -0,0 +1,44 @@
+"""
+Tests for POST /api/v1/process-text/batch
+"""
+
+from fastapi.testclient import TestClient
+
+from writers_block_service.main import app
+
+client = TestClient(app)
+
+
+def test_invalid_item_is_reported_without_failing_batch():
+    response = client.post("/api/v1/process-text/batch", json={"items": [
+        {"selected_text": "First text", "action": "grammar_fix"},
+        {"selected_text": "Second text", "action": "rephrase", "session_id": "bad-item"},
+        {"selected_text": "Third text", "action": "summarize"}
+    ]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["success"], body["succeeded"], body["failed"]) == (False, 1, 2)
+    first, second, third = body["results"]
+    assert first["success"] and first["processed_text"] == "First text"
+    assert not second["success"]
+    assert second["session_id"] == "bad-item"
+    assert second["processed_text"] == "Second text"
+    assert second["message"].startswith("Invalid request:")
+    assert "tone" in second["message"]
+    assert not third["success"] and "action" in third["message"]
+
+
+def test_batch_size_is_still_validated():
+    response = client.post("/api/v1/process-text/batch", json={"items": []})
+
+    assert response.status_code == 422
+
+
+def test_openapi_documents_batch_item_schemas():
+    schemas = client.get("/openapi.json").json()["components"]["schemas"]
+
+    process_items = schemas["BatchProcessTextRequest"]["properties"]["items"]["items"]
+    feedback_items = schemas["BatchFeedbackRequest"]["properties"]["items"]["items"]
+    assert process_items["title"] == "ProcessTextRequest"
+    assert feedback_items["title"] == "FeedbackRequest"
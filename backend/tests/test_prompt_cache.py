@@ -0,0 +1,79 @@
+"""
+Tests for prompt cache breakpoint rules and their simulation
+"""
+
+import pytest
+
+from writers_block_service.services.bedrock_simulator import SimulatorTransport
+from writers_block_service.services.prompt_cache import for_model, min_cacheable_tokens
+from writers_block_service.services.token_budget import estimate_tokens
+
+SONNET = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+HAIKU = "us.anthropic.claude-3-5-haiku-20241022-v1:0"
+UNSUPPORTED = "anthropic.claude-3-sonnet-20240229-v1:0"
+
+SYSTEM_PROMPT = "You are a writing assistant. " * 20
+
+
+def request_body(prefix: str) -> dict:
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": 256,
+        "system": [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+        "messages": [{"role": "user", "content": [
+            {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": 'Text to process: "hello world"'}
+        ]}]
+    }
+
+
+def marked_blocks(body: dict) -> list:
+    blocks = body["system"] + body["messages"][0]["content"]
+    return [block["text"] for block in blocks if "cache_control" in block]
+
+
+def prefix_of_tokens(tokens: int) -> str:
+    # Pads the user prefix so system prompt + prefix is about the given length
+    return "x" * 4 * (tokens - estimate_tokens(SYSTEM_PROMPT))
+
+
+def test_minimums_by_model():
+    assert min_cacheable_tokens(SONNET) == 1024
+    assert min_cacheable_tokens(HAIKU) == 2048
+    assert min_cacheable_tokens(UNSUPPORTED) is None
+
+
+def test_short_prefixes_are_unmarked():
+    body = request_body("Rewrite this: ")
+
+    filtered = for_model(body, SONNET)
+
+    assert marked_blocks(filtered) == []
+    assert marked_blocks(body) == [SYSTEM_PROMPT, "Rewrite this: "]
+
+
+def test_breakpoint_kept_once_prefix_reaches_minimum():
+    prefix = prefix_of_tokens(1100)
+
+    assert marked_blocks(for_model(request_body(prefix), SONNET)) == [prefix]
+    assert marked_blocks(for_model(request_body(prefix), HAIKU)) == []
+
+
+def test_unsupported_model_gets_no_breakpoints():
+    assert marked_blocks(for_model(request_body(prefix_of_tokens(5000)), UNSUPPORTED)) == []
+
+
+@pytest.mark.parametrize("prefix_tokens, cached", [(500, False), (1100, True)])
+def test_simulator_enforces_minimum(prefix_tokens, cached):
+    transport = SimulatorTransport("us-east-1", seed=1)
+    body = request_body(prefix_of_tokens(prefix_tokens))
+
+    _, _, first = transport._generate(SONNET, body)
+    _, _, second = transport._generate(SONNET, body)
+
+    expected = prefix_tokens if cached else 0
+    assert first["cache_creation_input_tokens"] == expected
+    assert first["cache_read_input_tokens"] == 0
+    assert second["cache_creation_input_tokens"] == 0
+    assert second["cache_read_input_tokens"] == expected
+    assert first["input_tokens"] == second["input_tokens"]
@@ -0,0 +1,136 @@
+"""
+Tests for the Bedrock retry and circuit breaker layer
+"""
+
+import asyncio
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from writers_block_service.core.exceptions import ServiceUnavailableError
+from writers_block_service.services import resilience as resilience_module
+from writers_block_service.services.llm_service import LLMService
+from writers_block_service.services.resilience import (
+    BedrockResilience,
+    CircuitBreaker,
+    RetryBudget
+)
+
+
+def throttling_error() -> ClientError:
+    return ClientError({"Error": {"Code": "ThrottlingException", "Message": "slow down"}},
+                       "InvokeModel")
+
+
+def half_open_ready(breaker: CircuitBreaker):
+    """Put a breaker in the open state with its reset period already elapsed"""
+    breaker.state = CircuitBreaker.OPEN
+    breaker._opened_at = time.monotonic() - breaker.reset_seconds - 1
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience_module.random, "uniform", lambda low, high: 0.0)
+
+
+@pytest.mark.asyncio
+async def test_retried_request_counts_as_one_failure(no_backoff):
+    resilience = BedrockResilience(max_retries=3, retry_budget=RetryBudget(max_tokens=100),
+                                   breaker=CircuitBreaker(failure_threshold=5))
+
+    async def always_throttled():
+        raise throttling_error()
+
+    for _ in range(2):
+        with pytest.raises(ClientError):
+            await resilience.call(always_throttled)
+
+    assert resilience.retries == 6
+    assert resilience.breaker.consecutive_failures == 2
+    assert resilience.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_request_recovering_on_retry_is_not_a_failure(no_backoff):
+    resilience = BedrockResilience(max_retries=3, retry_budget=RetryBudget(max_tokens=100))
+    attempts = []
+
+    async def throttled_once():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise throttling_error()
+        return "ok"
+
+    assert await resilience.call(throttled_once) == "ok"
+    assert resilience.breaker.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_breaker():
+    resilience = BedrockResilience()
+    half_open_ready(resilience.breaker)
+
+    probe = asyncio.ensure_future(resilience.call(lambda: asyncio.sleep(10)))
+    await asyncio.sleep(0)
+    assert resilience.breaker.state == CircuitBreaker.HALF_OPEN
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    async def succeed():
+        return "ok"
+
+    assert await resilience.call(succeed) == "ok"
+    assert resilience.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_abandoned_stream_probe_releases_breaker():
+    resilience = BedrockResilience()
+    half_open_ready(resilience.breaker)
+
+    async def events():
+        for index in range(10):
+            yield index
+
+    stream = resilience.stream(events)
+    assert await stream.__anext__() == 0
+    await stream.aclose()
+
+    assert resilience.breaker.allow_request()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_chunk_probe_does_not_wedge_service():
+    """A long text's probe chunk cancelled by gather must not leave the breaker half-open"""
+    service = LLMService()
+    route = service.router.match("grammar_fix", {}, 10)
+    resilience = service._get_resilience(route.targets[0])
+    half_open_ready(resilience.breaker)
+
+    long_text = "This sentence is part of a long document. " * 200
+    with pytest.raises(ServiceUnavailableError):
+        await service.process_text(long_text, "grammar_fix", {}, "session_test")
+
+    result = await service.process_text("short text", "grammar_fix", {}, "session_test")
+    assert result == "short text"
+    assert service.resilience_stats()[route.targets[0].key]["breaker_state"] == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_disconnected_stream_probe_does_not_wedge_service():
+    """A stream closed by the client during the probe must not leave the breaker half-open"""
+    service = LLMService()
+    route = service.router.match("grammar_fix", {}, 10)
+    resilience = service._get_resilience(route.targets[0])
+    half_open_ready(resilience.breaker)
+
+    stream = service.stream_text("one two three four five six seven eight nine ten",
+                                 "grammar_fix", {}, "session_test")
+    await stream.__anext__()
+    await stream.aclose()
+
+    result = await service.process_text("short", "grammar_fix", {}, "session_test")
+    assert result == "short"
+    assert service.resilience_stats()[route.targets[0].key]["breaker_state"] == CircuitBreaker.CLOSED
@@ -0,0 +1,55 @@
+"""
+Tests for caching processed results under the serving model's scope
+"""
+
+import pytest
+
+from writers_block_service.services.llm_service import LLMService
+from writers_block_service.services.model_router import ModelRouter, Route, RouteTarget
+from writers_block_service.services.result_cache import ResultCache
+
+PRIMARY = RouteTarget("us.anthropic.claude-3-7-sonnet-20250219-v1:0", "us-east-1")
+FALLBACK = RouteTarget("us.anthropic.claude-3-5-haiku-20241022-v1:0", "us-east-1")
+TEXT = "Their going to the store tomorow."
+
+
+@pytest.fixture
+def service():
+    service = LLMService()
+    service.router = ModelRouter([Route("default", [PRIMARY], fallback=FALLBACK)], max_error_rate=0.5)
+    service.result_cache = ResultCache()
+    service.single_flight = None
+    return service
+
+
+def demote_primary(service: LLMService):
+    for _ in range(10):
+        service.router.begin(PRIMARY)
+        service.router.end(PRIMARY, None, False)
+
+
+@pytest.mark.asyncio
+async def test_primary_result_is_cached(service):
+    await service.process_text(TEXT, "grammar_fix", {}, "session")
+
+    assert service.result_cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fallback_result_is_not_cached_under_primary_scope(service):
+    demote_primary(service)
+
+    result = await service.process_text(TEXT, "grammar_fix", {}, "session")
+
+    assert result == TEXT
+    assert service.result_cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_streamed_fallback_result_is_not_cached(service):
+    demote_primary(service)
+
+    parts = [delta async for delta in service.stream_text(TEXT, "grammar_fix", {}, "session")]
+
+    assert "".join(parts).strip() == TEXT
+    assert service.result_cache.stats()["entries"] == 0
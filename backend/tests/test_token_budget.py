@@ -0,0 +1,115 @@
+"""
+Tests for token estimates, max_tokens planning and max_tokens continuations
+"""
+
+import pytest
+
+from writers_block_service.core.config import settings
+from writers_block_service.core.request_context import start_request_usage
+from writers_block_service.services.llm_service import LLMService
+from writers_block_service.services.token_budget import (
+    OUTPUT_HEADROOM_TOKENS,
+    estimate_tokens,
+    plan_max_tokens
+)
+
+
+def test_estimate_tokens_ascii():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_estimate_tokens_counts_each_non_ascii_character():
+    assert estimate_tokens("日本語のテキスト") == 8
+    assert estimate_tokens("café") == 2
+    # CJK must not be estimated below one token per character
+    assert estimate_tokens("文" * 1000) >= 1000
+
+
+@pytest.mark.parametrize("action, parameters, ratio", [
+    ("grammar_fix", {}, 1.2),
+    ("rephrase", {"tone": "casual"}, 1.6),
+    ("rephrase", {"custom_prompt": "Shorten: {selected_text}"}, 2.5)
+])
+def test_plan_max_tokens_scales_with_action(action, parameters, ratio):
+    text = "word " * 400
+
+    assert plan_max_tokens(text, action, parameters) == round(500 * ratio) + OUTPUT_HEADROOM_TOKENS
+
+
+def test_plan_max_tokens_is_clamped(monkeypatch):
+    monkeypatch.setattr(settings, "TOKEN_BUDGET_MIN", 128)
+    monkeypatch.setattr(settings, "TOKEN_BUDGET_MAX", 4096)
+
+    assert plan_max_tokens("Fix me", "grammar_fix") == 128
+    assert plan_max_tokens("word " * 10000, "grammar_fix") == 4096
+
+
+def test_plan_max_tokens_covers_cjk_output():
+    text = "これは日本語の文章です。" * 100
+
+    assert plan_max_tokens(text, "grammar_fix") >= len(text)
+
+
+@pytest.fixture
+def service():
+    service = LLMService()
+    service.result_cache = None
+    return service
+
+
+def long_text(words: int) -> str:
+    return " ".join(f"word{i}" for i in range(words))
+
+
+@pytest.mark.asyncio
+async def test_call_continues_truncated_output(service):
+    text = long_text(60)
+    route = service.router.match("grammar_fix", {}, len(text))
+    usage = start_request_usage()
+
+    result = await service._call_bedrock(f'Text to process: "{text}"', "session", 40, route)
+
+    assert result == text
+    assert usage.bedrock_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_call_stops_after_max_continuations(service, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_CONTINUATIONS", 1)
+    text = long_text(60)
+    route = service.router.match("grammar_fix", {}, len(text))
+    usage = start_request_usage()
+
+    result = await service._call_bedrock(f'Text to process: "{text}"', "session", 40, route)
+
+    assert usage.bedrock_calls == 2
+    assert text.startswith(result) and len(result) < len(text)
+
+
+@pytest.mark.asyncio
+async def test_stream_continues_truncated_output(service):
+    text = long_text(60)
+    route = service.router.match("grammar_fix", {}, len(text))
+    usage = start_request_usage()
+
+    parts = [delta async for delta in service._stream_bedrock(
+        f'Text to process: "{text}"', "session", 40, route)]
+
+    assert "".join(parts) == text
+    assert usage.bedrock_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_after_max_continuations(service, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_CONTINUATIONS", 0)
+    text = long_text(60)
+    route = service.router.match("grammar_fix", {}, len(text))
+    usage = start_request_usage()
+
+    parts = [delta async for delta in service._stream_bedrock(
+        f'Text to process: "{text}"', "session", 40, route)]
+
+    assert usage.bedrock_calls == 1
+    assert text.startswith("".join(parts)) and len("".join(parts)) < len(text)
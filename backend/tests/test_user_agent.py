@@ -0,0 +1,39 @@
+"""
+Tests for browser, version and platform classification of User-Agent strings
+"""
+
+import pytest
+
+from writers_block_service.utils.user_agent import UNKNOWN_USER_AGENT, UserAgentInfo, classify_user_agent
+
+
+@pytest.mark.parametrize("user_agent, expected", [
+    ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+     "Chrome/126.0.0.0 Safari/537.36 Edg/126.0.2592.68",
+     UserAgentInfo("Edge", "126.0", "Windows")),
+    ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+     "Chrome/125.0.0.0 Safari/537.36 OPR/111.0.0.0",
+     UserAgentInfo("Opera", "111.0", "Windows")),
+    ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+     "Version/17.5 Mobile/15E148 Safari/604.1",
+     UserAgentInfo("Safari", "17.5", "iOS")),
+    ("Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) "
+     "Chrome/126.0.6478.71 Mobile Safari/537.36",
+     UserAgentInfo("Chrome", "126.0", "Android")),
+    ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+     "Version/17.5 Safari/605.1.15",
+     UserAgentInfo("Safari", "17.5", "macOS")),
+    ("Mozilla/5.0 (X11; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0",
+     UserAgentInfo("Firefox", "127.0", "Linux"))
+])
+def test_classifies_browser_version_and_platform(user_agent, expected):
+    assert classify_user_agent(user_agent) == expected
+
+
+@pytest.mark.parametrize("user_agent", [None, ""])
+def test_missing_user_agent_is_unknown(user_agent):
+    assert classify_user_agent(user_agent) is UNKNOWN_USER_AGENT
+
+
+def test_unrecognized_user_agent_is_unknown():
+    assert classify_user_agent("curl/8.5.0") == UserAgentInfo("unknown", "unknown", "unknown")
@@ -9,6 +9,14 @@ __description__ = "AI-powered writing assistant with custom prompt support"
 
 # Import main components for easy access
 from .core.config import settings
-from .main import app
 
 __all__ = ["app", "settings"]
+
+
+def __getattr__(name):
+    # The app is imported on first access: importing it configures logging,
+    # which tools and tests that only use the services must not trigger
+    if name == "app":
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,97 @@
+"""
+Admin HTTP routes for Writers Block Service
+On-demand profiling and stored feedback lookup, each mounted only when
+enabled and ADMIN_TOKEN is set
+"""
+
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from ..models.schemas import (
+    ProfileSamplingRequest,
+    ProfileRequestsRequest,
+    ProfilerStatusResponse
+)
+from ..core.config import settings
+from ..services.feedback_service import feedback_service
+from ..core.profiling import (
+    ProfilerBusyError,
+    list_profiles,
+    request_profiler,
+    sampling_profiler
+)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Reject requests without the configured admin token (constant-time compare)"""
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+# Initialize routers (every route requires the admin token)
+admin_router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+feedback_admin_router = APIRouter(prefix="/admin/feedback", dependencies=[Depends(require_admin)])
+
+
+@admin_router.get("/profiles", response_model=ProfilerStatusResponse)
+async def profiler_status():
+    """Profiler state and the profiles written so far"""
+    return ProfilerStatusResponse(
+        sampling_running=sampling_profiler.running,
+        sampling_profile=sampling_profiler.current_profile or sampling_profiler.last_profile,
+        requests_armed=request_profiler.armed,
+        requests_every=request_profiler.every,
+        requests_remaining=request_profiler.remaining,
+        profile_dir=settings.PROFILE_DIR,
+        profiles=list_profiles(settings.PROFILE_DIR)
+    )
+
+
+@admin_router.post("/profiles/sampling")
+async def start_sampling(request: ProfileSamplingRequest):
+    """
+    Sample all thread stacks for N seconds into a collapsed-stack file
+
+    The file is written when sampling ends; render it with flamegraph.pl or
+    load it into speedscope.
+    """
+    try:
+        name = sampling_profiler.start(request.seconds, request.interval_ms)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"success": True, "profile": name, "seconds": request.seconds}
+
+
+@admin_router.post("/profiles/requests")
+async def start_request_profiling(request: ProfileRequestsRequest):
+    """Profile one in every K requests with cProfile (pstats file per request)"""
+    request_profiler.arm(request.every, request.count)
+    return {"success": True, "every": request.every, "count": request.count}
+
+
+@admin_router.delete("/profiles/requests")
+async def stop_request_profiling():
+    """Stop request profiling"""
+    request_profiler.disarm()
+    return {"success": True}
+
+
+@admin_router.get("/profiles/{name}")
+async def download_profile(name: str):
+    """Download a profile (the profile directory is local to each worker)"""
+    if name not in {profile["name"] for profile in list_profiles(settings.PROFILE_DIR)}:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(os.path.join(settings.PROFILE_DIR, name), filename=name)
+
+
+@feedback_admin_router.get("/{feedback_id}")
+async def get_feedback(feedback_id: str):
+    """Stored feedback record by ID (includes the message and contact email)"""
+    record = await feedback_service.get_feedback(feedback_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Feedback not found")
+    return record
@@ -3,21 +3,58 @@ HTTP routes for Writers Block Service
 Clean API layer with business logic separated to services
 """
 
+import asyncio
+import json
 import time
-from fastapi import APIRouter, HTTPException
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import ValidationError as PydanticValidationError
 
-from ..models.schemas import ProcessTextRequest, ProcessTextResponse, HealthResponse, FeedbackRequest, FeedbackResponse
+from ..models.schemas import (
+    ProcessTextRequest,
+    ProcessTextResponse,
+    BatchProcessTextRequest,
+    BatchProcessTextResponse,
+    HealthResponse,
+    FeedbackRequest,
+    FeedbackResponse,
+    FeedbackStatsResponse,
+    BatchFeedbackRequest,
+    BatchFeedbackItemResult,
+    BatchFeedbackResponse
+)
 from ..services.llm_service import LLMService
 from ..services.feedback_service import feedback_service
 from ..core.config import settings
+from ..core.background import background_work
 from ..core.logging import cloudwatch_logger, get_logger
+from ..core.metrics import (
+    ERRORS,
+    INPUT_CHARACTERS,
+    OUTPUT_CHARACTERS,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    TOKENS,
+    registry,
+    tone_label
+)
+from ..core.request_context import (
+    RequestTimings,
+    RequestUsage,
+    current_request_timings,
+    start_request_timings,
+    start_request_usage,
+    timed_stage
+)
 from ..core.exceptions import (
     WritersBlockException, 
     ValidationError,
     get_user_friendly_message
 )
 from ..utils.helpers import generate_session_id
+from ..utils.user_agent import UNKNOWN_USER_AGENT, UserAgentInfo, classify_user_agent
 
 # Initialize router
 router = APIRouter()
@@ -56,8 +93,16 @@ async def health_check():
     )
 
 
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics for this worker"""
+    if not settings.ENABLE_METRICS_ENDPOINT:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @router.post("/api/v1/process-text", response_model=ProcessTextResponse)
-async def process_text(request: ProcessTextRequest):
+async def process_text(request: ProcessTextRequest, user_agent: Optional[str] = Header(None)):
     """
     Process selected text based on structured action
     
@@ -67,21 +112,92 @@ async def process_text(request: ProcessTextRequest):
       - Built-in tones: professional, casual, academic, creative, technical
       - Custom prompts: User-defined templates with {selected_text} placeholder
     """
+    _mark_validated()
+    return await _process_request(request, classify_user_agent(user_agent))
+
+
+@router.post("/api/v1/process-text/batch", response_model=BatchProcessTextResponse)
+async def process_text_batch(request: BatchProcessTextRequest,
+                             user_agent: Optional[str] = Header(None)):
+    """
+    Process multiple text selections in one request
+    
+    Items are validated individually and processed concurrently (bounded by
+    BATCH_MAX_CONCURRENCY). Results are returned in request order; an invalid
+    or failed item is reported in its result and never fails the rest of the
+    batch.
+    """
+    _mark_validated()
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    client = classify_user_agent(user_agent)
+    
+    async def run_item(item: Dict[str, Any]) -> ProcessTextResponse:
+        try:
+            valid_item = ProcessTextRequest.model_validate(item)
+        except PydanticValidationError as e:
+            return _invalid_batch_item(item, e)
+        # Each item runs in its own task, so it gets its own stage timings
+        start_request_timings()
+        async with semaphore:
+            return await _process_request(valid_item, client)
+    
+    results = await asyncio.gather(*(run_item(item) for item in request.items))
+    succeeded = sum(1 for result in results if result.success)
+    
+    return BatchProcessTextResponse(
+        success=succeeded == len(results),
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded
+    )
+
+
+def _invalid_batch_item(item: Dict[str, Any], error: PydanticValidationError) -> ProcessTextResponse:
+    """Result for a batch item that failed validation"""
+    session_id = item.get("session_id")
+    if not isinstance(session_id, str) or not session_id:
+        session_id = generate_session_id()
+    selected_text = item.get("selected_text")
+    error_details = error.errors()[0] if error.errors() else {}
+    cloudwatch_logger.log_validation_error(
+        session_id=session_id,
+        validation_field=str(error_details.get('loc', ['unknown'])[-1]),
+        error_message=error_details.get('msg', 'Validation failed')
+    )
+    ERRORS.labels("VALIDATION_ERROR").inc()
+    return ProcessTextResponse(
+        success=False,
+        processed_text=selected_text if isinstance(selected_text, str) else "",
+        message=f"Invalid request: {_validation_message(error)}",
+        session_id=session_id
+    )
+
+
+async def _process_request(request: ProcessTextRequest,
+                           client: UserAgentInfo = UNKNOWN_USER_AGENT) -> ProcessTextResponse:
+    """Process a single text request, converting failures into a response"""
     # Generate session ID if not provided
     session_id = request.session_id or generate_session_id()
     
     # Start timing for performance logging
     start_time = time.time()
+    usage = start_request_usage()
+    timings = current_request_timings() or start_request_timings()
+    REQUESTS_IN_FLIGHT.inc()
+    error_code = None
+    output_length = None
     
     # Log request start (secure logging - no user content)
     custom_prompt = request.parameters.get("custom_prompt")
-    cloudwatch_logger.log_request_start(
-        session_id=session_id,
-        action=request.action,
-        text_length=len(request.selected_text),
-        has_custom_prompt=bool(custom_prompt),
-        prompt_template=custom_prompt if custom_prompt else None
-    )
+    with timed_stage("logging"):
+        cloudwatch_logger.log_request_start(
+            session_id=session_id,
+            action=request.action,
+            text_length=len(request.selected_text),
+            has_custom_prompt=bool(custom_prompt),
+            prompt_template=custom_prompt if custom_prompt else None,
+            client=client.as_log_fields()
+        )
     
     try:
         # Process text using service layer
@@ -89,31 +205,26 @@ async def process_text(request: ProcessTextRequest):
             text=request.selected_text,
             action=request.action,
             parameters=request.parameters,
-            session_id=session_id
+            session_id=session_id,
+            idempotency_key=request.idempotency_key
         )
         
         # Calculate processing time
         processing_time_ms = (time.time() - start_time) * 1000
         
         # Format success message
-        if request.action == "grammar_fix":
-            message = "Grammar and spelling corrected"
-        elif request.action == "rephrase":
-            style_name = request.parameters.get("style_name", "")
-            if custom_prompt:
-                message = f"Text rephrased using '{style_name}' style" if style_name else "Text rephrased with custom style"
-            else:
-                tone = request.parameters.get("tone", "professional")
-                message = f"Text rephrased in {tone} tone"
-        else:
-            message = "Text processed successfully"
+        message = _success_message(request)
         
-        # Log successful completion
-        cloudwatch_logger.log_request_success(
+        # Log successful completion after the response is sent
+        output_length = len(processed_text)
+        await background_work.submit(
+            cloudwatch_logger.log_request_success,
             session_id=session_id,
             action=request.action,
             processing_time_ms=processing_time_ms,
-            output_length=len(processed_text)
+            output_length=output_length,
+            token_usage=usage.as_log_fields(),
+            stage_timings_ms=timings.as_log_fields()
         )
         
         return ProcessTextResponse(
@@ -128,6 +239,7 @@ async def process_text(request: ProcessTextRequest):
         error_details = e.errors()[0] if e.errors() else {}
         field = error_details.get('loc', ['unknown'])[-1]
         error_msg = error_details.get('msg', 'Validation failed')
+        error_code = "VALIDATION_ERROR"
         
         cloudwatch_logger.log_validation_error(
             session_id=session_id,
@@ -144,6 +256,7 @@ async def process_text(request: ProcessTextRequest):
     
     except ValidationError as e:
         # Handle custom validation errors
+        error_code = e.error_code
         cloudwatch_logger.log_validation_error(
             session_id=session_id,
             validation_field=e.field or "unknown",
@@ -159,14 +272,152 @@ async def process_text(request: ProcessTextRequest):
     
     except WritersBlockException as e:
         # Handle custom service exceptions
+        error_code = e.error_code or "unknown"
+        with timed_stage("logging"):
+            cloudwatch_logger.log_request_error(
+                session_id=session_id,
+                action=request.action,
+                error_type=e.error_code or "unknown",
+                error_code=e.error_code,
+                stage_timings_ms=timings.as_log_fields()
+            )
+        
+        return ProcessTextResponse(
+            success=False,
+            processed_text=request.selected_text,
+            message=get_user_friendly_message(e),
+            session_id=session_id
+        )
+    
+    except Exception as e:
+        # Handle unexpected errors
+        error_code = "UNEXPECTED_ERROR"
+        with timed_stage("logging"):
+            cloudwatch_logger.log_request_error(
+                session_id=session_id,
+                action=request.action,
+                error_type="unexpected_error",
+                error_code=type(e).__name__,
+                stage_timings_ms=timings.as_log_fields()
+            )
+        
+        return ProcessTextResponse(
+            success=False,
+            processed_text=request.selected_text,
+            message="Unable to process text. Please try again.",
+            session_id=session_id
+        )
+    
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        _record_request_metrics("process_text", request, start_time, usage,
+                                output_length, error_code)
+        await _log_if_slow("process_text", request, session_id, start_time, usage,
+                           timings, error_code)
+
+
+@router.post("/api/v1/process-text/stream")
+async def process_text_stream(request: ProcessTextRequest,
+                              user_agent: Optional[str] = Header(None)):
+    """
+    Process selected text and stream the result as Server-Sent Events
+    
+    Emits `delta` events with incremental text and a final `done` event
+    carrying the same fields as ProcessTextResponse.
+    """
+    _mark_validated()
+    session_id = request.session_id or generate_session_id()
+    start_time = time.time()
+    client = classify_user_agent(user_agent)
+    
+    # Log request start (secure logging - no user content)
+    custom_prompt = request.parameters.get("custom_prompt")
+    with timed_stage("logging"):
+        cloudwatch_logger.log_request_start(
+            session_id=session_id,
+            action=request.action,
+            text_length=len(request.selected_text),
+            has_custom_prompt=bool(custom_prompt),
+            prompt_template=custom_prompt if custom_prompt else None,
+            client=client.as_log_fields()
+        )
+    
+    return StreamingResponse(
+        _stream_events(request, session_id, start_time),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _stream_events(request: ProcessTextRequest, session_id: str,
+                         start_time: float) -> AsyncIterator[str]:
+    """Generate SSE events for a streamed process-text request"""
+    parts = []
+    time_to_first_token_ms: Optional[float] = None
+    usage = start_request_usage()
+    timings = current_request_timings() or start_request_timings()
+    REQUESTS_IN_FLIGHT.inc()
+    error_code = None
+    output_length = None
+    
+    try:
+        deltas = llm_service.stream_text(
+            text=request.selected_text,
+            action=request.action,
+            parameters=request.parameters,
+            session_id=session_id
+        )
+        # Closing the response (client disconnect) closes the model stream too
+        async with aclosing(deltas):
+            async for delta in deltas:
+                if time_to_first_token_ms is None:
+                    time_to_first_token_ms = (time.time() - start_time) * 1000
+                parts.append(delta)
+                yield _sse_event("delta", {"text": delta})
+        
+        processed_text = "".join(parts).strip()
+        output_length = len(processed_text)
+        await background_work.submit(
+            cloudwatch_logger.log_request_success,
+            session_id=session_id,
+            action=request.action,
+            processing_time_ms=(time.time() - start_time) * 1000,
+            output_length=output_length,
+            time_to_first_token_ms=time_to_first_token_ms,
+            token_usage=usage.as_log_fields(),
+            stage_timings_ms=timings.as_log_fields()
+        )
+        summary = ProcessTextResponse(
+            success=True,
+            processed_text=processed_text,
+            message=_success_message(request),
+            session_id=session_id
+        )
+    
+    except ValidationError as e:
+        error_code = e.error_code
+        cloudwatch_logger.log_validation_error(
+            session_id=session_id,
+            validation_field=e.field or "unknown",
+            error_message=e.message
+        )
+        summary = ProcessTextResponse(
+            success=False,
+            processed_text=request.selected_text,
+            message=f"Invalid request: {e.message}",
+            session_id=session_id
+        )
+    
+    except WritersBlockException as e:
+        error_code = e.error_code or "unknown"
         cloudwatch_logger.log_request_error(
             session_id=session_id,
             action=request.action,
             error_type=e.error_code or "unknown",
-            error_code=e.error_code
+            error_code=e.error_code,
+            stage_timings_ms=timings.as_log_fields()
         )
-        
-        return ProcessTextResponse(
+        summary = ProcessTextResponse(
             success=False,
             processed_text=request.selected_text,
             message=get_user_friendly_message(e),
@@ -174,20 +425,107 @@ async def process_text(request: ProcessTextRequest):
         )
     
     except Exception as e:
-        # Handle unexpected errors
+        error_code = "UNEXPECTED_ERROR"
         cloudwatch_logger.log_request_error(
             session_id=session_id,
             action=request.action,
             error_type="unexpected_error",
-            error_code=type(e).__name__
+            error_code=type(e).__name__,
+            stage_timings_ms=timings.as_log_fields()
         )
-        
-        return ProcessTextResponse(
+        summary = ProcessTextResponse(
             success=False,
             processed_text=request.selected_text,
             message="Unable to process text. Please try again.",
             session_id=session_id
         )
+    
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        _record_request_metrics("stream", request, start_time, usage,
+                                output_length, error_code)
+        await _log_if_slow("stream", request, session_id, start_time, usage,
+                           timings, error_code)
+    
+    yield _sse_event("done", summary.model_dump())
+
+
+def _record_request_metrics(endpoint: str, request: ProcessTextRequest, start_time: float,
+                            usage: RequestUsage, output_length: Optional[int],
+                            error_code: Optional[str]):
+    """Record latency, size, token and error metrics for a finished request"""
+    REQUEST_LATENCY.labels(endpoint, request.action, tone_label(request.parameters)).observe(
+        time.time() - start_time
+    )
+    INPUT_CHARACTERS.labels(request.action).inc(len(request.selected_text))
+    if output_length is not None:
+        OUTPUT_CHARACTERS.labels(request.action).inc(output_length)
+    if error_code is not None:
+        ERRORS.labels(error_code).inc()
+    TOKENS.labels("input").inc(usage.input_tokens)
+    TOKENS.labels("output").inc(usage.output_tokens)
+    TOKENS.labels("cache_read").inc(usage.cache_read_input_tokens)
+    TOKENS.labels("cache_creation").inc(usage.cache_creation_input_tokens)
+
+
+def _mark_validated():
+    """Record request body reading, parsing and validation (done before the handler runs)"""
+    timings = current_request_timings()
+    if timings is not None and "validation" not in timings.stages:
+        timings.mark("validation")
+
+
+async def _log_if_slow(endpoint: str, request: ProcessTextRequest, session_id: str,
+                       start_time: float, usage: RequestUsage, timings: RequestTimings,
+                       error_code: Optional[str]):
+    """Log the stage breakdown of a request slower than SLOW_REQUEST_MS (LOG_SLOW_REQUESTS)"""
+    if not settings.LOG_SLOW_REQUESTS:
+        return
+    processing_time_ms = (time.time() - start_time) * 1000
+    if processing_time_ms < settings.SLOW_REQUEST_MS:
+        return
+    await background_work.submit(
+        cloudwatch_logger.log_slow_request,
+        session_id=session_id,
+        action=request.action,
+        endpoint=endpoint,
+        processing_time_ms=processing_time_ms,
+        stage_timings_ms=timings.as_log_fields(),
+        status="success" if error_code is None else "error",
+        token_usage=usage.as_log_fields()
+    )
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _success_message(request: ProcessTextRequest) -> str:
+    """Build user-facing success message for a processed request"""
+    if request.action == "grammar_fix":
+        return "Grammar and spelling corrected"
+    elif request.action == "rephrase":
+        style_name = request.parameters.get("style_name", "")
+        if request.parameters.get("custom_prompt"):
+            return f"Text rephrased using '{style_name}' style" if style_name else "Text rephrased with custom style"
+        tone = request.parameters.get("tone", "professional")
+        return f"Text rephrased in {tone} tone"
+    return "Text processed successfully"
+
+
+@router.get("/api/v1/feedback/stats", response_model=FeedbackStatsResponse)
+async def feedback_stats():
+    """
+    Aggregated feedback statistics for this worker
+    
+    Rating histograms and counts per type, extension version, browser,
+    platform, hour of day and day of week. Served from counters updated on
+    each submission; no raw feedback is read.
+    """
+    if not settings.ENABLE_FEEDBACK_STATS_ENDPOINT:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return feedback_service.get_stats()
 
 
 @router.post("/api/v1/feedback", response_model=FeedbackResponse)
@@ -213,7 +551,67 @@ async def submit_feedback(request: FeedbackRequest):
     except PydanticValidationError as e:
         logger.warning(f"Validation error in feedback submission: {str(e)}")
         raise HTTPException(status_code=422, detail=str(e))
+    
+    except ValidationError as e:
+        logger.warning(f"Validation error in feedback submission: {e.message}")
+        raise HTTPException(status_code=422, detail=e.message)
         
     except Exception as e:
         logger.error(f"Unexpected error in feedback submission: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to submit feedback. Please try again.")
+
+
+@router.post("/api/v1/feedback/batch", response_model=BatchFeedbackResponse)
+async def submit_feedback_batch(request: BatchFeedbackRequest):
+    """
+    Submit feedback queued by the extension (e.g. while offline) in one request
+    
+    Items are validated individually, so an invalid item is reported in its
+    result without rejecting the rest. Items carrying an idempotency_key that
+    was already accepted return the original feedback_id with duplicate=true.
+    Results are returned in request order.
+    """
+    results: List[Optional[BatchFeedbackItemResult]] = [None] * len(request.items)
+    valid_indexes = []
+    valid_items = []
+    for index, item in enumerate(request.items):
+        try:
+            valid_items.append(FeedbackRequest.model_validate(item))
+            valid_indexes.append(index)
+        except PydanticValidationError as e:
+            results[index] = BatchFeedbackItemResult(
+                index=index, success=False, error=_validation_message(e)
+            )
+    
+    responses = await feedback_service.process_feedback_batch(valid_items)
+    for index, response in zip(valid_indexes, responses):
+        results[index] = BatchFeedbackItemResult(
+            index=index,
+            success=response.success,
+            feedback_id=response.feedback_id,
+            duplicate=response.duplicate,
+            error=None if response.success else response.message
+        )
+    
+    accepted = sum(1 for result in results if result.success and not result.duplicate)
+    duplicates = sum(1 for result in results if result.duplicate)
+    failed = sum(1 for result in results if not result.success)
+    get_logger(__name__).info(
+        f"Feedback batch processed: items={len(results)} accepted={accepted} "
+        f"duplicates={duplicates} failed={failed}"
+    )
+    return BatchFeedbackResponse(
+        success=failed == 0,
+        results=results,
+        accepted=accepted,
+        duplicates=duplicates,
+        failed=failed
+    )
+
+
+def _validation_message(error: PydanticValidationError) -> str:
+    """Compact one-line description of a validation error"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+        for detail in error.errors()
+    )
@@ -0,0 +1,183 @@
+"""
+Post-response background work for Writers Block Service
+Bounded queue and worker task pool for work the client does not wait for
+(success logging, feedback analytics, notifications)
+"""
+
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import settings
+from .logging import get_logger
+from .metrics import registry
+
+logger = get_logger(__name__)
+
+Job = Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
+
+
+class BackgroundWorkQueue:
+    """
+    Bounded background work pipeline on the event loop
+
+    submit() queues a job (a plain or async callable) and returns at once;
+    worker tasks run jobs after the request has responded. When the queue is
+    full the caller runs the job itself, so sustained overload slows requests
+    down instead of growing memory or dropping work. Job failures are logged
+    and counted, never raised to the submitter.
+    """
+
+    def __init__(self, workers: int = 4, max_queue_size: int = 1000):
+        self.workers = max(1, workers)
+        self.max_queue_size = max_queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pending = 0
+
+        self.completed = 0
+        self.failed = 0
+        self.ran_inline = 0
+
+    async def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any):
+        """
+        Run fn(*args, **kwargs) after the current request
+
+        Args:
+            fn: Callable or coroutine function
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((fn, args, kwargs))
+            self._pending += 1
+        except asyncio.QueueFull:
+            # Backpressure: the caller does the work instead of queueing more
+            self.ran_inline += 1
+            await self._run((fn, args, kwargs))
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Wait until queued work has finished
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue was drained in time
+        """
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Background work not drained within {timeout}s "
+                           f"({self._queue.qsize()} jobs queued)")
+            return False
+
+    def drain_blocking(self, timeout: float) -> bool:
+        """
+        Drain from outside the event loop (e.g. at the end of a Lambda invocation)
+
+        Runs the loop the workers live on until the queue is empty, so work
+        queued during the invocation finishes before the environment freezes.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue was drained in time
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed() or loop.is_running() or not self.pending:
+            return True
+        return loop.run_until_complete(self.drain(timeout))
+
+    async def close(self, timeout: float):
+        """Drain queued work, then stop the workers"""
+        await self.drain(timeout)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Jobs queued or running"""
+        return self._pending
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get pipeline counters
+
+        Returns:
+            Queue depth and completed/failed/inline job counts
+        """
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "completed": self.completed,
+            "failed": self.failed,
+            "ran_inline": self.ran_inline
+        }
+
+    def _ensure_started(self):
+        """Start workers on the running loop (again if the loop changed)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._pending = 0
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [
+            loop.create_task(self._worker(), name=f"background-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def _worker(self):
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._pending -= 1
+                queue.task_done()
+
+    async def _run(self, job: Job):
+        fn, args, kwargs = job
+        try:
+            result = fn(*args, **kwargs)
+            if inspect.isawaitable(result):
+                await result
+            self.completed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Background job {getattr(fn, '__qualname__', fn)} failed: {type(e).__name__}")
+
+
+# Global pipeline (workers start with the first submitted job)
+background_work = BackgroundWorkQueue(
+    workers=settings.BACKGROUND_WORKERS,
+    max_queue_size=settings.BACKGROUND_QUEUE_SIZE
+)
+
+registry.callback(
+    "wb_background_queue_depth",
+    "Post-response jobs waiting for a background worker",
+    lambda: background_work.stats()["queued"]
+)
+registry.callback(
+    "wb_background_jobs_total",
+    "Post-response jobs by result (ran_inline: queue was full, caller ran it)",
+    lambda: {
+        (result,): count for result, count in background_work.stats().items() if result != "queued"
+    },
+    type_name="counter",
+    labelnames=("result",)
+)
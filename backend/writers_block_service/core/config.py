@@ -21,11 +21,107 @@ class Settings:
         "BEDROCK_MODEL_ID", 
         "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
     )
+    # Transport: "executor" (boto3 on a dedicated thread pool), "async" (httpx + SigV4)
+    # or "simulator" (local fake Bedrock for load tests, no AWS access needed)
+    BEDROCK_TRANSPORT: str = os.getenv("BEDROCK_TRANSPORT", "executor").lower()
+    BEDROCK_EXECUTOR_MAX_WORKERS: int = int(os.getenv("BEDROCK_EXECUTOR_MAX_WORKERS", "64"))
+    BEDROCK_HTTP_MAX_CONNECTIONS: int = int(os.getenv("BEDROCK_HTTP_MAX_CONNECTIONS", "256"))
+    BEDROCK_TIMEOUT_SECONDS: float = float(os.getenv("BEDROCK_TIMEOUT_SECONDS", "60"))
+    
+    # Bedrock Simulator Configuration (BEDROCK_TRANSPORT=simulator)
+    SIMULATOR_TTFT_MS: float = float(os.getenv("SIMULATOR_TTFT_MS", "400"))
+    SIMULATOR_LATENCY_SIGMA: float = float(os.getenv("SIMULATOR_LATENCY_SIGMA", "0.35"))
+    SIMULATOR_TOKENS_PER_SECOND: float = float(os.getenv("SIMULATOR_TOKENS_PER_SECOND", "60"))
+    SIMULATOR_THROTTLE_RATE: float = float(os.getenv("SIMULATOR_THROTTLE_RATE", "0"))
+    SIMULATOR_ERROR_RATE: float = float(os.getenv("SIMULATOR_ERROR_RATE", "0"))
+    SIMULATOR_MAX_CONCURRENCY: int = int(os.getenv("SIMULATOR_MAX_CONCURRENCY", "0"))
+    SIMULATOR_SEED: Optional[int] = int(os.getenv("SIMULATOR_SEED")) if os.getenv("SIMULATOR_SEED") else None
+    
+    # Model Routing Configuration
+    # JSON list of routes mapping action/tone/text-length buckets to model + region
+    # targets; empty routes everything to BEDROCK_MODEL_ID in AWS_REGION
+    MODEL_ROUTING_TABLE: str = os.getenv("MODEL_ROUTING_TABLE", "")
+    ROUTER_MAX_ERROR_RATE: float = float(os.getenv("ROUTER_MAX_ERROR_RATE", "0.5"))
+    # Seconds for a target's error rate to halve without traffic, so demoted targets recover (0 disables)
+    ROUTER_ERROR_HALF_LIFE_SECONDS: float = float(os.getenv("ROUTER_ERROR_HALF_LIFE_SECONDS", "30"))
+    # In-flight calls above which a route's fallback target is preferred (0 disables)
+    ROUTER_LOAD_THRESHOLD: int = int(os.getenv("ROUTER_LOAD_THRESHOLD", "0"))
+    
+    # Resilience Configuration
+    BEDROCK_MAX_RETRIES: int = int(os.getenv("BEDROCK_MAX_RETRIES", "3"))
+    RETRY_MAX_DELAY_SECONDS: float = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "4"))
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+    RETRY_BUDGET_MIN_PER_SECOND: float = float(os.getenv("RETRY_BUDGET_MIN_PER_SECOND", "1"))
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_SECONDS: float = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+    
+    # Prompt caching marks the system prompt and custom prompt templates as cacheable
+    # once the prefix reaches the target model's minimum cacheable length
+    ENABLE_PROMPT_CACHING: bool = os.getenv("ENABLE_PROMPT_CACHING", "true").lower() == "true"
+    
+    # Token Budget Configuration
+    TOKEN_BUDGET_MIN: int = int(os.getenv("TOKEN_BUDGET_MIN", "128"))
+    TOKEN_BUDGET_MAX: int = int(os.getenv("TOKEN_BUDGET_MAX", "4096"))
+    MAX_CONTINUATIONS: int = int(os.getenv("MAX_CONTINUATIONS", "2"))
+    
+    # Result Cache Configuration
+    ENABLE_RESULT_CACHE: bool = os.getenv("ENABLE_RESULT_CACHE", "true").lower() == "true"
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+    RESULT_CACHE_TTL_SECONDS: float = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+    RESULT_CACHE_MAX_BYTES: int = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    
+    # Request Coalescing Configuration
+    ENABLE_SINGLE_FLIGHT: bool = os.getenv("ENABLE_SINGLE_FLIGHT", "true").lower() == "true"
+    IDEMPOTENCY_TTL_SECONDS: float = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "300"))
+    
+    # Long Text Configuration
+    MAX_INPUT_CHARS: int = int(os.getenv("MAX_INPUT_CHARS", "10000"))
+    CHUNK_THRESHOLD_CHARS: int = int(os.getenv("CHUNK_THRESHOLD_CHARS", "4000"))
+    CHUNK_MAX_CHARS: int = int(os.getenv("CHUNK_MAX_CHARS", "3000"))
+    CHUNK_MAX_CONCURRENCY: int = int(os.getenv("CHUNK_MAX_CONCURRENCY", "4"))
+    
+    # Batch Processing Configuration
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+    
+    # Background Work Configuration
+    # Post-response work (success logging, feedback analytics); a full queue makes
+    # the request run its job inline
+    BACKGROUND_WORKERS: int = int(os.getenv("BACKGROUND_WORKERS", "4"))
+    BACKGROUND_QUEUE_SIZE: int = int(os.getenv("BACKGROUND_QUEUE_SIZE", "1000"))
+    BACKGROUND_DRAIN_TIMEOUT_SECONDS: float = float(os.getenv("BACKGROUND_DRAIN_TIMEOUT_SECONDS", "5"))
+    
+    # Feedback Batch Configuration
+    FEEDBACK_BATCH_MAX_ITEMS: int = int(os.getenv("FEEDBACK_BATCH_MAX_ITEMS", "100"))
+    # Feedback idempotency keys remembered for IDEMPOTENCY_TTL_SECONDS (oldest evicted first)
+    FEEDBACK_IDEMPOTENCY_MAX_KEYS: int = int(os.getenv("FEEDBACK_IDEMPOTENCY_MAX_KEYS", "10000"))
+    
+    # Feedback Store Configuration
+    # Append-only JSON-lines segments written by a background thread with group commits
+    FEEDBACK_STORE_ENABLED: bool = os.getenv("FEEDBACK_STORE_ENABLED", "false").lower() == "true"
+    FEEDBACK_STORE_DIR: str = os.getenv("FEEDBACK_STORE_DIR", "/tmp/writers-block-feedback")
+    FEEDBACK_SEGMENT_MAX_MB: float = float(os.getenv("FEEDBACK_SEGMENT_MAX_MB", "64"))
+    FEEDBACK_STORE_BATCH_SIZE: int = int(os.getenv("FEEDBACK_STORE_BATCH_SIZE", "500"))
+    # Records beyond the queue size are dropped (still logged) instead of blocking submissions
+    FEEDBACK_STORE_QUEUE_SIZE: int = int(os.getenv("FEEDBACK_STORE_QUEUE_SIZE", "10000"))
+    FEEDBACK_STORE_FSYNC: bool = os.getenv("FEEDBACK_STORE_FSYNC", "true").lower() == "true"
+    
+    # Feedback Stats Configuration
+    # In-memory rollups served at GET /api/v1/feedback/stats (per worker / Lambda instance);
+    # the endpoint is unauthenticated, so it is off unless explicitly enabled
+    ENABLE_FEEDBACK_STATS_ENDPOINT: bool = os.getenv("ENABLE_FEEDBACK_STATS_ENDPOINT", "false").lower() == "true"
+    # Distinct values kept per dimension (version, browser, ...); the rest count as "other"
+    FEEDBACK_STATS_MAX_KEYS: int = int(os.getenv("FEEDBACK_STATS_MAX_KEYS", "200"))
+    # Snapshot file so the rollups survive restarts (empty disables persistence)
+    FEEDBACK_STATS_SNAPSHOT_PATH: str = os.getenv("FEEDBACK_STATS_SNAPSHOT_PATH", "")
+    FEEDBACK_STATS_SNAPSHOT_INTERVAL_SECONDS: float = float(os.getenv("FEEDBACK_STATS_SNAPSHOT_INTERVAL_SECONDS", "60"))
     
     # Application Configuration
     APP_NAME: str = "Writers Block Service"
     VERSION: str = "0.1.0"
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
+    # Build AWS clients during the Lambda init phase instead of on the first invocation
+    LAMBDA_PREWARM: bool = os.getenv("LAMBDA_PREWARM", "true").lower() == "true"
     
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -35,6 +131,43 @@ class Settings:
     )
     ENABLE_CLOUDWATCH_LOGGING: bool = os.getenv("ENABLE_CLOUDWATCH_LOGGING", "true").lower() == "true"
     LOG_PROMPTS_ONLY: bool = os.getenv("LOG_PROMPTS_ONLY", "true").lower() == "true"
+    # Standard log records are written by a background thread; beyond this many queued
+    # records new ones are dropped and counted instead of blocking requests
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # "api": ship to CLOUDWATCH_LOG_GROUP via PutLogEvents; "emf": write Embedded
+    # Metric Format lines to stdout (the Lambda log group) with no API calls
+    CLOUDWATCH_LOG_MODE: str = os.getenv("CLOUDWATCH_LOG_MODE", "api").lower()
+    EMF_NAMESPACE: str = os.getenv("EMF_NAMESPACE", "WritersBlockService")
+    # Per-event keep rates, e.g. "request_start=0.1,request_success=0.1"; errors and
+    # requests slower than SLOW_REQUEST_MS are always logged
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "")
+    SLOW_REQUEST_MS: float = float(os.getenv("SLOW_REQUEST_MS", "2000"))
+    # Log a slow_request event with the per-stage breakdown for requests over SLOW_REQUEST_MS
+    LOG_SLOW_REQUESTS: bool = os.getenv("LOG_SLOW_REQUESTS", "false").lower() == "true"
+    # Background CloudWatch shipping: events beyond the queue size are dropped and counted
+    LOG_SHIPPER_QUEUE_SIZE: int = int(os.getenv("LOG_SHIPPER_QUEUE_SIZE", "10000"))
+    LOG_SHIPPER_BATCH_SIZE: int = int(os.getenv("LOG_SHIPPER_BATCH_SIZE", "1000"))
+    LOG_SHIPPER_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("LOG_SHIPPER_FLUSH_INTERVAL_SECONDS", "1"))
+    LOG_SHIPPER_FLUSH_TIMEOUT_SECONDS: float = float(os.getenv("LOG_SHIPPER_FLUSH_TIMEOUT_SECONDS", "2"))
+    
+    # Metrics Configuration
+    # Serve Prometheus text-format metrics at GET /metrics (per worker / Lambda instance)
+    ENABLE_METRICS_ENDPOINT: bool = os.getenv("ENABLE_METRICS_ENDPOINT", "true").lower() == "true"
+    # Report per-stage durations (validation, prompt, executor wait, Bedrock, ...) in a Server-Timing header
+    ENABLE_SERVER_TIMING: bool = os.getenv("ENABLE_SERVER_TIMING", "true").lower() == "true"
+    # Event loop lag monitor (long-running servers; Lambda does not run startup events)
+    ENABLE_LOOP_MONITOR: bool = os.getenv("ENABLE_LOOP_MONITOR", "true").lower() == "true"
+    LOOP_MONITOR_INTERVAL_MS: float = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100"))
+    # Loop stalls longer than this are logged, with the blocking stack
+    LOOP_LAG_THRESHOLD_MS: float = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+    
+    # Profiling Configuration
+    # The /admin profiling endpoints exist only when enabled and ADMIN_TOKEN is set
+    ENABLE_PROFILING: bool = os.getenv("ENABLE_PROFILING", "false").lower() == "true"
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "/tmp/writers-block-profiles")
+    PROFILE_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+    PROFILE_MAX_SECONDS: int = int(os.getenv("PROFILE_MAX_SECONDS", "120"))
     
     # Security Configuration
     CORS_ORIGINS: list = os.getenv("CORS_ORIGINS", "*").split(",")
@@ -48,6 +181,26 @@ class Settings:
     def is_development(self) -> bool:
         """Check if running in development environment"""
         return self.ENVIRONMENT.lower() == "development"
+    
+    @property
+    def use_emf_logging(self) -> bool:
+        """Check if structured logs are written as EMF to stdout"""
+        return self.CLOUDWATCH_LOG_MODE == "emf"
+    
+    @property
+    def profiling_enabled(self) -> bool:
+        """Check if the admin profiling endpoints are configured"""
+        return self.ENABLE_PROFILING and bool(self.ADMIN_TOKEN)
+    
+    @property
+    def feedback_lookup_enabled(self) -> bool:
+        """Check if the admin feedback lookup endpoint is configured"""
+        return self.FEEDBACK_STORE_ENABLED and bool(self.ADMIN_TOKEN)
+    
+    @property
+    def is_lambda(self) -> bool:
+        """Check if running inside AWS Lambda"""
+        return bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
 
 
 # Global settings instance
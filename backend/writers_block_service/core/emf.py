@@ -0,0 +1,100 @@
+"""
+CloudWatch Embedded Metric Format (EMF) for Writers Block Service
+Turns structured log entries into EMF documents, so numeric fields become
+CloudWatch metrics when the line is written to Lambda stdout
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+from .log_encoder import encode_log_entry
+
+# Written unformatted to stdout by the queued logging pipeline
+EMF_LOGGER_NAME = "writers_block_service.emf"
+_emf_logger = logging.getLogger(EMF_LOGGER_NAME)
+
+# Event -> (field, unit) pairs published as metrics. Counter fields that are
+# not part of the log entry (requests, errors) are emitted with a value of 1.
+EVENT_METRICS: Dict[str, List[Tuple[str, str]]] = {
+    "request_start": [
+        ("requests", "Count"),
+        ("text_length", "None")
+    ],
+    "request_success": [
+        ("processing_time_ms", "Milliseconds"),
+        ("time_to_first_token_ms", "Milliseconds"),
+        ("output_length", "None"),
+        ("bedrock_calls", "Count"),
+        ("bedrock_retries", "Count"),
+        ("input_tokens", "Count"),
+        ("output_tokens", "Count"),
+        ("cache_read_input_tokens", "Count"),
+        ("cache_creation_input_tokens", "Count")
+    ],
+    "request_error": [
+        ("errors", "Count")
+    ],
+    "validation_error": [
+        ("validation_errors", "Count")
+    ]
+}
+
+COUNTER_FIELDS = {"requests", "errors", "validation_errors"}
+
+# Dimension sets per event (only dimensions present in the entry are used)
+EVENT_DIMENSIONS: Dict[str, List[List[str]]] = {
+    "request_error": [["action", "environment"], ["error_type", "environment"]]
+}
+DEFAULT_DIMENSIONS = [["action", "environment"]]
+
+
+def build_emf_document(log_entry: Dict[str, Any], namespace: str,
+                       timestamp_ms: int) -> Dict[str, Any]:
+    """
+    Build an EMF document from a structured log entry
+
+    The log fields stay in the document, so it remains a normal structured
+    log line for Logs Insights.
+
+    Args:
+        log_entry: Structured log entry (must contain "event")
+        namespace: CloudWatch metric namespace
+        timestamp_ms: Event time in epoch milliseconds
+
+    Returns:
+        EMF document, or the entry unchanged for events without metrics
+    """
+    event = log_entry.get("event")
+    definitions = EVENT_METRICS.get(event)
+    if not definitions:
+        return log_entry
+
+    document = dict(log_entry)
+    metrics = []
+    for field, unit in definitions:
+        if field in COUNTER_FIELDS:
+            document[field] = 1
+        elif not isinstance(document.get(field), (int, float)) or isinstance(document.get(field), bool):
+            continue
+        metrics.append({"Name": field, "Unit": unit})
+
+    dimensions = [
+        dimension_set
+        for dimension_set in EVENT_DIMENSIONS.get(event, DEFAULT_DIMENSIONS)
+        if all(document.get(name) is not None for name in dimension_set)
+    ] or [["environment"]]
+
+    document["_aws"] = {
+        "Timestamp": timestamp_ms,
+        "CloudWatchMetrics": [{
+            "Namespace": namespace,
+            "Dimensions": dimensions,
+            "Metrics": metrics
+        }]
+    }
+    return document
+
+
+def write_emf(document: Dict[str, Any]):
+    """Queue an EMF document as a single stdout line (collected by Lambda)"""
+    _emf_logger.info(encode_log_entry(document))
@@ -45,12 +45,20 @@ class ConfigurationError(WritersBlockException):
         super().__init__(message, error_code="CONFIGURATION_ERROR", **kwargs)
 
 
+class ServiceUnavailableError(WritersBlockException):
+    """Upstream service degraded (e.g. Bedrock circuit breaker open)"""
+    
+    def __init__(self, message: str, **kwargs):
+        super().__init__(message, error_code="SERVICE_UNAVAILABLE", **kwargs)
+
+
 # User-friendly error messages (safe to expose to users)
 USER_ERROR_MESSAGES = {
     "VALIDATION_ERROR": "Invalid request parameters",
     "LLM_SERVICE_ERROR": "Unable to process text. Please try again.",
     "PROCESSING_ERROR": "Text processing failed. Please try again.",
     "CONFIGURATION_ERROR": "Service temporarily unavailable",
+    "SERVICE_UNAVAILABLE": "Service is busy right now. Please try again in a moment.",
     "UNKNOWN_ERROR": "An unexpected error occurred. Please try again."
 }
 
@@ -0,0 +1,35 @@
+"""
+Structured log encoder for Writers Block Service
+Serializes log entries with orjson when installed, else a preconfigured stdlib encoder
+"""
+
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # Optional speedup (pip install writers-block-service[fast-json])
+    orjson = None
+
+# Built once: json.dumps() with non-default options creates an encoder per call
+_json_encoder = json.JSONEncoder(
+    separators=(",", ":"),
+    ensure_ascii=False,
+    check_circular=False,
+    default=str
+)
+
+
+def encode_log_entry(entry: Dict[str, Any]) -> str:
+    """
+    Serialize a structured log entry to a single JSON line
+
+    Args:
+        entry: Log entry (values that are not JSON types are stringified)
+
+    Returns:
+        Compact JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(entry, default=str).decode("utf-8")
+    return _json_encoder.encode(entry)
@@ -0,0 +1,254 @@
+"""
+Background CloudWatch log shipper for Writers Block Service
+Queues log events in memory and ships them in batches from a worker thread,
+so request handlers never wait on CloudWatch Logs API calls
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# PutLogEvents limits
+MAX_BATCH_EVENTS = 10000
+MAX_BATCH_BYTES = 1048576
+EVENT_OVERHEAD_BYTES = 26
+MAX_EVENT_BYTES = 262144 - EVENT_OVERHEAD_BYTES
+
+RETRYABLE_CODES = {
+    "ThrottlingException",
+    "ServiceUnavailableException",
+    "InvalidSequenceTokenException"
+}
+
+LogEvent = Tuple[int, str]
+
+
+class _Marker:
+    """Queue marker asking the worker to ship everything queued before it"""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class CloudWatchLogShipper:
+    """
+    Batched, non-blocking CloudWatch Logs shipper
+
+    submit() only enqueues. A daemon thread groups events per stream and ships
+    a batch when it reaches max_batch_events, the PutLogEvents byte limit or
+    flush_interval seconds of age. When the queue is full new events are
+    dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any], log_group: str,
+                 fallback_logger: logging.Logger, max_queue_size: int = 10000,
+                 max_batch_events: int = 1000, flush_interval: float = 1.0,
+                 max_attempts: int = 3):
+        self.client_factory = client_factory
+        self.log_group = log_group
+        self.fallback_logger = fallback_logger
+        self.max_batch_events = min(max_batch_events, MAX_BATCH_EVENTS)
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._known_streams = set()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+
+    def submit(self, stream_name: str, timestamp_ms: int, message: str):
+        """
+        Queue a log event for shipping (never blocks)
+
+        Args:
+            stream_name: Target log stream
+            timestamp_ms: Event time in epoch milliseconds
+            message: Serialized log entry
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((stream_name, timestamp_ms, message))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """
+        Ship everything queued so far
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue was drained within the timeout
+        """
+        if self._thread is None:
+            return True
+        marker = _Marker()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Flush remaining events and stop the worker thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        marker = _Marker(stop=True)
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return
+        marker.done.wait(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get shipper counters
+
+        Returns:
+            Queue depth and sent/dropped/failed event counts
+        """
+        return {
+            "queued": self._queue.qsize(),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="cloudwatch-log-shipper", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        """Worker loop: accumulate events per stream and ship in batches"""
+        pending: Dict[str, List[LogEvent]] = {}
+        pending_bytes: Dict[str, int] = {}
+        oldest: Optional[float] = None
+
+        while True:
+            wait = None if oldest is None else max(0.0, oldest + self.flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                self._ship_all(pending, pending_bytes)
+                oldest = None
+                continue
+
+            if isinstance(item, _Marker):
+                self._ship_all(pending, pending_bytes)
+                oldest = None
+                item.done.set()
+                if item.stop:
+                    return
+                continue
+
+            stream_name, timestamp_ms, message = item
+            if len(message.encode("utf-8")) > MAX_EVENT_BYTES:
+                message = message.encode("utf-8")[:MAX_EVENT_BYTES].decode("utf-8", "ignore")
+            size = len(message.encode("utf-8")) + EVENT_OVERHEAD_BYTES
+
+            events = pending.get(stream_name)
+            if events and (len(events) >= self.max_batch_events or
+                           pending_bytes[stream_name] + size > MAX_BATCH_BYTES):
+                self._ship(stream_name, pending.pop(stream_name))
+                pending_bytes.pop(stream_name)
+                events = None
+            if events is None:
+                events = pending[stream_name] = []
+                pending_bytes[stream_name] = 0
+            events.append((timestamp_ms, message))
+            pending_bytes[stream_name] += size
+            if oldest is None:
+                oldest = time.monotonic()
+
+    def _ship_all(self, pending: Dict[str, List[LogEvent]], pending_bytes: Dict[str, int]):
+        for stream_name, events in pending.items():
+            self._ship(stream_name, events)
+        pending.clear()
+        pending_bytes.clear()
+
+    def _ship(self, stream_name: str, events: List[LogEvent]):
+        """Send one batch with PutLogEvents, retrying throttling and missing streams"""
+        from botocore.exceptions import ClientError
+
+        # PutLogEvents requires chronological order within a batch
+        events.sort(key=lambda event: event[0])
+        try:
+            client = self.client_factory()
+        except Exception:
+            client = None
+        if client is None:
+            self._fall_back(events)
+            return
+
+        for attempt in range(self.max_attempts):
+            try:
+                if stream_name not in self._known_streams:
+                    self._create_stream(client, stream_name)
+                # Sequence tokens are no longer required by PutLogEvents
+                client.put_log_events(
+                    logGroupName=self.log_group,
+                    logStreamName=stream_name,
+                    logEvents=[{"timestamp": ts, "message": message} for ts, message in events]
+                )
+                self.sent += len(events)
+                self.batches += 1
+                return
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code", "")
+                if code == "DataAlreadyAcceptedException":
+                    return
+                if code == "ResourceNotFoundException":
+                    self._known_streams.discard(stream_name)
+                elif code not in RETRYABLE_CODES:
+                    self.fallback_logger.warning(f"CloudWatch logging failed: {code}")
+                    break
+            except Exception as e:
+                self.fallback_logger.warning(f"CloudWatch logging failed: {type(e).__name__}")
+            time.sleep(min(2.0, 0.1 * (2 ** attempt)))
+
+        self.failed += len(events)
+        self._fall_back(events)
+
+    def _create_stream(self, client: Any, stream_name: str):
+        """Create a log stream (and the log group if it is missing)"""
+        from botocore.exceptions import ClientError
+
+        try:
+            client.create_log_stream(logGroupName=self.log_group, logStreamName=stream_name)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code", "")
+            if code == "ResourceNotFoundException":
+                try:
+                    client.create_log_group(logGroupName=self.log_group)
+                except ClientError as group_error:
+                    if group_error.response.get("Error", {}).get("Code") != "ResourceAlreadyExistsException":
+                        raise
+                client.create_log_stream(logGroupName=self.log_group, logStreamName=stream_name)
+            elif code != "ResourceAlreadyExistsException":
+                raise
+        self._known_streams.add(stream_name)
+
+    def _fall_back(self, events: List[LogEvent]):
+        """Write events to standard logging when CloudWatch is unavailable"""
+        for _, message in events:
+            self.fallback_logger.info(message)
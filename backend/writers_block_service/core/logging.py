@@ -3,16 +3,30 @@ Custom CloudWatch logging utility for Writers Block Service
 Secure logging that only logs prompts and metadata, never user content
 """
 
-import json
 import re
+import atexit
 import hashlib
 import logging
-from datetime import datetime
-from typing import Any, Dict, Optional
-import boto3
-from botocore.exceptions import ClientError
+import logging.handlers
+import queue
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 from .config import settings
+from .emf import EMF_LOGGER_NAME, build_emf_document, write_emf
+from .log_encoder import encode_log_entry
+from .log_shipper import CloudWatchLogShipper
+from .metrics import registry
+
+# Control characters that could break or forge log lines
+_UNSAFE_LOG_CHARS = re.compile(r'[\r\n\t\x00-\x1f\x7f-\x9f]')
+
+# Events that are never sampled out
+ALWAYS_LOGGED_EVENTS = {"request_error", "validation_error", "slow_request"}
 
 
 def sanitize_for_log(value: Any, max_length: int = 100) -> str:
@@ -30,10 +44,10 @@ def sanitize_for_log(value: Any, max_length: int = 100) -> str:
         return "[null]"
     
     # Convert to string
-    text = str(value)
+    text = value if isinstance(value, str) else str(value)
     
     # Remove dangerous characters that could break logs
-    sanitized = re.sub(r'[\r\n\t\x00-\x1f\x7f-\x9f]', ' ', text)
+    sanitized = _UNSAFE_LOG_CHARS.sub(' ', text)
     
     # Truncate if too long and add hash for debugging
     if len(sanitized) > max_length:
@@ -43,6 +57,37 @@ def sanitize_for_log(value: Any, max_length: int = 100) -> str:
     return sanitized
 
 
+@lru_cache(maxsize=256)
+def _prompt_template_fields(prompt_template: str) -> Tuple[str, str]:
+    """Sanitized template and hash (templates repeat, so both are cached)"""
+    return (
+        sanitize_for_log(prompt_template, 200),
+        hashlib.sha256(prompt_template.encode()).hexdigest()[:8]
+    )
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """
+    Parse per-event sample rates
+    
+    Args:
+        value: Comma-separated event=rate pairs, e.g. "request_start=0.1,request_success=0.1"
+        
+    Returns:
+        Dictionary of event name to keep rate (0.0 - 1.0)
+    """
+    rates = {}
+    for pair in value.split(","):
+        if "=" not in pair:
+            continue
+        event, rate = pair.split("=", 1)
+        try:
+            rates[event.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
 class CloudWatchLogger:
     """
     Custom CloudWatch logger for structured, secure logging
@@ -50,26 +95,88 @@ class CloudWatchLogger:
     """
     
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
-        self.cloudwatch_client = None
-        
-        if settings.ENABLE_CLOUDWATCH_LOGGING:
-            try:
-                self.cloudwatch_client = boto3.client('logs', region_name=settings.AWS_REGION)
-                self._ensure_log_group_exists()
-            except Exception as e:
-                self.logger.warning(f"Failed to initialize CloudWatch client: {e}")
+        self.logger = get_logger(__name__)
+        # The logs client is created on first use (or by warm()) to keep imports cheap
+        self._cloudwatch_client = None
+        self._client_initialized = False
+        self.sample_rates = parse_sample_rates(settings.LOG_SAMPLE_RATES)
+        self.sampled_out = 0
+        self._stream_day = None
+        self._stream_name = None
+        # Log events are shipped in batches from a background thread
+        self.shipper = CloudWatchLogShipper(
+            client_factory=lambda: self.cloudwatch_client,
+            log_group=settings.CLOUDWATCH_LOG_GROUP,
+            fallback_logger=self.logger,
+            max_queue_size=settings.LOG_SHIPPER_QUEUE_SIZE,
+            max_batch_events=settings.LOG_SHIPPER_BATCH_SIZE,
+            flush_interval=settings.LOG_SHIPPER_FLUSH_INTERVAL_SECONDS
+        )
+        registry.callback(
+            "wb_log_events_dropped_total",
+            "Log events dropped because the shipping queue was full",
+            lambda: self.shipper.dropped,
+            type_name="counter"
+        )
+    
+    @property
+    def cloudwatch_client(self):
+        """CloudWatch Logs client, created and log group ensured on first access"""
+        if not self._client_initialized:
+            self._client_initialized = True
+            if settings.ENABLE_CLOUDWATCH_LOGGING and not settings.use_emf_logging:
+                try:
+                    import boto3
+                    
+                    self._cloudwatch_client = boto3.client('logs', region_name=settings.AWS_REGION)
+                    self._ensure_log_group_exists()
+                except Exception as e:
+                    self._cloudwatch_client = None
+                    self.logger.warning(f"Failed to initialize CloudWatch client: {e}")
+        return self._cloudwatch_client
+    
+    def warm(self):
+        """Create the CloudWatch client ahead of the first log call (e.g. Lambda init)"""
+        _ = self.cloudwatch_client
     
     def _ensure_log_group_exists(self):
         """Ensure the CloudWatch log group exists"""
+        from botocore.exceptions import ClientError
+
         try:
-            self.cloudwatch_client.create_log_group(
+            self._cloudwatch_client.create_log_group(
                 logGroupName=settings.CLOUDWATCH_LOG_GROUP
             )
         except ClientError as e:
             if e.response['Error']['Code'] != 'ResourceAlreadyExistsException':
                 self.logger.warning(f"Failed to create log group: {e}")
     
+    def _should_log(self, event: str, session_id: str,
+                    processing_time_ms: Optional[float] = None) -> bool:
+        """
+        Decide whether to keep a routine event under LOG_SAMPLE_RATES
+        
+        Errors and slow requests are always kept. The decision is derived from
+        the session ID, so a request's start and success are kept together.
+        
+        Args:
+            event: Event name
+            session_id: Request session ID
+            processing_time_ms: Request duration, if known
+            
+        Returns:
+            True if the event should be logged
+        """
+        rate = self.sample_rates.get(event, 1.0)
+        if rate >= 1.0 or event in ALWAYS_LOGGED_EVENTS:
+            return True
+        if processing_time_ms is not None and processing_time_ms >= settings.SLOW_REQUEST_MS:
+            return True
+        if zlib.crc32(session_id.encode()) / 0xFFFFFFFF < rate:
+            return True
+        self.sampled_out += 1
+        return False
+    
     def _create_log_entry(self, event: str, session_id: str, **kwargs) -> Dict[str, Any]:
         """Create structured log entry"""
         log_entry = {
@@ -80,46 +187,58 @@ class CloudWatchLogger:
             "environment": settings.ENVIRONMENT,
             **kwargs
         }
+        rate = self.sample_rates.get(event)
+        if rate is not None and rate < 1.0:
+            # Lets dashboards scale sampled counts back up
+            log_entry["sample_rate"] = rate
         return log_entry
     
     def _log_to_cloudwatch(self, log_entry: Dict[str, Any]):
-        """Send log entry to CloudWatch"""
-        if not self.cloudwatch_client or not settings.ENABLE_CLOUDWATCH_LOGGING:
+        """Queue log entry for CloudWatch (shipped in the background, never blocks)"""
+        if not settings.ENABLE_CLOUDWATCH_LOGGING:
             # Fallback to standard logging
-            self.logger.info(json.dumps(log_entry))
+            self.logger.info(encode_log_entry(log_entry))
             return
         
-        try:
-            # Create log stream name with timestamp
-            stream_name = f"lambda-{datetime.utcnow().strftime('%Y-%m-%d')}"
-            
-            # Try to create log stream (ignore if exists)
-            try:
-                self.cloudwatch_client.create_log_stream(
-                    logGroupName=settings.CLOUDWATCH_LOG_GROUP,
-                    logStreamName=stream_name
-                )
-            except ClientError as e:
-                if e.response['Error']['Code'] != 'ResourceAlreadyExistsException':
-                    raise
-            
-            # Send log event
-            self.cloudwatch_client.put_log_events(
-                logGroupName=settings.CLOUDWATCH_LOG_GROUP,
-                logStreamName=stream_name,
-                logEvents=[{
-                    'timestamp': int(datetime.utcnow().timestamp() * 1000),
-                    'message': json.dumps(log_entry)
-                }]
-            )
+        # EMF mode: Lambda ships stdout to CloudWatch, no API calls needed
+        if settings.use_emf_logging:
+            write_emf(build_emf_document(log_entry, settings.EMF_NAMESPACE, int(time.time() * 1000)))
+            return
+        
+        timestamp_ms = int(time.time() * 1000)
+        self.shipper.submit(self._daily_stream_name(timestamp_ms), timestamp_ms,
+                            encode_log_entry(log_entry))
+    
+    def _daily_stream_name(self, timestamp_ms: int) -> str:
+        """Log stream name for the event's UTC day (formatted once per day)"""
+        day = timestamp_ms // 86400000
+        if day != self._stream_day:
+            date = datetime.fromtimestamp(day * 86400, timezone.utc)
+            self._stream_name = f"lambda-{date.strftime('%Y-%m-%d')}"
+            self._stream_day = day
+        return self._stream_name
+    
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Ship queued log entries (e.g. before a Lambda invocation is frozen)
+        
+        Args:
+            timeout: Maximum seconds to wait (defaults to LOG_SHIPPER_FLUSH_TIMEOUT_SECONDS)
             
-        except Exception as e:
-            # Fallback to standard logging if CloudWatch fails
-            self.logger.warning(f"CloudWatch logging failed: {e}")
-            self.logger.info(json.dumps(log_entry))
+        Returns:
+            True if all queued entries were shipped in time
+        """
+        if timeout is None:
+            timeout = settings.LOG_SHIPPER_FLUSH_TIMEOUT_SECONDS
+        return self.shipper.flush(timeout)
+    
+    def close(self):
+        """Ship remaining log entries and stop the background shipper"""
+        self.shipper.close()
     
     def log_request_start(self, session_id: str, action: str, text_length: int, 
-                         has_custom_prompt: bool = False, prompt_template: str = None):
+                         has_custom_prompt: bool = False, prompt_template: str = None,
+                         client: Optional[Dict[str, str]] = None):
         """
         Log request start with safe metadata only
         
@@ -129,23 +248,31 @@ class CloudWatchLogger:
             text_length: Length of user text (not the content)
             has_custom_prompt: Whether request uses custom prompt
             prompt_template: Custom prompt template (safe to log)
+            client: Browser, browser_version and platform from the User-Agent
         """
+        if not self._should_log("request_start", session_id):
+            return
+        
         log_data = {
             "action": action,
             "text_length": text_length,
             "has_custom_prompt": has_custom_prompt
         }
+        if client:
+            log_data.update(client)
         
         # Only log prompt templates (safe), never user content
         if has_custom_prompt and prompt_template and settings.LOG_PROMPTS_ONLY:
-            log_data["prompt_template"] = sanitize_for_log(prompt_template, 200)
-            log_data["prompt_template_hash"] = hashlib.sha256(prompt_template.encode()).hexdigest()[:8]
+            log_data["prompt_template"], log_data["prompt_template_hash"] = \
+                _prompt_template_fields(prompt_template)
         
         log_entry = self._create_log_entry("request_start", session_id, **log_data)
         self._log_to_cloudwatch(log_entry)
     
     def log_request_success(self, session_id: str, action: str, processing_time_ms: float, 
-                           output_length: int):
+                           output_length: int, time_to_first_token_ms: Optional[float] = None,
+                           token_usage: Optional[Dict[str, int]] = None,
+                           stage_timings_ms: Optional[Dict[str, float]] = None):
         """
         Log successful request completion
         
@@ -154,7 +281,13 @@ class CloudWatchLogger:
             action: Action type
             processing_time_ms: Processing time in milliseconds
             output_length: Length of output text (not the content)
+            time_to_first_token_ms: Time until first streamed token (streaming only)
+            token_usage: Bedrock token counters, including prompt cache reads/writes
+            stage_timings_ms: Milliseconds per processing stage
         """
+        if not self._should_log("request_success", session_id, processing_time_ms):
+            return
+        
         log_data = {
             "action": action,
             "processing_time_ms": round(processing_time_ms, 2),
@@ -162,11 +295,21 @@ class CloudWatchLogger:
             "status": "success"
         }
         
+        if time_to_first_token_ms is not None:
+            log_data["time_to_first_token_ms"] = round(time_to_first_token_ms, 2)
+        
+        if token_usage:
+            log_data.update(token_usage)
+        
+        if stage_timings_ms:
+            log_data["stage_timings_ms"] = stage_timings_ms
+        
         log_entry = self._create_log_entry("request_success", session_id, **log_data)
         self._log_to_cloudwatch(log_entry)
     
     def log_request_error(self, session_id: str, action: str, error_type: str, 
-                         error_code: Optional[str] = None):
+                         error_code: Optional[str] = None,
+                         stage_timings_ms: Optional[Dict[str, float]] = None):
         """
         Log request error without exposing sensitive data
         
@@ -175,6 +318,7 @@ class CloudWatchLogger:
             action: Action type
             error_type: Type of error (validation, processing, service)
             error_code: Optional error code for debugging
+            stage_timings_ms: Milliseconds per processing stage
         """
         log_data = {
             "action": action,
@@ -185,9 +329,42 @@ class CloudWatchLogger:
         if error_code:
             log_data["error_code"] = sanitize_for_log(error_code, 50)
         
+        if stage_timings_ms:
+            log_data["stage_timings_ms"] = stage_timings_ms
+        
         log_entry = self._create_log_entry("request_error", session_id, level="ERROR", **log_data)
         self._log_to_cloudwatch(log_entry)
     
+    def log_slow_request(self, session_id: str, action: str, endpoint: str,
+                         processing_time_ms: float, stage_timings_ms: Dict[str, float],
+                         status: str, token_usage: Optional[Dict[str, int]] = None):
+        """
+        Log the full stage breakdown of a request slower than SLOW_REQUEST_MS
+        
+        Args:
+            session_id: Request session ID
+            action: Action type
+            endpoint: Endpoint that served the request (process_text, stream)
+            processing_time_ms: Processing time in milliseconds
+            stage_timings_ms: Milliseconds per processing stage
+            status: Request outcome (success, error)
+            token_usage: Bedrock token counters
+        """
+        log_data = {
+            "action": action,
+            "endpoint": endpoint,
+            "processing_time_ms": round(processing_time_ms, 2),
+            "threshold_ms": settings.SLOW_REQUEST_MS,
+            "stage_timings_ms": stage_timings_ms,
+            "status": status
+        }
+        
+        if token_usage:
+            log_data.update(token_usage)
+        
+        log_entry = self._create_log_entry("slow_request", session_id, level="WARNING", **log_data)
+        self._log_to_cloudwatch(log_entry)
+    
     def log_validation_error(self, session_id: str, validation_field: str, error_message: str):
         """
         Log validation errors for debugging
@@ -207,19 +384,134 @@ class CloudWatchLogger:
         self._log_to_cloudwatch(log_entry)
 
 
-# Global logger instance
-cloudwatch_logger = CloudWatchLogger()
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller
+    
+    Records are enqueued unformatted (only %-style args are merged, since they
+    may change after the call) and formatted by the listener thread. When the
+    queue is full the record is dropped and counted.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _EmfFilter(logging.Filter):
+    """Route EMF records to stdout only (emit=True) or keep them out (emit=False)"""
+    
+    def __init__(self, emit: bool):
+        super().__init__()
+        self.emit = emit
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        return (record.name == EMF_LOGGER_NAME) == self.emit
+
+
+_queue_handler: Optional[DroppingQueueHandler] = None
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging() -> DroppingQueueHandler:
+    """
+    Route all standard logging through a bounded queue (idempotent)
+    
+    The root logger gets a single DroppingQueueHandler. A QueueListener
+    thread formats records and writes them to stderr, and writes EMF lines
+    to stdout unformatted, so request handlers never wait on stream I/O.
+    
+    Returns:
+        The queue handler (exposes the dropped-record counter)
+    """
+    global _queue_handler, _queue_listener
+    if _queue_handler is not None:
+        return _queue_handler
+    
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    ))
+    console_handler.addFilter(_EmfFilter(emit=False))
+    emf_handler = logging.StreamHandler(sys.stdout)
+    emf_handler.setFormatter(logging.Formatter('%(message)s'))
+    emf_handler.addFilter(_EmfFilter(emit=True))
+    
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(getattr(logging, settings.LOG_LEVEL))
+    # EMF lines are metrics, not diagnostics: never filtered by LOG_LEVEL
+    logging.getLogger(EMF_LOGGER_NAME).setLevel(logging.INFO)
+    
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, emf_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
+    
+    registry.callback(
+        "wb_log_records_dropped_total",
+        "Standard log records dropped because the logging queue was full",
+        lambda: _queue_handler.dropped,
+        type_name="counter"
+    )
+    registry.callback(
+        "wb_log_queue_depth",
+        "Standard log records waiting to be written",
+        log_queue.qsize
+    )
+    return _queue_handler
+
+
+def flush_logging(timeout: float = 1.0) -> bool:
+    """
+    Wait until queued log records have been written (e.g. before Lambda freezes)
+    
+    Args:
+        timeout: Maximum seconds to wait
+        
+    Returns:
+        True if the logging queue was drained in time
+    """
+    if _queue_handler is None:
+        return True
+    log_queue = _queue_handler.queue
+    deadline = time.monotonic() + timeout
+    with log_queue.all_tasks_done:
+        while log_queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            log_queue.all_tasks_done.wait(remaining)
+    return True
 
 
 def get_logger(name: str) -> logging.Logger:
-    """Get configured standard logger for fallback"""
-    logger = logging.getLogger(name)
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(getattr(logging, settings.LOG_LEVEL))
-    return logger
+    """
+    Get a standard logger
+
+    Records go through the queued pipeline once the application has called
+    configure_logging(); importing a module never reconfigures logging.
+    """
+    return logging.getLogger(name)
+
+
+# Global logger instance
+cloudwatch_logger = CloudWatchLogger()
@@ -0,0 +1,149 @@
+"""
+Event loop lag monitor for Writers Block Service
+Measures event loop scheduling delay and logs the stack of code that blocks the loop
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+from .config import settings
+from .logging import get_logger
+from .metrics import registry
+
+logger = get_logger(__name__)
+
+# Seconds; loop lag is usually sub-millisecond, stalls range up to seconds
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+LOOP_LAG = registry.histogram(
+    "wb_event_loop_lag_seconds",
+    "Delay between when a timer was due on the event loop and when it ran",
+    buckets=LAG_BUCKETS
+)
+LOOP_STALLS = registry.counter(
+    "wb_event_loop_stalls_total",
+    "Times the event loop was blocked for longer than LOOP_LAG_THRESHOLD_MS"
+)
+
+
+class LoopLagMonitor:
+    """
+    Event loop lag monitor
+
+    A coroutine sleeps for interval and records how late it wakes up; that
+    delay is the time any ready callback would have waited. A watchdog thread
+    checks the coroutine's heartbeat and, while the loop is still blocked,
+    logs the loop thread's stack, i.e. the code doing the blocking.
+    """
+
+    def __init__(self, interval_ms: float = 100.0, threshold_ms: float = 100.0,
+                 dump_cooldown_seconds: float = 30.0):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.dump_cooldown = dump_cooldown_seconds
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = 0.0
+        self._reported_beat = 0.0
+        self._last_dump = 0.0
+
+        self.max_lag = 0.0
+        self.stalls = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start monitoring the running event loop (call from inside the loop)"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started (interval {self.interval * 1000:.0f}ms, "
+            f"threshold {self.threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self):
+        """Stop the monitor coroutine and watchdog thread"""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get monitor counters
+
+        Returns:
+            Largest lag seen (ms) and the number of stalls over the threshold
+        """
+        return {"max_lag_ms": round(self.max_lag * 1000, 2), "stalls": self.stalls}
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            self._heartbeat = now
+            LOOP_LAG.observe(lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
+            if lag >= self.threshold:
+                self.stalls += 1
+                LOOP_STALLS.inc()
+                logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms")
+
+    def _watch(self):
+        """Watchdog thread: dump the loop thread's stack while it is blocked"""
+        poll = min(self.interval, self.threshold) / 2
+        last_wake = time.perf_counter()
+        while not self._stop.wait(poll):
+            now = time.perf_counter()
+            overslept = now - last_wake - poll
+            last_wake = now
+            if overslept > self.threshold:
+                # The whole process was paused (debugger, SIGSTOP, frozen sandbox)
+                continue
+
+            beat = self._heartbeat
+            blocked_for = now - beat - self.interval
+            if blocked_for < self.threshold or beat == self._reported_beat:
+                continue
+            self._reported_beat = beat
+            if now - self._last_dump < self.dump_cooldown:
+                continue
+            self._last_dump = now
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                f"Event loop blocked for over {blocked_for * 1000:.0f}ms, "
+                f"loop thread stack:\n{stack}"
+            )
+
+
+# Global monitor (started with the application)
+loop_monitor = LoopLagMonitor(
+    interval_ms=settings.LOOP_MONITOR_INTERVAL_MS,
+    threshold_ms=settings.LOOP_LAG_THRESHOLD_MS
+)
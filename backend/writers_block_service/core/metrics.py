@@ -0,0 +1,297 @@
+"""
+In-process metrics registry for Writers Block Service
+Counters, gauges and histograms rendered in the Prometheus text format
+
+Recording is lock-free: values are updated on the event loop thread, so a
+hot-path observation is a dict lookup, a bisect and two additions. Only
+creating a new label combination takes a lock.
+"""
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; spans cache hits (ms) to long Bedrock generations (tens of seconds)
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    """Base class for a metric family with optional labels"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def labels(self, *values: str):
+        """Get the child for a label combination (created on first use)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the value holder for one label combination"""
+
+    def _default(self):
+        return self._children[()]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: LabelValues, child) -> List[str]:
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.value)}"]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default().dec(amount)
+
+    def set(self, value: float):
+        self._default().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    """Distribution of observations in fixed buckets"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def _render_child(self, values: LabelValues, child: _HistogramValue) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), child.counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+CallbackResult = Union[float, Dict[LabelValues, float]]
+
+
+class CallbackMetric(_Metric):
+    """Metric whose value is read from a callback at scrape time (zero hot-path cost)"""
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], CallbackResult],
+                 type_name: str = "gauge", labelnames: Sequence[str] = ()):
+        self.type_name = type_name
+        self.callback = callback
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return None
+
+    def render(self) -> List[str]:
+        try:
+            result = self.callback()
+        except Exception:
+            return []
+        if result is None:
+            return []
+        if not isinstance(result, dict):
+            result = {(): result}
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for values, value in result.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, callback: Callable[[], CallbackResult],
+                 type_name: str = "gauge", labelnames: Sequence[str] = ()) -> CallbackMetric:
+        """Register (or replace) a metric read from a callback at scrape time"""
+        metric = CallbackMetric(name, documentation, callback, type_name, labelnames)
+        self._metrics[name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            Exposition text (version 0.0.4)
+        """
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry and the service's metrics
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    "wb_request_duration_seconds",
+    "Text processing request latency",
+    ("endpoint", "action", "tone")
+)
+REQUESTS_IN_FLIGHT = registry.gauge(
+    "wb_requests_in_flight",
+    "Text processing requests currently being handled"
+)
+BEDROCK_LATENCY = registry.histogram(
+    "wb_bedrock_call_duration_seconds",
+    "Bedrock call latency including retries (streams: until the last event)",
+    ("target", "mode", "outcome")
+)
+INPUT_CHARACTERS = registry.counter(
+    "wb_input_characters_total",
+    "Characters of selected text received",
+    ("action",)
+)
+OUTPUT_CHARACTERS = registry.counter(
+    "wb_output_characters_total",
+    "Characters of processed text returned",
+    ("action",)
+)
+TOKENS = registry.counter(
+    "wb_bedrock_tokens_total",
+    "Bedrock tokens by kind (input, output, cache_read, cache_creation)",
+    ("kind",)
+)
+ERRORS = registry.counter(
+    "wb_errors_total",
+    "Failed text processing requests by error code",
+    ("error_code",)
+)
+
+
+KNOWN_TONES = {"professional", "casual", "academic", "creative", "technical"}
+
+
+def tone_label(parameters: Optional[Dict[str, str]]) -> str:
+    """Bounded-cardinality tone label (custom prompts and unknown tones are bucketed)"""
+    parameters = parameters or {}
+    if parameters.get("custom_prompt"):
+        return "custom"
+    tone = parameters.get("tone")
+    if not tone:
+        return "none"
+    return tone if tone in KNOWN_TONES else "other"
@@ -0,0 +1,259 @@
+"""
+On-demand CPU profiling for Writers Block Service
+Wall-clock stack sampling to collapsed stacks and 1-in-K request profiling to pstats
+"""
+
+import asyncio
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile of the same kind is already running"""
+
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+
+
+def list_profiles(output_dir: str) -> List[Dict[str, Any]]:
+    """
+    List profile files written to a directory
+
+    Args:
+        output_dir: Profile directory
+
+    Returns:
+        File name, size and modification time per profile, newest first
+    """
+    if not os.path.isdir(output_dir):
+        return []
+    profiles = []
+    for entry in os.scandir(output_dir):
+        if entry.is_file() and entry.name.endswith((".folded", ".pstats")):
+            stat = entry.stat()
+            profiles.append({
+                "name": entry.name,
+                "size_bytes": stat.st_size,
+                "modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()
+            })
+    return sorted(profiles, key=lambda profile: profile["modified"], reverse=True)
+
+
+class SamplingProfiler:
+    """
+    Wall-clock stack sampler for all threads of the process
+
+    A background thread snapshots every thread's stack each interval and
+    writes the counts as collapsed stacks ("thread;outer;...;inner count"),
+    the input format of flamegraph.pl and speedscope. Threads blocked on
+    I/O are sampled too, so the event loop waiting in select() shows up as
+    idle time rather than disappearing.
+    """
+
+    def __init__(self, output_dir: str, interval_ms: float = 5.0):
+        self.output_dir = output_dir
+        self.interval_ms = interval_ms
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._labels: Dict[Any, str] = {}
+        self.current_profile: Optional[str] = None
+        self.last_profile: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, interval_ms: Optional[float] = None) -> str:
+        """
+        Start sampling in the background
+
+        Args:
+            seconds: How long to sample
+            interval_ms: Sampling interval (defaults to the profiler's interval)
+
+        Returns:
+            File name the profile will be written to
+
+        Raises:
+            ProfilerBusyError: If a sampling profile is already running
+        """
+        with self._lock:
+            if self.running:
+                raise ProfilerBusyError("A sampling profile is already running")
+            os.makedirs(self.output_dir, exist_ok=True)
+            name = f"sampling-{_timestamp()}.folded"
+            self.current_profile = name
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(seconds, (interval_ms or self.interval_ms) / 1000, name),
+                name="sampling-profiler",
+                daemon=True
+            )
+            self._thread.start()
+        logger.info(f"Sampling profiler started for {seconds}s -> {name}")
+        return name
+
+    def _run(self, seconds: float, interval: float, name: str):
+        own_id = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        try:
+            while time.monotonic() < deadline:
+                thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id != own_id:
+                        stacks[self._collapse(frame, thread_names.get(thread_id, str(thread_id)))] += 1
+                samples += 1
+                time.sleep(interval)
+            self._write(name, stacks)
+            logger.info(f"Sampling profile written: {name} ({samples} samples)")
+        except Exception as e:
+            logger.warning(f"Sampling profiler failed: {type(e).__name__}")
+        finally:
+            self.current_profile = None
+            self.last_profile = name
+
+    def _collapse(self, frame, thread_name: str) -> str:
+        """Collapse a stack into "thread;outer;...;inner" (frame labels cached per code object)"""
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = (
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                ).replace(";", ":")
+            labels.append(label)
+            frame = frame.f_back
+        labels.append(thread_name.replace(";", ":"))
+        labels.reverse()
+        return ";".join(labels)
+
+    def _write(self, name: str, stacks: Counter):
+        path = os.path.join(self.output_dir, name)
+        with open(path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RequestProfiler:
+    """
+    Profiles 1-in-K requests with cProfile, one pstats file per request
+
+    cProfile traces the whole event loop thread (all threads on Python 3.12+),
+    so coroutines of other requests that run while a sampled request is
+    awaiting are included in its profile. Only one request is profiled at a
+    time.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.every = 0
+        self.remaining = 0
+        self._seen = 0
+        self._busy = False
+        self.written = 0
+
+    @property
+    def armed(self) -> bool:
+        return self.every > 0 and self.remaining > 0
+
+    def arm(self, every: int, count: int):
+        """
+        Start profiling every Kth request
+
+        Args:
+            every: Profile one request in this many
+            count: Stop after this many profiles
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.every = every
+        self.remaining = count
+        self._seen = 0
+        logger.info(f"Request profiling armed: 1 in {every}, {count} profiles")
+
+    def disarm(self):
+        """Stop profiling requests"""
+        self.every = 0
+        self.remaining = 0
+
+    def _claim(self) -> bool:
+        """Decide whether to profile the next request"""
+        if not self.armed or self._busy:
+            return False
+        self._seen += 1
+        if self._seen % self.every:
+            return False
+        self._busy = True
+        self.remaining -= 1
+        return True
+
+    async def run(self, call: Callable[[], Any], label: str):
+        """
+        Await call, profiling it if this request is sampled
+
+        Args:
+            call: Zero-argument coroutine function handling the request
+            label: Request label used in the profile file name (e.g. the path)
+        """
+        if not self._claim():
+            await call()
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) owns the thread
+            self._busy = False
+            self.remaining += 1
+            await call()
+            return
+        try:
+            try:
+                await call()
+            finally:
+                profile.disable()
+            self.written += 1
+            slug = _UNSAFE_FILENAME_CHARS.sub("_", label).strip("_")[:60] or "root"
+            name = f"request-{_timestamp()}-{self.written}-{slug}.pstats"
+            # Dumping builds the stats table, keep it off the event loop
+            await asyncio.to_thread(profile.dump_stats, os.path.join(self.output_dir, name))
+            logger.info(f"Request profile written: {name}")
+        finally:
+            self._busy = False
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that routes HTTP requests through the RequestProfiler"""
+
+    def __init__(self, app: Callable, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] != "http" or not self.profiler.armed:
+            await self.app(scope, receive, send)
+            return
+        await self.profiler.run(lambda: self.app(scope, receive, send), scope.get("path", ""))
+
+
+# Global profilers (inactive until started through the admin endpoints)
+sampling_profiler = SamplingProfiler(settings.PROFILE_DIR, settings.PROFILE_SAMPLE_INTERVAL_MS)
+request_profiler = RequestProfiler(settings.PROFILE_DIR)
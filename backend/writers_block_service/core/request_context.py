@@ -0,0 +1,182 @@
+"""
+Per-request context for Writers Block Service
+Accumulates LLM token usage and per-stage timings across the work done for one request
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+
+class RequestUsage:
+    """Token usage and call counts accumulated across Bedrock calls for one request"""
+
+    __slots__ = (
+        "bedrock_calls",
+        "bedrock_retries",
+        "input_tokens",
+        "output_tokens",
+        "cache_read_input_tokens",
+        "cache_creation_input_tokens"
+    )
+
+    def __init__(self):
+        self.bedrock_calls = 0
+        self.bedrock_retries = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_input_tokens = 0
+        self.cache_creation_input_tokens = 0
+
+    def add(self, usage: Optional[Dict[str, Any]]):
+        """
+        Add usage reported by a Bedrock response or stream event
+
+        Args:
+            usage: Anthropic usage block (missing fields count as zero)
+        """
+        if not usage:
+            return
+        self.input_tokens += usage.get("input_tokens") or 0
+        self.output_tokens += usage.get("output_tokens") or 0
+        self.cache_read_input_tokens += usage.get("cache_read_input_tokens") or 0
+        self.cache_creation_input_tokens += usage.get("cache_creation_input_tokens") or 0
+
+    def as_log_fields(self) -> Dict[str, int]:
+        """
+        Get usage as structured log fields
+
+        Returns:
+            Dictionary of token counters (safe to log - no content)
+        """
+        return {
+            "bedrock_calls": self.bedrock_calls,
+            "bedrock_retries": self.bedrock_retries,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_input_tokens": self.cache_read_input_tokens,
+            "cache_creation_input_tokens": self.cache_creation_input_tokens
+        }
+
+
+_current_usage: ContextVar[Optional[RequestUsage]] = ContextVar("request_usage", default=None)
+
+
+def start_request_usage() -> RequestUsage:
+    """
+    Start usage accounting for the current request
+
+    Tasks spawned afterwards (chunks, coalesced calls) share the same
+    accumulator through context propagation.
+
+    Returns:
+        Fresh RequestUsage bound to the current context
+    """
+    usage = RequestUsage()
+    _current_usage.set(usage)
+    return usage
+
+
+def current_request_usage() -> Optional[RequestUsage]:
+    """Get usage accumulator for the current request, if any"""
+    return _current_usage.get()
+
+
+class RequestTimings:
+    """
+    Milliseconds spent per processing stage for one request
+
+    Repeated stages (continuations, retries) accumulate. Chunks of a long text
+    run in parallel, so their stage times can add up to more than wall time.
+    """
+
+    __slots__ = ("started", "stages")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def add(self, stage: str, duration_ms: float):
+        """
+        Add time spent in a stage
+
+        Args:
+            stage: Stage name (e.g. "prompt", "bedrock")
+            duration_ms: Duration in milliseconds
+        """
+        self.stages[stage] = self.stages.get(stage, 0.0) + duration_ms
+
+    def mark(self, stage: str):
+        """Record the time from the start of the request until now as a stage"""
+        self.add(stage, (time.perf_counter() - self.started) * 1000)
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the request started"""
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_log_fields(self) -> Dict[str, float]:
+        """
+        Get stage durations for structured logs
+
+        Returns:
+            Dictionary of stage name to milliseconds (rounded)
+        """
+        return {stage: round(duration_ms, 2) for stage, duration_ms in self.stages.items()}
+
+    def server_timing(self) -> str:
+        """
+        Format stage durations as a Server-Timing header value
+
+        Returns:
+            Header value, e.g. "prompt;dur=0.2, bedrock;dur=812.4, total;dur=815.0"
+        """
+        metrics = [f"{stage};dur={duration_ms:.1f}" for stage, duration_ms in self.stages.items()]
+        metrics.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(metrics)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> RequestTimings:
+    """
+    Start stage timing for the current request
+
+    Returns:
+        Fresh RequestTimings bound to the current context
+    """
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def current_request_timings() -> Optional[RequestTimings]:
+    """Get stage timings for the current request, if any"""
+    return _current_timings.get()
+
+
+def record_stage(stage: str, duration_ms: float):
+    """Add time spent in a stage to the current request (no-op outside a request)"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(stage, duration_ms)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """
+    Time a block of code as a stage of the current request
+
+    Args:
+        stage: Stage name
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(stage, (time.perf_counter() - start) * 1000)
@@ -0,0 +1,43 @@
+"""
+Server-Timing middleware for Writers Block Service
+Starts per-request stage timing and reports it in a Server-Timing response header
+"""
+
+from typing import Any, Awaitable, Callable, Dict
+
+from .request_context import start_request_timings
+
+Message = Dict[str, Any]
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that binds RequestTimings to every HTTP request
+
+    Stages recorded while the request is handled are added to the response as
+    a Server-Timing header (visible in browser dev tools). Streaming responses
+    send their headers early, so they only carry the stages finished by then.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]], enabled: bool = True):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope: Message, receive: Callable, send: Callable):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_request_timings()
+        if not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
@@ -3,16 +3,22 @@ FastAPI application entry point for Writers Block Service
 Clean application initialization with proper middleware and routing
 """
 
-import logging
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .controller.routes import router
+from .controller.routes import router, llm_service
+from .services.feedback_service import feedback_service
+from .core.background import background_work
 from .core.config import settings
-from .core.logging import get_logger
+from .core.logging import cloudwatch_logger, configure_logging, flush_logging, get_logger
+from .core.loop_monitor import loop_monitor
+from .core.server_timing import ServerTimingMiddleware
+from .services.feedback_store import feedback_store
 
-# Configure logging
-logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
+# Configure logging (records are written by a background thread)
+configure_logging()
 logger = get_logger(__name__)
 
 # Initialize FastAPI app
@@ -33,9 +39,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage request timing (Server-Timing header and structured logs)
+app.add_middleware(ServerTimingMiddleware, enabled=settings.ENABLE_SERVER_TIMING)
+
 # Include routes
 app.include_router(router)
 
+# On-demand profiling (admin endpoints and request sampling), off unless configured
+if settings.profiling_enabled:
+    from .controller.admin_routes import admin_router
+    from .core.profiling import ProfilingMiddleware, request_profiler
+    
+    app.include_router(admin_router)
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+
+# Stored feedback lookup by ID (admin only)
+if settings.feedback_lookup_enabled:
+    from .controller.admin_routes import feedback_admin_router
+    
+    app.include_router(feedback_admin_router)
+
 # Application startup event
 @app.on_event("startup")
 async def startup_event():
@@ -43,23 +66,45 @@ async def startup_event():
     logger.info(f"Starting {settings.APP_NAME} v{settings.VERSION}")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"CloudWatch logging: {'enabled' if settings.ENABLE_CLOUDWATCH_LOGGING else 'disabled'}")
+    if settings.ENABLE_LOOP_MONITOR:
+        loop_monitor.start()
 
 # Application shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown tasks"""
     logger.info(f"Shutting down {settings.APP_NAME}")
+    await loop_monitor.stop()
+    await background_work.close(settings.BACKGROUND_DRAIN_TIMEOUT_SECONDS)
+    await feedback_service.save_stats_snapshot()
+    await llm_service.close()
+    await asyncio.to_thread(feedback_store.close)
+    cloudwatch_logger.close()
 
 
 # Optimized Lambda handler - created at module level for reuse
-lambda_handler = None
 try:
     from mangum import Mangum
     # Create handler once at module level (not per invocation)
-    lambda_handler = Mangum(app, lifespan="off")
+    _mangum_handler = Mangum(app, lifespan="off")
+    
+    def lambda_handler(event, context):
+        """Lambda entry point; finishes queued work and logs before the environment is frozen"""
+        try:
+            return _mangum_handler(event, context)
+        finally:
+            background_work.drain_blocking(settings.BACKGROUND_DRAIN_TIMEOUT_SECONDS)
+            feedback_store.flush()
+            cloudwatch_logger.flush()
+            flush_logging()
 except ImportError:
     # Mangum not available (skip Lambda handler)
-    pass
+    lambda_handler = None
+
+# Pre-warm AWS clients in the Lambda init phase (clients are otherwise created on first use)
+if settings.is_lambda and settings.LAMBDA_PREWARM:
+    llm_service.warm()
+    cloudwatch_logger.warm()
 
 # For local development
 if __name__ == "__main__":
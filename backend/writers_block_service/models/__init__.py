@@ -2,6 +2,8 @@
 from .schemas import (
     ProcessTextRequest,
     ProcessTextResponse,
+    BatchProcessTextRequest,
+    BatchProcessTextResponse,
     HealthResponse,
     ErrorResponse
 )
@@ -9,6 +11,8 @@ from .schemas import (
 __all__ = [
     "ProcessTextRequest",
     "ProcessTextResponse", 
+    "BatchProcessTextRequest",
+    "BatchProcessTextResponse",
     "HealthResponse",
     "ErrorResponse"
 ]
@@ -3,10 +3,12 @@ Pydantic models and schemas for Writers Block Service API
 Consolidated models with enhanced validation
 """
 
-from pydantic import BaseModel, validator
-from typing import Optional, Dict, Literal, Any
+from pydantic import BaseModel, SkipValidation, validator
+from typing import Optional, Dict, List, Literal, Any
 import uuid
 
+from ..core.config import settings
+
 
 class ProcessTextRequest(BaseModel):
     """Request model for text processing with structured actions"""
@@ -14,13 +16,20 @@ class ProcessTextRequest(BaseModel):
     action: Literal["grammar_fix", "rephrase"]
     parameters: Optional[Dict[str, str]] = {}
     session_id: Optional[str] = None
+    idempotency_key: Optional[str] = None
     
     @validator('selected_text')
     def validate_selected_text(cls, v):
         if not v or not v.strip():
             raise ValueError('Selected text cannot be empty')
-        if len(v) > 10000:  # Reasonable limit for text processing
-            raise ValueError('Selected text too long (max 10000 characters)')
+        if len(v) > settings.MAX_INPUT_CHARS:  # Long text is processed in chunks
+            raise ValueError(f'Selected text too long (max {settings.MAX_INPUT_CHARS} characters)')
+        return v
+    
+    @validator('idempotency_key')
+    def validate_idempotency_key(cls, v):
+        if v and len(v) > 128:
+            raise ValueError('Idempotency key too long (max 128 characters)')
         return v
     
     @validator('parameters')
@@ -61,6 +70,29 @@ class ProcessTextResponse(BaseModel):
     session_id: str
 
 
+class BatchProcessTextRequest(BaseModel):
+    """Request model for processing multiple text selections at once (items validated individually)"""
+    # Documented as ProcessTextRequest, but kept as raw values here: the route
+    # validates each item on its own, so one bad item doesn't fail the batch
+    items: List[SkipValidation[ProcessTextRequest]]
+    
+    @validator('items')
+    def validate_items(cls, v):
+        if not v:
+            raise ValueError('Batch must contain at least one item')
+        if len(v) > settings.BATCH_MAX_ITEMS:
+            raise ValueError(f'Batch too large (max {settings.BATCH_MAX_ITEMS} items)')
+        return v
+
+
+class BatchProcessTextResponse(BaseModel):
+    """Response model for batch text processing (results in request order)"""
+    success: bool
+    results: List[ProcessTextResponse]
+    succeeded: int
+    failed: int
+
+
 class HealthResponse(BaseModel):
     """Response model for health check endpoints"""
     message: str
@@ -89,6 +121,7 @@ class FeedbackRequest(BaseModel):
     extension_version: Optional[str] = None
     user_agent: Optional[str] = None
     session_id: Optional[str] = None
+    idempotency_key: Optional[str] = None
 
     @validator('rating')
     def validate_rating(cls, v):
@@ -110,9 +143,116 @@ class FeedbackRequest(BaseModel):
             raise ValueError('Invalid email format')
         return v
 
+    @validator('idempotency_key')
+    def validate_idempotency_key(cls, v):
+        if v and len(v) > 128:
+            raise ValueError('Idempotency key too long (max 128 characters)')
+        return v
+
 
 class FeedbackResponse(BaseModel):
     """Response model for feedback submission"""
     success: bool
     message: str
     feedback_id: str
+    duplicate: bool = False
+
+
+class BatchFeedbackRequest(BaseModel):
+    """Request model for submitting queued feedback at once (items validated individually)"""
+    # Documented as FeedbackRequest; the route validates each item on its own
+    items: List[SkipValidation[FeedbackRequest]]
+    
+    @validator('items')
+    def validate_items(cls, v):
+        if not v:
+            raise ValueError('Batch must contain at least one item')
+        if len(v) > settings.FEEDBACK_BATCH_MAX_ITEMS:
+            raise ValueError(f'Batch too large (max {settings.FEEDBACK_BATCH_MAX_ITEMS} items)')
+        return v
+
+
+class BatchFeedbackItemResult(BaseModel):
+    """Result for one item of a feedback batch"""
+    index: int
+    success: bool
+    feedback_id: str = ""
+    duplicate: bool = False
+    error: Optional[str] = None
+
+
+class BatchFeedbackResponse(BaseModel):
+    """Response model for batch feedback submission (results in request order)"""
+    success: bool
+    results: List[BatchFeedbackItemResult]
+    accepted: int
+    duplicates: int
+    failed: int
+
+
+class FeedbackDimensionStats(BaseModel):
+    """Aggregates for one value of a feedback dimension"""
+    count: int
+    average_rating: Optional[float] = None
+    ratings: Dict[str, int]
+
+
+class FeedbackStatsResponse(BaseModel):
+    """Response model for aggregated feedback statistics"""
+    since: str
+    total: int
+    average_rating: Optional[float] = None
+    ratings: Dict[str, int]
+    by_type: Dict[str, FeedbackDimensionStats]
+    by_extension_version: Dict[str, FeedbackDimensionStats]
+    by_browser: Dict[str, FeedbackDimensionStats]
+    by_platform: Dict[str, FeedbackDimensionStats]
+    by_hour_of_day: List[int]
+    by_day_of_week: Dict[str, int]
+
+
+class ProfileSamplingRequest(BaseModel):
+    """Request model for starting a sampling profile"""
+    seconds: float = 30
+    interval_ms: Optional[float] = None
+    
+    @validator('seconds')
+    def validate_seconds(cls, v):
+        if not 0 < v <= settings.PROFILE_MAX_SECONDS:
+            raise ValueError(f'Seconds must be between 0 and {settings.PROFILE_MAX_SECONDS}')
+        return v
+    
+    @validator('interval_ms')
+    def validate_interval_ms(cls, v):
+        if v is not None and not 1 <= v <= 1000:
+            raise ValueError('Interval must be between 1 and 1000 ms')
+        return v
+
+
+class ProfileRequestsRequest(BaseModel):
+    """Request model for profiling 1-in-K requests with cProfile"""
+    every: int = 100
+    count: int = 10
+    
+    @validator('every')
+    def validate_every(cls, v):
+        if v < 1:
+            raise ValueError('every must be at least 1')
+        return v
+    
+    @validator('count')
+    def validate_count(cls, v):
+        if not 1 <= v <= 1000:
+            raise ValueError('count must be between 1 and 1000')
+        return v
+
+
+class ProfilerStatusResponse(BaseModel):
+    """Response model for profiler state and the profiles written so far"""
+    sampling_running: bool
+    sampling_profile: Optional[str] = None
+    requests_armed: bool
+    requests_every: int
+    requests_remaining: int
+    profile_dir: str
+    profiles: List[Dict[str, Any]]
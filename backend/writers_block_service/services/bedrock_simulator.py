@@ -0,0 +1,221 @@
+"""
+Local Bedrock simulator for Writers Block Service
+Offline stand-in for Bedrock with configurable latency, throttling and error
+injection, for load tests and benchmarks without an AWS account
+"""
+
+import asyncio
+import math
+import random
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from ..core.request_context import timed_stage
+from .bedrock_transport import BedrockTransport
+from .prompt_cache import cache_breakpoints, min_cacheable_tokens
+from .token_budget import estimate_tokens
+
+# Quoted text in the built-in prompts, before the note chunk prompts end with;
+# custom prompts are echoed whole
+QUOTED_TEXT = re.compile(r'Text to process: "(.*)"\s*(?:\n\nNote: [^"]*)?$', re.DOTALL)
+
+# Words per streamed delta (Bedrock sends a few tokens per chunk)
+STREAM_WORDS_PER_DELTA = 3
+
+TRANSIENT_ERRORS = [
+    ("InternalServerException", 500),
+    ("ServiceUnavailableException", 503),
+    ("ModelTimeoutException", 408)
+]
+
+
+class SimulatorTransport(BedrockTransport):
+    """
+    Simulated Bedrock transport
+
+    Responses echo the text to process, so output length follows input length
+    like a grammar fix. Time to first token is log-normally distributed around
+    ttft_ms and output is generated at roughly tokens_per_second. Errors are
+    raised as the same ClientErrors boto3 would raise.
+    """
+
+    name = "simulator"
+
+    def __init__(self, region: str, ttft_ms: float = 400, latency_sigma: float = 0.35,
+                 tokens_per_second: float = 60, throttle_rate: float = 0.0,
+                 error_rate: float = 0.0, max_concurrency: int = 0,
+                 seed: Optional[int] = None):
+        super().__init__(region)
+        self.ttft_ms = ttft_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.max_concurrency = max_concurrency
+        self.inflight = 0
+        self._random = random.Random(seed)
+        self._cached_prefixes = set()
+
+    async def invoke_model(self, model_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        self._admit("InvokeModel")
+        self.inflight += 1
+        try:
+            text, stop_reason, usage = self._generate(model_id, body)
+            with timed_stage("bedrock"):
+                await asyncio.sleep(self._sample_ttft() + self._generation_seconds(usage["output_tokens"]))
+            return {
+                "id": "msg_simulated",
+                "type": "message",
+                "role": "assistant",
+                "model": model_id,
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": stop_reason,
+                "usage": usage
+            }
+        finally:
+            self.inflight -= 1
+
+    async def invoke_model_stream(self, model_id: str,
+                                  body: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        self._admit("InvokeModelWithResponseStream")
+        self.inflight += 1
+        try:
+            text, stop_reason, usage = self._generate(model_id, body)
+            await asyncio.sleep(self._sample_ttft())
+
+            yield {
+                "type": "message_start",
+                "message": {
+                    "id": "msg_simulated",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": model_id,
+                    "content": [],
+                    "usage": {**usage, "output_tokens": 1}
+                }
+            }
+            yield {"type": "content_block_start", "index": 0,
+                   "content_block": {"type": "text", "text": ""}}
+
+            for delta in self._deltas(text):
+                await asyncio.sleep(self._generation_seconds(estimate_tokens(delta)))
+                yield {"type": "content_block_delta", "index": 0,
+                       "delta": {"type": "text_delta", "text": delta}}
+
+            yield {"type": "content_block_stop", "index": 0}
+            yield {"type": "message_delta",
+                   "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+                   "usage": {"output_tokens": usage["output_tokens"]}}
+            yield {"type": "message_stop"}
+        finally:
+            self.inflight -= 1
+
+    def _admit(self, operation: str):
+        """Inject throttling and transient errors before any output"""
+        if self.max_concurrency and self.inflight >= self.max_concurrency:
+            self._raise("ThrottlingException", 429, "Too many concurrent requests", operation)
+        roll = self._random.random()
+        if roll < self.throttle_rate:
+            self._raise("ThrottlingException", 429, "Too many requests", operation)
+        if roll < self.throttle_rate + self.error_rate:
+            code, status = self._random.choice(TRANSIENT_ERRORS)
+            self._raise(code, status, "Simulated failure", operation)
+
+    @staticmethod
+    def _raise(code: str, status_code: int, message: str, operation: str):
+        raise ClientError(
+            {
+                "Error": {"Code": code, "Message": message},
+                "ResponseMetadata": {"HTTPStatusCode": status_code}
+            },
+            operation
+        )
+
+    def _generate(self, model_id: str, body: Dict[str, Any]) -> Tuple[str, str, Dict[str, int]]:
+        """
+        Produce the simulated completion for a request body
+
+        Prompt caching follows the real API: a breakpoint whose prefix is
+        shorter than the model's minimum (or any breakpoint, for a model
+        without caching) is processed as ordinary input.
+
+        Returns:
+            Tuple of (output text, stop_reason, usage)
+        """
+        messages = body.get("messages", [])
+        prompt = self._content_text(messages[0]["content"]) if messages else ""
+        match = QUOTED_TEXT.search(prompt)
+        output = match.group(1) if match else prompt
+
+        # Continue after an assistant prefill like the real API
+        if len(messages) > 1 and messages[-1].get("role") == "assistant":
+            prefill = self._content_text(messages[-1]["content"])
+            output = output[len(prefill):] if output.startswith(prefill) else ""
+
+        stop_reason = "end_turn"
+        max_tokens = body.get("max_tokens", 4096)
+        if estimate_tokens(output) > max_tokens:
+            output = self._truncate_to_tokens(output, max_tokens)
+            stop_reason = "max_tokens"
+
+        usage = {
+            "input_tokens": estimate_tokens(self._content_text(body.get("system", ""))) +
+                            sum(estimate_tokens(self._content_text(m["content"])) for m in messages),
+            "output_tokens": estimate_tokens(output),
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0
+        }
+        minimum = min_cacheable_tokens(model_id)
+        cached_tokens, read_tokens = 0, 0
+        for prefix, tokens in cache_breakpoints(body) if minimum is not None else []:
+            if tokens < minimum:
+                continue
+            if prefix in self._cached_prefixes:
+                read_tokens = tokens
+            else:
+                self._cached_prefixes.add(prefix)
+            cached_tokens = tokens
+        usage["input_tokens"] -= cached_tokens
+        usage["cache_read_input_tokens"] = read_tokens
+        usage["cache_creation_input_tokens"] = cached_tokens - read_tokens
+
+        return output, stop_reason, usage
+
+    @staticmethod
+    def _content_text(content: Any) -> str:
+        if isinstance(content, str):
+            return content
+        return "".join(block.get("text", "") for block in content)
+
+    @staticmethod
+    def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+        """Longest prefix of text that estimate_tokens counts as at most max_tokens"""
+        ascii_chars, other_chars = 0, 0
+        for position, char in enumerate(text):
+            if char.isascii():
+                ascii_chars += 1
+            else:
+                other_chars += 1
+            if math.ceil(ascii_chars / 4) + other_chars > max_tokens:
+                return text[:position]
+        return text
+
+    @staticmethod
+    def _deltas(text: str) -> List[str]:
+        words = re.split(r'(?<=\s)', text)
+        return [
+            "".join(words[i:i + STREAM_WORDS_PER_DELTA])
+            for i in range(0, len(words), STREAM_WORDS_PER_DELTA)
+            if "".join(words[i:i + STREAM_WORDS_PER_DELTA])
+        ]
+
+    def _sample_ttft(self) -> float:
+        """Log-normal time to first token in seconds (median ttft_ms)"""
+        return self.ttft_ms / 1000 * math.exp(self._random.gauss(0, self.latency_sigma))
+
+    def _generation_seconds(self, tokens: int) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return tokens / self.tokens_per_second
@@ -0,0 +1,363 @@
+"""
+Bedrock transports for Writers Block Service
+Executor-based boto3 transport and a native asyncio HTTP transport with SigV4 signing
+"""
+
+import asyncio
+import base64
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import quote
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..core.request_context import current_request_timings, record_stage
+
+logger = get_logger(__name__)
+
+
+class BedrockTransport(ABC):
+    """
+    Base class for Bedrock model invocation
+    Transports return the parsed response body and raise botocore ClientError
+    for service errors so callers can handle every transport the same way
+    """
+
+    name = "base"
+
+    def __init__(self, region: str):
+        self.region = region
+
+    @abstractmethod
+    async def invoke_model(self, model_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Invoke a Bedrock model
+
+        Args:
+            model_id: Bedrock model identifier
+            body: Request body (Anthropic messages format)
+
+        Returns:
+            Parsed response body
+        """
+
+    @abstractmethod
+    def invoke_model_stream(self, model_id: str,
+                            body: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Invoke a Bedrock model with a streamed response
+
+        Args:
+            model_id: Bedrock model identifier
+            body: Request body (Anthropic messages format)
+
+        Returns:
+            Async iterator of decoded Anthropic stream events
+        """
+
+    def queue_depth(self) -> int:
+        """Calls waiting for a worker thread (0 for transports without an executor)"""
+        return 0
+
+    async def close(self):
+        """Release transport resources"""
+
+
+class ExecutorTransport(BedrockTransport):
+    """
+    Blocking boto3 client driven from a dedicated thread pool
+    Sized independently of the event loop's default executor
+    """
+
+    name = "executor"
+
+    def __init__(self, region: str, max_workers: int = 64, timeout_seconds: float = 60):
+        super().__init__(region)
+        # boto3 is imported here rather than at module level to keep cold-start imports cheap
+        import boto3
+        from botocore.config import Config
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="bedrock"
+        )
+        self.client = boto3.client(
+            'bedrock-runtime',
+            region_name=region,
+            config=Config(
+                max_pool_connections=max_workers,
+                read_timeout=timeout_seconds,
+                # Retries are handled by the resilience layer in LLMService
+                retries={"total_max_attempts": 1, "mode": "standard"}
+            )
+        )
+
+    async def invoke_model(self, model_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        payload = json.dumps(body)
+        # perf_counter marks set on the worker thread: started, received, parsed
+        marks = []
+
+        def _invoke() -> Dict[str, Any]:
+            marks.append(time.perf_counter())
+            response = self.client.invoke_model(modelId=model_id, body=payload)
+            raw = response['body'].read()
+            marks.append(time.perf_counter())
+            result = json.loads(raw)
+            marks.append(time.perf_counter())
+            return result
+
+        submitted = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self.executor, _invoke)
+        finally:
+            self._record_stages(submitted, marks)
+
+    @staticmethod
+    def _record_stages(submitted: float, marks: list):
+        """Split an executor call into thread wait (both directions), Bedrock and decoding time"""
+        if not marks:
+            return
+        resumed = time.perf_counter()
+        started = marks[0]
+        received = marks[1] if len(marks) > 1 else resumed
+        parsed = marks[2] if len(marks) > 2 else received
+        record_stage("executor_wait", ((started - submitted) + (resumed - parsed)) * 1000)
+        record_stage("bedrock", (received - started) * 1000)
+        record_stage("parse", (parsed - received) * 1000)
+
+    async def invoke_model_stream(self, model_id: str,
+                                  body: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        payload = json.dumps(body)
+        done = object()
+
+        def _read_stream():
+            # Runs on the executor; hands each event back to the loop
+            loop.call_soon_threadsafe(record_wait, time.perf_counter())
+            try:
+                response = self.client.invoke_model_with_response_stream(
+                    modelId=model_id, body=payload
+                )
+                stream = response['body']
+                try:
+                    for event in stream:
+                        if stop.is_set():
+                            break
+                        chunk = event.get('chunk')
+                        if chunk:
+                            loop.call_soon_threadsafe(queue.put_nowait, json.loads(chunk['bytes']))
+                finally:
+                    stream.close()
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+
+        submitted = time.perf_counter()
+        timings = current_request_timings()
+
+        def record_wait(started: float):
+            if timings is not None:
+                timings.add("executor_wait", (started - submitted) * 1000)
+
+        loop.run_in_executor(self.executor, _read_stream)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def queue_depth(self) -> int:
+        return self.executor._work_queue.qsize()
+
+    async def close(self):
+        self.executor.shutdown(wait=False)
+
+
+class AsyncHttpTransport(BedrockTransport):
+    """
+    Native asyncio transport using httpx with SigV4-signed requests
+    No threads are held while a generation is in flight
+    """
+
+    name = "async"
+    SERVICE_NAME = "bedrock"
+
+    def __init__(self, region: str, max_connections: int = 256, timeout_seconds: float = 60):
+        super().__init__(region)
+        import boto3
+        import httpx
+
+        self._httpx = httpx
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        self.endpoint = f"https://bedrock-runtime.{region}.amazonaws.com"
+        self._credentials = boto3.Session().get_credentials()
+        if self._credentials is None:
+            raise RuntimeError("No AWS credentials available for async Bedrock transport")
+
+        self._client = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self):
+        """Get HTTP client bound to the running event loop (connection pools are per loop)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = self._httpx.AsyncClient(
+                limits=self._httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=self._httpx.Timeout(self.timeout_seconds, connect=10.0)
+            )
+            self._client_loop = loop
+        return self._client
+
+    def _signed_headers(self, url: str, payload: bytes, accept: str) -> Dict[str, str]:
+        """Sign request with SigV4 using current (auto-refreshing) credentials"""
+        from botocore.auth import SigV4Auth
+        from botocore.awsrequest import AWSRequest
+
+        request = AWSRequest(
+            method="POST",
+            url=url,
+            data=payload,
+            headers={"Content-Type": "application/json", "Accept": accept}
+        )
+        credentials = self._credentials.get_frozen_credentials()
+        SigV4Auth(credentials, self.SERVICE_NAME, self.region).add_auth(request)
+        return dict(request.headers.items())
+
+    def _model_url(self, model_id: str, operation: str) -> str:
+        return f"{self.endpoint}/model/{quote(model_id, safe='')}/{operation}"
+
+    @staticmethod
+    def _raise_for_status(status_code: int, headers, content: bytes, operation: str):
+        """Convert an HTTP error into the ClientError boto3 would raise"""
+        from botocore.exceptions import ClientError
+
+        error_type = headers.get("x-amzn-errortype", "")
+        code = error_type.split(":")[0] or f"HTTP{status_code}"
+        try:
+            message = json.loads(content).get("message", "")
+        except (ValueError, AttributeError):
+            message = ""
+        raise ClientError(
+            {
+                "Error": {"Code": code, "Message": message},
+                "ResponseMetadata": {"HTTPStatusCode": status_code}
+            },
+            operation
+        )
+
+    async def invoke_model(self, model_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        url = self._model_url(model_id, "invoke")
+        payload = json.dumps(body).encode()
+        headers = self._signed_headers(url, payload, "application/json")
+
+        started = time.perf_counter()
+        try:
+            response = await self._get_client().post(url, content=payload, headers=headers)
+        finally:
+            received = time.perf_counter()
+            record_stage("bedrock", (received - started) * 1000)
+        if response.status_code >= 400:
+            self._raise_for_status(response.status_code, response.headers,
+                                   response.content, "InvokeModel")
+        result = response.json()
+        record_stage("parse", (time.perf_counter() - received) * 1000)
+        return result
+
+    async def invoke_model_stream(self, model_id: str,
+                                  body: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        url = self._model_url(model_id, "invoke-with-response-stream")
+        payload = json.dumps(body).encode()
+        headers = self._signed_headers(url, payload, "application/vnd.amazon.eventstream")
+
+        async with self._get_client().stream("POST", url, content=payload,
+                                             headers=headers) as response:
+            if response.status_code >= 400:
+                content = await response.aread()
+                self._raise_for_status(response.status_code, response.headers,
+                                       content, "InvokeModelWithResponseStream")
+
+            from botocore.eventstream import EventStreamBuffer
+
+            buffer = EventStreamBuffer()
+            async for data in response.aiter_bytes():
+                buffer.add_data(data)
+                for message in buffer:
+                    message_type = message.headers.get(":message-type")
+                    if message_type == "exception":
+                        code = message.headers.get(":exception-type", "StreamException")
+                        self._raise_for_status(
+                            message.to_response_dict()["status_code"],
+                            {"x-amzn-errortype": code},
+                            message.payload, "InvokeModelWithResponseStream"
+                        )
+                    if message.headers.get(":event-type") == "chunk":
+                        chunk = json.loads(message.payload)
+                        yield json.loads(base64.b64decode(chunk["bytes"]))
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_transport(region: str) -> BedrockTransport:
+    """
+    Create the Bedrock transport selected by settings
+
+    Falls back to the executor transport when the async transport is
+    unavailable (httpx not installed or no credentials resolvable).
+
+    Args:
+        region: AWS region for the Bedrock runtime endpoint
+
+    Returns:
+        Configured BedrockTransport
+    """
+    if settings.BEDROCK_TRANSPORT == "simulator":
+        from .bedrock_simulator import SimulatorTransport
+
+        logger.warning("Using simulated Bedrock transport - responses are not generated by a model")
+        return SimulatorTransport(
+            region,
+            ttft_ms=settings.SIMULATOR_TTFT_MS,
+            latency_sigma=settings.SIMULATOR_LATENCY_SIGMA,
+            tokens_per_second=settings.SIMULATOR_TOKENS_PER_SECOND,
+            throttle_rate=settings.SIMULATOR_THROTTLE_RATE,
+            error_rate=settings.SIMULATOR_ERROR_RATE,
+            max_concurrency=settings.SIMULATOR_MAX_CONCURRENCY,
+            seed=settings.SIMULATOR_SEED
+        )
+
+    if settings.BEDROCK_TRANSPORT == "async":
+        try:
+            return AsyncHttpTransport(
+                region,
+                max_connections=settings.BEDROCK_HTTP_MAX_CONNECTIONS,
+                timeout_seconds=settings.BEDROCK_TIMEOUT_SECONDS
+            )
+        except ImportError:
+            logger.warning("httpx not installed, falling back to executor Bedrock transport")
+        except Exception as e:
+            logger.warning(f"Async Bedrock transport unavailable, falling back to executor: {type(e).__name__}")
+
+    return ExecutorTransport(
+        region,
+        max_workers=settings.BEDROCK_EXECUTOR_MAX_WORKERS,
+        timeout_seconds=settings.BEDROCK_TIMEOUT_SECONDS
+    )
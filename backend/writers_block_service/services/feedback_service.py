@@ -2,23 +2,41 @@
 Feedback processing service with standard logging
 """
 
+import asyncio
+import hashlib
 import json
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any
-import re
+from typing import Dict, Any, List, Optional, Tuple
 
+from ..core.background import background_work
+from ..core.config import settings
+from ..core.exceptions import ValidationError
 from ..core.logging import get_logger
 from ..models.schemas import FeedbackRequest, FeedbackResponse
+from ..utils.user_agent import classify_user_agent
+from .feedback_stats import FeedbackRollups, load_rollups, write_snapshot
+from .feedback_store import FeedbackStore, feedback_store
 
 logger = get_logger(__name__)
 
+SUCCESS_MESSAGE = "Thank you for your feedback! We appreciate your input."
+
 
 class FeedbackService:
     """Service for processing user feedback with analytics"""
     
-    def __init__(self):
+    def __init__(self, store: Optional[FeedbackStore] = None,
+                 rollups: Optional[FeedbackRollups] = None, snapshot_path: str = ""):
         self.logger = logger
+        self.store = store
+        self.rollups = rollups or FeedbackRollups()
+        self.snapshot_path = snapshot_path
+        self._last_snapshot = time.monotonic()
+        # idempotency_key -> (content hash, feedback_id, expires_at)
+        self._retained: "OrderedDict[str, Tuple[str, str, float]]" = OrderedDict()
     
     async def process_feedback(self, feedback: FeedbackRequest) -> FeedbackResponse:
         """
@@ -29,31 +47,224 @@ class FeedbackService:
             
         Returns:
             FeedbackResponse with success status and feedback ID
+            
+        Raises:
+            ValidationError: If the idempotency key was used for different feedback
         """
         try:
-            # Generate unique feedback ID
-            feedback_id = str(uuid.uuid4())
+            response = self._accept(feedback)
+            if response.duplicate:
+                return response
             
-            # Log feedback analytics (privacy-safe)
-            await self._log_feedback_analytics(feedback, feedback_id)
+            # Analytics and notifications run after the response is sent
+            await background_work.submit(self._log_feedback_analytics, feedback, response.feedback_id)
             
             # Send notifications for critical feedback
             if feedback.rating <= 2:
-                await self._notify_critical_feedback(feedback, feedback_id)
+                await background_work.submit(self._notify_critical_feedback, feedback, response.feedback_id)
             
-            return FeedbackResponse(
-                success=True,
-                message="Thank you for your feedback! We appreciate your input.",
-                feedback_id=feedback_id
-            )
+            return response
             
+        except ValidationError:
+            raise
         except Exception as e:
             self.logger.error(f"Failed to process feedback: {str(e)}")
-            return FeedbackResponse(
-                success=False,
-                message="Sorry, we couldn't process your feedback right now. Please try again later.",
-                feedback_id=""
+            return self._failure_response()
+    
+    async def process_feedback_batch(self, items: List[FeedbackRequest]) -> List[FeedbackResponse]:
+        """
+        Process a batch of feedback (e.g. submissions queued while offline)
+        
+        Items are accepted in one pass and their analytics run as a single
+        post-response job. Items whose idempotency key was already accepted
+        return the original feedback ID and are not counted again; an item
+        reusing a key for different feedback fails with a validation error.
+        
+        Args:
+            items: Validated feedback requests
+            
+        Returns:
+            FeedbackResponse per item, in order
+        """
+        responses = []
+        accepted = []
+        for feedback in items:
+            try:
+                response = self._accept(feedback)
+            except ValidationError as e:
+                response = FeedbackResponse(
+                    success=False, message=f"Invalid request: {e.message}", feedback_id=""
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to process feedback: {str(e)}")
+                response = self._failure_response()
+            else:
+                if not response.duplicate:
+                    accepted.append((feedback, response.feedback_id))
+            responses.append(response)
+        
+        if accepted:
+            await background_work.submit(self._log_feedback_batch, accepted)
+        return responses
+    
+    async def get_feedback(self, feedback_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up stored feedback by ID
+        
+        Args:
+            feedback_id: Unique feedback identifier
+            
+        Returns:
+            Stored feedback record, or None if unknown or the store is disabled
+        """
+        if self.store is None:
+            return None
+        return await asyncio.to_thread(self.store.get, feedback_id)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get feedback aggregates (from counters, no raw feedback is read)
+        
+        Returns:
+            Rating histogram and per-dimension/time-bucket counts
+        """
+        return self.rollups.summary()
+    
+    async def save_stats_snapshot(self):
+        """Persist the feedback aggregates to FEEDBACK_STATS_SNAPSHOT_PATH (if configured)"""
+        if not self.snapshot_path or not self.rollups.updates_since_snapshot:
+            return
+        self._last_snapshot = time.monotonic()
+        data = self.rollups.snapshot()
+        try:
+            await asyncio.to_thread(write_snapshot, self.snapshot_path, data)
+        except OSError as e:
+            self.logger.error(f"Failed to save feedback stats snapshot: {type(e).__name__}")
+    
+    def _accept(self, feedback: FeedbackRequest) -> FeedbackResponse:
+        """
+        Assign a feedback ID and queue the record, or replay a retried submission
+        
+        Args:
+            feedback: Validated feedback request
+            
+        Returns:
+            FeedbackResponse (duplicate=True for a replayed idempotency key)
+            
+        Raises:
+            ValidationError: If the idempotency key was used for different feedback
+        """
+        idempotency_key = feedback.idempotency_key
+        content_key = None
+        if idempotency_key:
+            content_key = hashlib.sha256(
+                feedback.model_dump_json(exclude={"idempotency_key"}).encode("utf-8")
+            ).hexdigest()
+            feedback_id = self._get_retained(idempotency_key, content_key)
+            if feedback_id is not None:
+                return FeedbackResponse(
+                    success=True, message=SUCCESS_MESSAGE, feedback_id=feedback_id, duplicate=True
+                )
+        
+        # Generate unique feedback ID
+        feedback_id = str(uuid.uuid4())
+        
+        # Queue for the durable store (never waits on disk)
+        if self.store is not None:
+            self._store_feedback(feedback, feedback_id)
+        
+        # Update aggregates with the submission itself, so the stats count
+        # exactly the accepted feedback even if the analytics job is dropped
+        client = classify_user_agent(feedback.user_agent)
+        self.rollups.record(
+            feedback.rating,
+            datetime.utcnow(),
+            type=feedback.type,
+            extension_version=feedback.extension_version or "unknown",
+            browser=client.browser,
+            platform=client.platform
+        )
+        
+        if idempotency_key:
+            self._retain(idempotency_key, content_key, feedback_id)
+        return FeedbackResponse(success=True, message=SUCCESS_MESSAGE, feedback_id=feedback_id)
+    
+    def _failure_response(self) -> FeedbackResponse:
+        return FeedbackResponse(
+            success=False,
+            message="Sorry, we couldn't process your feedback right now. Please try again later.",
+            feedback_id=""
+        )
+    
+    def _get_retained(self, idempotency_key: str, content_key: str) -> Optional[str]:
+        """
+        Get the feedback ID accepted under a key, if unexpired
+        
+        Raises:
+            ValidationError: If the key was accepted for different content
+        """
+        entry = self._retained.get(idempotency_key)
+        if entry is None:
+            return None
+        
+        retained_key, feedback_id, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._retained[idempotency_key]
+            return None
+        if retained_key != content_key:
+            # Accepting it would overwrite the key, so a retry of the original
+            # submission would then be stored twice
+            raise ValidationError(
+                "Idempotency key was already used for different feedback",
+                field="idempotency_key"
             )
+        return feedback_id
+    
+    def _retain(self, idempotency_key: str, content_key: str, feedback_id: str):
+        """Remember an accepted key, bounded by FEEDBACK_IDEMPOTENCY_MAX_KEYS"""
+        if settings.IDEMPOTENCY_TTL_SECONDS <= 0:
+            return
+        self._retained[idempotency_key] = (
+            content_key, feedback_id, time.monotonic() + settings.IDEMPOTENCY_TTL_SECONDS
+        )
+        self._retained.move_to_end(idempotency_key)
+        while len(self._retained) > settings.FEEDBACK_IDEMPOTENCY_MAX_KEYS:
+            self._retained.popitem(last=False)
+    
+    async def _log_feedback_batch(self, accepted: List[Tuple[FeedbackRequest, str]]):
+        """
+        Log analytics and critical notifications for a batch
+        
+        Args:
+            accepted: Feedback requests with their assigned IDs
+        """
+        for feedback, feedback_id in accepted:
+            await self._log_feedback_analytics(feedback, feedback_id)
+            if feedback.rating <= 2:
+                await self._notify_critical_feedback(feedback, feedback_id)
+    
+    def _store_feedback(self, feedback: FeedbackRequest, feedback_id: str):
+        """
+        Queue a feedback record for the append-only store
+        
+        Args:
+            feedback: Feedback request data
+            feedback_id: Unique feedback identifier
+        """
+        record = {
+            "feedback_id": feedback_id,
+            "received_at": datetime.utcnow().isoformat(),
+            "type": feedback.type,
+            "rating": feedback.rating,
+            "message": feedback.message,
+            "contact_email": feedback.email if feedback.allow_contact and feedback.email else None,
+            "allow_contact": feedback.allow_contact,
+            "extension_version": feedback.extension_version,
+            "user_agent": feedback.user_agent,
+            "session_id": feedback.session_id
+        }
+        if not self.store.append(record):
+            self.logger.warning(f"Feedback store queue full, record not stored: id={feedback_id}")
     
     async def _log_feedback_analytics(self, feedback: FeedbackRequest, feedback_id: str):
         """
@@ -64,8 +275,9 @@ class FeedbackService:
             feedback_id: Unique feedback identifier
         """
         try:
-            # Extract browser info safely
-            browser_info = self._extract_browser_info(feedback.user_agent)
+            # Classify the user agent (memoized)
+            client = classify_user_agent(feedback.user_agent)
+            now = datetime.utcnow()
             
             # Create analytics log entry (contact info only in JSON)
             analytics_data = {
@@ -79,13 +291,13 @@ class FeedbackService:
                 "allow_contact": feedback.allow_contact,
                 "contact_email": feedback.email if feedback.allow_contact and feedback.email else None,
                 "extension_version": feedback.extension_version or "unknown",
-                "browser": browser_info.get("browser", "unknown"),
-                "browser_version": browser_info.get("version", "unknown"),
-                "platform": browser_info.get("platform", "unknown"),
+                "browser": client.browser,
+                "browser_version": client.version,
+                "platform": client.platform,
                 "session_id": feedback.session_id or "anonymous",
-                "timestamp": datetime.utcnow().isoformat(),
-                "day_of_week": datetime.utcnow().strftime("%A"),
-                "hour_of_day": datetime.utcnow().hour
+                "timestamp": now.isoformat(),
+                "day_of_week": now.strftime("%A"),
+                "hour_of_day": now.hour
             }
             
             # Log structured data for analytics (includes contact info)
@@ -99,62 +311,9 @@ class FeedbackService:
             
         except Exception as e:
             self.logger.error(f"Failed to log feedback analytics: {str(e)}")
-    
-    def _extract_browser_info(self, user_agent: str) -> Dict[str, str]:
-        """
-        Extract browser information from user agent string
         
-        Args:
-            user_agent: Browser user agent string
-            
-        Returns:
-            Dictionary with browser, version, and platform info
-        """
-        if not user_agent:
-            return {"browser": "unknown", "version": "unknown", "platform": "unknown"}
-        
-        try:
-            # Extract browser name and version
-            browser_patterns = {
-                "Chrome": r"Chrome/(\d+\.\d+)",
-                "Firefox": r"Firefox/(\d+\.\d+)",
-                "Safari": r"Safari/(\d+\.\d+)",
-                "Edge": r"Edg/(\d+\.\d+)",
-                "Opera": r"OPR/(\d+\.\d+)"
-            }
-            
-            browser = "unknown"
-            version = "unknown"
-            
-            for browser_name, pattern in browser_patterns.items():
-                match = re.search(pattern, user_agent)
-                if match:
-                    browser = browser_name
-                    version = match.group(1)
-                    break
-            
-            # Extract platform
-            platform = "unknown"
-            if "Windows" in user_agent:
-                platform = "Windows"
-            elif "Macintosh" in user_agent or "Mac OS" in user_agent:
-                platform = "macOS"
-            elif "Linux" in user_agent:
-                platform = "Linux"
-            elif "Android" in user_agent:
-                platform = "Android"
-            elif "iPhone" in user_agent or "iPad" in user_agent:
-                platform = "iOS"
-            
-            return {
-                "browser": browser,
-                "version": version,
-                "platform": platform
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Failed to parse user agent: {str(e)}")
-            return {"browser": "unknown", "version": "unknown", "platform": "unknown"}
+        if time.monotonic() - self._last_snapshot >= settings.FEEDBACK_STATS_SNAPSHOT_INTERVAL_SECONDS:
+            await self.save_stats_snapshot()
     
     async def _notify_critical_feedback(self, feedback: FeedbackRequest, feedback_id: str):
         """
@@ -194,4 +353,8 @@ class FeedbackService:
 
 
 # Global service instance
-feedback_service = FeedbackService()
+feedback_service = FeedbackService(
+    store=feedback_store if settings.FEEDBACK_STORE_ENABLED else None,
+    rollups=load_rollups(settings.FEEDBACK_STATS_SNAPSHOT_PATH, settings.FEEDBACK_STATS_MAX_KEYS),
+    snapshot_path=settings.FEEDBACK_STATS_SNAPSHOT_PATH
+)
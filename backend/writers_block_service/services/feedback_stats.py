@@ -0,0 +1,206 @@
+"""
+Incremental feedback rollups for Writers Block Service
+Rating histograms and per-dimension counters updated in O(1) per submission
+"""
+
+import json
+import os
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+DIMENSIONS = ("type", "extension_version", "browser", "platform")
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+OTHER_KEY = "other"
+
+# Counter layout per dimension value: count, rating sum, then one slot per rating 1..5
+_COUNT, _RATING_SUM, _HISTOGRAM = 0, 1, 2
+_SLOTS = _HISTOGRAM + 5
+
+
+def _counters() -> array:
+    return array("Q", bytes(8 * _SLOTS))
+
+
+def _summarize(counters: array) -> Dict[str, Any]:
+    count = counters[_COUNT]
+    return {
+        "count": count,
+        "average_rating": round(counters[_RATING_SUM] / count, 3) if count else None,
+        "ratings": {str(rating): counters[_HISTOGRAM + rating - 1] for rating in range(1, 6)}
+    }
+
+
+class FeedbackRollups:
+    """
+    In-memory feedback aggregates
+
+    Every submission adds to fixed-size unsigned counters: an overall rating
+    histogram, count/rating-sum/histogram per value of each dimension, and
+    hour-of-day and day-of-week buckets. Reading the stats never rescans raw
+    feedback. Dimension values come from clients, so each dimension keeps at
+    most max_keys distinct values and counts the rest under "other".
+    """
+
+    def __init__(self, max_keys: int = 200):
+        self.max_keys = max_keys
+        self.started_at = datetime.utcnow().isoformat()
+        self.totals = _counters()
+        self.dimensions: Dict[str, Dict[str, array]] = {name: {} for name in DIMENSIONS}
+        self.hour_of_day = array("Q", bytes(8 * 24))
+        self.day_of_week = array("Q", bytes(8 * 7))
+        self.updates_since_snapshot = 0
+
+    def record(self, rating: int, timestamp: datetime, **dimensions: Optional[str]):
+        """
+        Add one submission
+
+        Args:
+            rating: Rating from 1 to 5
+            timestamp: Submission time (UTC)
+            **dimensions: Value per dimension (type, extension_version, browser, platform)
+        """
+        slot = _HISTOGRAM + rating - 1
+        self._add(self.totals, rating, slot)
+        for name in DIMENSIONS:
+            values = self.dimensions[name]
+            key = dimensions.get(name) or "unknown"
+            counters = values.get(key)
+            if counters is None:
+                if len(values) >= self.max_keys:
+                    key = OTHER_KEY
+                counters = values.get(key)
+                if counters is None:
+                    counters = values[key] = _counters()
+            self._add(counters, rating, slot)
+        self.hour_of_day[timestamp.hour] += 1
+        self.day_of_week[timestamp.weekday()] += 1
+        self.updates_since_snapshot += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the aggregates in API form
+
+        Returns:
+            Totals, rating histogram, per-dimension stats and time buckets
+        """
+        totals = _summarize(self.totals)
+        return {
+            "since": self.started_at,
+            "total": totals["count"],
+            "average_rating": totals["average_rating"],
+            "ratings": totals["ratings"],
+            "by_type": self._summarize_dimension("type"),
+            "by_extension_version": self._summarize_dimension("extension_version"),
+            "by_browser": self._summarize_dimension("browser"),
+            "by_platform": self._summarize_dimension("platform"),
+            "by_hour_of_day": list(self.hour_of_day),
+            "by_day_of_week": dict(zip(DAY_NAMES, self.day_of_week))
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the raw counters for persistence
+
+        Returns:
+            JSON-serializable snapshot (restore with restore())
+        """
+        self.updates_since_snapshot = 0
+        return {
+            "version": SNAPSHOT_VERSION,
+            "started_at": self.started_at,
+            "totals": list(self.totals),
+            "dimensions": {
+                name: {key: list(counters) for key, counters in values.items()}
+                for name, values in self.dimensions.items()
+            },
+            "hour_of_day": list(self.hour_of_day),
+            "day_of_week": list(self.day_of_week)
+        }
+
+    def restore(self, data: Dict[str, Any]):
+        """
+        Replace the counters with a snapshot
+
+        Args:
+            data: Snapshot from snapshot()
+
+        Raises:
+            ValueError: If the snapshot has an unknown version or layout
+        """
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported feedback stats snapshot version: {data.get('version')}")
+        totals = array("Q", data["totals"])
+        hour_of_day = array("Q", data["hour_of_day"])
+        day_of_week = array("Q", data["day_of_week"])
+        if len(totals) != _SLOTS or len(hour_of_day) != 24 or len(day_of_week) != 7:
+            raise ValueError("Malformed feedback stats snapshot")
+        dimensions: Dict[str, Dict[str, array]] = {name: {} for name in DIMENSIONS}
+        for name, values in data.get("dimensions", {}).items():
+            if name in dimensions:
+                dimensions[name] = {
+                    key: array("Q", counters) for key, counters in values.items()
+                    if len(counters) == _SLOTS
+                }
+
+        self.started_at = data.get("started_at", self.started_at)
+        self.totals = totals
+        self.dimensions = dimensions
+        self.hour_of_day = hour_of_day
+        self.day_of_week = day_of_week
+
+    @staticmethod
+    def _add(counters: array, rating: int, slot: int):
+        counters[_COUNT] += 1
+        counters[_RATING_SUM] += rating
+        counters[slot] += 1
+
+    def _summarize_dimension(self, name: str) -> Dict[str, Dict[str, Any]]:
+        return {key: _summarize(counters) for key, counters in self.dimensions[name].items()}
+
+
+def write_snapshot(path: str, data: Dict[str, Any]):
+    """
+    Atomically write a rollup snapshot (blocking file I/O)
+
+    Args:
+        path: Snapshot file path
+        data: Snapshot from FeedbackRollups.snapshot()
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def load_rollups(path: str, max_keys: int = 200) -> FeedbackRollups:
+    """
+    Create rollups, restored from a snapshot file when one exists
+
+    Args:
+        path: Snapshot file path (empty to start from zero)
+        max_keys: Distinct values kept per dimension
+
+    Returns:
+        FeedbackRollups instance
+    """
+    rollups = FeedbackRollups(max_keys=max_keys)
+    if not path or not os.path.exists(path):
+        return rollups
+    try:
+        with open(path) as f:
+            rollups.restore(json.load(f))
+        logger.info(f"Feedback stats restored from snapshot ({rollups.totals[_COUNT]} submissions)")
+    except (OSError, ValueError, KeyError, TypeError, OverflowError) as e:
+        logger.warning(f"Ignoring unreadable feedback stats snapshot {path}: {type(e).__name__}")
+    return rollups
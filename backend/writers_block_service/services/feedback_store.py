@@ -0,0 +1,331 @@
+"""
+Append-only feedback store for Writers Block Service
+Write-behind JSON-lines segments with group commits and an in-memory feedback_id index
+"""
+
+import atexit
+import json
+import os
+import queue
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..core.metrics import registry
+
+logger = get_logger(__name__)
+
+SEGMENT_PREFIX = "feedback-"
+SEGMENT_SUFFIX = ".jsonl"
+_SEGMENT_NAME = re.compile(rf"^{SEGMENT_PREFIX}(\d+){re.escape(SEGMENT_SUFFIX)}$")
+
+# Segment name, byte offset and length of a record's line
+IndexEntry = Tuple[str, int, int]
+
+
+class _Marker:
+    """Queue marker asking the writer to commit everything queued before it"""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class FeedbackStore:
+    """
+    Durable, append-only feedback store
+
+    append() only enqueues. A daemon writer thread takes everything queued
+    since its last commit (up to max_batch_records), writes it to the current
+    segment in one write and fsyncs once, so a burst of submissions costs one
+    fsync per batch rather than per record. Segments rotate at
+    max_segment_bytes. Records are found by feedback_id through an in-memory
+    index of (segment, offset, length), rebuilt from the segments on start;
+    records still waiting for their commit are served from memory.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = 64 * 1024 * 1024,
+                 max_batch_records: int = 500, max_queue_size: int = 10000,
+                 fsync: bool = True):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_batch_records = max(1, max_batch_records)
+        self.fsync = fsync
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._index: Dict[str, IndexEntry] = {}
+        self._indexed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self._segment_seq = 0
+        self._segment_name: Optional[str] = None
+        self._segment_file = None
+        self._segment_size = 0
+
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.commits = 0
+
+    def append(self, record: Dict[str, Any]) -> bool:
+        """
+        Queue a feedback record for writing (never blocks)
+
+        Args:
+            record: JSON-serializable record with a "feedback_id" key
+
+        Returns:
+            False if the queue was full and the record was dropped
+        """
+        self._ensure_started()
+        feedback_id = record["feedback_id"]
+        self._pending[feedback_id] = record
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._pending.pop(feedback_id, None)
+            self.dropped += 1
+            return False
+        return True
+
+    def get(self, feedback_id: str, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+        """
+        Look up a record by feedback_id (reads from disk, call off the event loop)
+
+        Args:
+            feedback_id: Feedback identifier
+            timeout: Maximum seconds to wait for the index to be rebuilt on start
+
+        Returns:
+            The stored record, or None if it is unknown
+        """
+        record = self._pending.get(feedback_id)
+        if record is not None:
+            return record
+        self._ensure_started()
+        if not self._indexed.wait(timeout):
+            return None
+        entry = self._index.get(feedback_id)
+        if entry is None:
+            # Committed between the two lookups
+            return self._pending.get(feedback_id)
+        segment_name, offset, length = entry
+        with open(os.path.join(self.directory, segment_name), "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Commit everything queued so far
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue was committed within the timeout
+        """
+        if self._thread is None:
+            return True
+        marker = _Marker()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Commit remaining records and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        marker = _Marker(stop=True)
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return
+        marker.done.wait(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get store counters
+
+        Returns:
+            Queue depth, indexed records and written/dropped/failed counts
+        """
+        return {
+            "queued": self._queue.qsize(),
+            "indexed": len(self._index),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "commits": self.commits
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="feedback-store-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        """Writer loop: rebuild the index, then group-commit queued records"""
+        try:
+            self._open_store()
+        except Exception as e:
+            logger.error(f"Feedback store unavailable at {self.directory}: {type(e).__name__}")
+        finally:
+            self._indexed.set()
+
+        while True:
+            batch: List[Dict[str, Any]] = []
+            markers: List[_Marker] = []
+            item = self._queue.get()
+            while True:
+                if isinstance(item, _Marker):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.max_batch_records:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._commit(batch)
+            for marker in markers:
+                marker.done.set()
+            if any(marker.stop for marker in markers):
+                self._close_segment()
+                return
+
+    def _commit(self, batch: List[Dict[str, Any]]):
+        """Write a batch to the current segment with a single write and fsync"""
+        lines = []
+        for record in batch:
+            try:
+                lines.append((record, json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"))
+            except (TypeError, ValueError):
+                self.failed += 1
+                self._pending.pop(record["feedback_id"], None)
+        if not lines:
+            return
+
+        try:
+            batch_bytes = sum(len(line) for _, line in lines)
+            if self._segment_file is None or (
+                self._segment_size and self._segment_size + batch_bytes > self.max_segment_bytes
+            ):
+                self._rotate()
+            segment_name, offset = self._segment_name, self._segment_size
+            self._segment_file.write(b"".join(line for _, line in lines))
+            self._segment_file.flush()
+            if self.fsync:
+                os.fsync(self._segment_file.fileno())
+            self._segment_size += batch_bytes
+        except OSError as e:
+            self.failed += len(lines)
+            for record, _ in lines:
+                self._pending.pop(record["feedback_id"], None)
+            logger.error(f"Feedback store write failed ({len(lines)} records): {type(e).__name__}")
+            # Reopen on the next commit; a partial line is truncated when indexing
+            self._close_segment()
+            return
+
+        for record, line in lines:
+            # Index first so a lookup never misses the record in between
+            self._index[record["feedback_id"]] = (segment_name, offset, len(line) - 1)
+            self._pending.pop(record["feedback_id"], None)
+            offset += len(line)
+        self.written += len(lines)
+        self.commits += 1
+
+    def _open_store(self):
+        """Index existing segments and continue appending to the newest one"""
+        os.makedirs(self.directory, exist_ok=True)
+        segments = sorted(
+            (int(match.group(1)), name)
+            for name in os.listdir(self.directory)
+            if (match := _SEGMENT_NAME.match(name))
+        )
+        for seq, name in segments:
+            self._index_segment(name)
+            self._segment_seq = seq
+        if segments:
+            name = segments[-1][1]
+            path = os.path.join(self.directory, name)
+            self._segment_name = name
+            self._segment_file = open(path, "ab")
+            self._segment_size = os.path.getsize(path)
+        logger.info(f"Feedback store opened: {len(segments)} segments, {len(self._index)} records")
+
+    def _index_segment(self, name: str):
+        """Add a segment's records to the index, truncating a torn final line"""
+        path = os.path.join(self.directory, name)
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    logger.warning(f"Truncating incomplete record at {name}:{offset}")
+                    with open(path, "r+b") as segment:
+                        segment.truncate(offset)
+                    break
+                try:
+                    feedback_id = json.loads(line)["feedback_id"]
+                    self._index[feedback_id] = (name, offset, len(line) - 1)
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Skipping unreadable record at {name}:{offset}")
+                offset += len(line)
+
+    def _rotate(self):
+        """Start a new segment"""
+        self._close_segment()
+        os.makedirs(self.directory, exist_ok=True)
+        self._segment_seq += 1
+        self._segment_name = f"{SEGMENT_PREFIX}{self._segment_seq:06d}{SEGMENT_SUFFIX}"
+        self._segment_file = open(os.path.join(self.directory, self._segment_name), "ab")
+        self._segment_size = self._segment_file.tell()
+
+    def _close_segment(self):
+        if self._segment_file is not None:
+            try:
+                self._segment_file.close()
+            except OSError:
+                pass
+            self._segment_file = None
+
+
+# Global store (the writer thread starts with the first record)
+feedback_store = FeedbackStore(
+    directory=settings.FEEDBACK_STORE_DIR,
+    max_segment_bytes=int(settings.FEEDBACK_SEGMENT_MAX_MB * 1024 * 1024),
+    max_batch_records=settings.FEEDBACK_STORE_BATCH_SIZE,
+    max_queue_size=settings.FEEDBACK_STORE_QUEUE_SIZE,
+    fsync=settings.FEEDBACK_STORE_FSYNC
+)
+
+registry.callback(
+    "wb_feedback_store_queue_depth",
+    "Feedback records waiting for a group commit",
+    lambda: feedback_store.stats()["queued"]
+)
+registry.callback(
+    "wb_feedback_store_records_total",
+    "Feedback records by store result (dropped: queue full)",
+    lambda: {
+        (result,): feedback_store.stats()[result] for result in ("written", "dropped", "failed")
+    },
+    type_name="counter",
+    labelnames=("result",)
+)
@@ -3,14 +3,29 @@ LLM Service for Writers Block Service
 Combines LLM integration with business logic in a single, clean service
 """
 
-import boto3
-import json
 import asyncio
-from typing import Dict, Optional
+import time
+from contextlib import aclosing, nullcontext
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
 
 from ..core.config import settings
 from ..core.logging import get_logger, sanitize_for_log
-from ..core.exceptions import LLMServiceError, ValidationError, ProcessingError
+from ..core.exceptions import (
+    LLMServiceError,
+    ValidationError,
+    ProcessingError,
+    ServiceUnavailableError
+)
+from ..core.metrics import BEDROCK_LATENCY, registry
+from ..core.request_context import current_request_usage, timed_stage
+from ..utils.chunking import join_chunks, split_text
+from .bedrock_transport import BedrockTransport, create_transport
+from . import prompt_cache
+from .model_router import ModelRouter, Route, RouteTarget, load_routes
+from .resilience import BedrockResilience, CircuitBreaker, RetryBudget, classify_error
+from .result_cache import ResultCache
+from .single_flight import SingleFlight
+from .token_budget import plan_max_tokens
 
 
 class LLMService:
@@ -30,20 +45,57 @@ REPHRASE: Rewrite the text according to the specified instructions while maintai
 
 Always return only the processed text without any additional explanations, formatting, or commentary."""
     
+    # Fixed preamble for custom prompt instructions
+    CUSTOM_PROMPT_PREAMBLE = "Process the following instruction:\n\n"
+    
     def __init__(self):
-        """Initialize LLM service with Bedrock client"""
+        """Initialize LLM service with Bedrock transport and model router"""
         self.logger = get_logger(__name__)
         
+        # One transport per region, created on first use (or by warm())
+        # so importing the service does not build AWS clients
+        self.transports: Dict[str, BedrockTransport] = {}
         try:
-            self.bedrock_client = boto3.client('bedrock-runtime', region_name=settings.AWS_REGION)
             self.model_id = settings.BEDROCK_MODEL_ID
-            self.logger.info(f"Initialized LLM service with model: {sanitize_for_log(self.model_id)}")
+            self.router = ModelRouter(
+                load_routes(settings.MODEL_ROUTING_TABLE),
+                max_error_rate=settings.ROUTER_MAX_ERROR_RATE,
+                load_threshold=settings.ROUTER_LOAD_THRESHOLD,
+                error_half_life=settings.ROUTER_ERROR_HALF_LIFE_SECONDS
+            )
+            self.logger.info(
+                f"Initialized LLM service with model: {sanitize_for_log(self.model_id)}, "
+                f"transport: {settings.BEDROCK_TRANSPORT}, routes: {len(self.router.routes)}"
+            )
         except Exception as e:
             self.logger.error(f"Failed to initialize Bedrock client: {type(e).__name__}")
             raise LLMServiceError(f"Failed to initialize LLM service: {str(e)}")
+        
+        # Result cache for repeated requests (successful results only)
+        self.result_cache: Optional[ResultCache] = None
+        if settings.ENABLE_RESULT_CACHE:
+            self.result_cache = ResultCache(
+                max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+                max_bytes=settings.RESULT_CACHE_MAX_BYTES
+            )
+        
+        # Coalesce identical in-flight requests into one Bedrock invocation
+        self.single_flight: Optional[SingleFlight] = None
+        if settings.ENABLE_SINGLE_FLIGHT:
+            self.single_flight = SingleFlight(retain_seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+        
+        # Retries share a global budget; each target gets its own circuit breaker
+        self.retry_budget = RetryBudget(
+            ratio=settings.RETRY_BUDGET_RATIO,
+            min_per_second=settings.RETRY_BUDGET_MIN_PER_SECOND
+        )
+        self.resilience: Dict[RouteTarget, BedrockResilience] = {}
+        
+        self._register_metrics()
     
     async def process_text(self, text: str, action: str, parameters: Dict[str, str], 
-                          session_id: str) -> str:
+                          session_id: str, idempotency_key: Optional[str] = None) -> str:
         """
         Main entry point for text processing
         
@@ -52,6 +104,7 @@ Always return only the processed text without any additional explanations, forma
             action: Action type (grammar_fix, rephrase)
             parameters: Action parameters
             session_id: Session ID for logging
+            idempotency_key: Optional client key so retries attach to the original request
             
         Returns:
             Processed text
@@ -62,39 +115,358 @@ Always return only the processed text without any additional explanations, forma
         """
         self.logger.info(f"Processing text - Session: {sanitize_for_log(session_id)}, Action: {action}")
         
+        route = self.router.match(action, parameters, len(text))
+        with timed_stage("cache"):
+            request_key = ResultCache.make_key(text, action, parameters, self._cache_scope(route))
+            
+            # Serve repeated requests from the result cache
+            cached_result = None
+            if self.result_cache is not None:
+                cached_result = self.result_cache.get(request_key)
+        if cached_result is not None:
+            self.logger.info(f"Result cache hit - Session: {sanitize_for_log(session_id)}")
+            return cached_result
+        
+        if self.single_flight is None:
+            return await self._generate(text, action, parameters, session_id, route, request_key)
+        
+        joining = self.single_flight.is_inflight(request_key)
+        if joining:
+            self.logger.info(f"Joining in-flight request - Session: {sanitize_for_log(session_id)}")
+        
+        # Waiting on an identical in-flight request is reported as its own stage
+        with timed_stage("coalesced_wait") if joining else nullcontext():
+            return await self.single_flight.do(
+                request_key,
+                lambda: self._generate(text, action, parameters, session_id, route, request_key),
+                idempotency_key=idempotency_key
+            )
+    
+    async def _generate(self, text: str, action: str, parameters: Dict[str, str],
+                        session_id: str, route: Route, request_key: str) -> str:
+        """
+        Generate processed text with the LLM and cache the successful result
+        
+        Args:
+            text: Text to process
+            action: Action type (grammar_fix, rephrase)
+            parameters: Action parameters
+            session_id: Session ID of the request that triggered the call
+            route: Model route for the request
+            request_key: Cache key for the request
+            
+        Returns:
+            Processed text
+        """
+        served_by: Set[str] = set()
         try:
-            if action == "grammar_fix":
-                return await self._fix_grammar(text, session_id)
-            elif action == "rephrase":
-                return await self._handle_rephrase(text, parameters, session_id)
+            if len(text) > settings.CHUNK_THRESHOLD_CHARS:
+                result = await self._process_chunked(text, action, parameters, session_id, route,
+                                                     served_by)
             else:
-                raise ValidationError(f"Unsupported action: {action}")
+                with timed_stage("prompt"):
+                    user_prompt = self._build_user_prompt(text, action, parameters, session_id)
+                    max_tokens = plan_max_tokens(text, action, parameters)
+                result = await self._call_bedrock(user_prompt, session_id, max_tokens, route,
+                                                  self._prompt_cache_prefix(parameters), served_by)
                 
-        except (ValidationError, ProcessingError):
+        except (ValidationError, ProcessingError, ServiceUnavailableError):
             # Re-raise our custom exceptions
             raise
         except Exception as e:
             self.logger.error(f"Unexpected error in text processing - Session: {sanitize_for_log(session_id)}: {type(e).__name__}")
             raise ProcessingError(f"Text processing failed: {str(e)}")
+        
+        # Only successful results from the cache scope's model reach the cache
+        if self.result_cache is not None and self._is_cacheable(route, served_by):
+            with timed_stage("cache"):
+                self.result_cache.set(request_key, result)
+        
+        return result
     
-    async def _fix_grammar(self, text: str, session_id: str) -> str:
+    async def _process_chunked(self, text: str, action: str, parameters: Dict[str, str],
+                               session_id: str, route: Route,
+                               served_by: Optional[Set[str]] = None) -> str:
         """
-        Fix grammar and spelling errors in text
+        Process long text as sentence-aligned chunks in parallel
+        
+        Every chunk uses the same action and parameters so tone stays consistent,
+        and the output is reassembled in order with the original separators.
         
         Args:
-            text: Text to fix
+            text: Text to process
+            action: Action type (grammar_fix, rephrase)
+            parameters: Action parameters
             session_id: Session ID for logging
+            route: Model route shared by all chunks
+            served_by: Optional set that collects the model IDs that served the chunks
             
         Returns:
-            Corrected text
+            Reassembled processed text
         """
-        user_prompt = f"""Action: GRAMMAR_FIX
-Text to process: "{text}" """
+        with timed_stage("prompt"):
+            chunks = split_text(text, settings.CHUNK_MAX_CHARS)
+        self.logger.info(f"Processing {len(chunks)} chunks - Session: {sanitize_for_log(session_id)}")
+        
+        semaphore = asyncio.Semaphore(settings.CHUNK_MAX_CONCURRENCY)
         
-        return await self._call_bedrock(user_prompt, session_id)
+        async def process_chunk(index: int, chunk_text: str) -> str:
+            if not chunk_text.strip():
+                return chunk_text
+            with timed_stage("prompt"):
+                user_prompt = self._build_chunk_prompt(chunk_text, index, len(chunks),
+                                                       action, parameters, session_id)
+                max_tokens = plan_max_tokens(chunk_text, action, parameters)
+            async with semaphore:
+                return await self._call_bedrock(user_prompt, session_id, max_tokens, route,
+                                                self._prompt_cache_prefix(parameters), served_by)
+        
+        tasks = [
+            asyncio.ensure_future(process_chunk(index, chunk_text))
+            for index, (chunk_text, _) in enumerate(chunks)
+        ]
+        try:
+            processed = await asyncio.gather(*tasks)
+        except Exception:
+            # One failed chunk fails the request - stop paying for the rest
+            for task in tasks:
+                task.cancel()
+            raise
+        
+        return join_chunks(processed, [separator for _, separator in chunks])
     
-    async def _handle_rephrase(self, text: str, parameters: Dict[str, str], 
-                              session_id: str) -> str:
+    async def stream_text(self, text: str, action: str, parameters: Dict[str, str],
+                          session_id: str) -> AsyncIterator[str]:
+        """
+        Streaming entry point for text processing
+        
+        Args:
+            text: Text to process
+            action: Action type (grammar_fix, rephrase)
+            parameters: Action parameters
+            session_id: Session ID for logging
+            
+        Yields:
+            Incremental text deltas as they are generated
+            
+        Raises:
+            ValidationError: For invalid parameters
+            LLMServiceError: For Bedrock API failures
+        """
+        self.logger.info(f"Streaming text - Session: {sanitize_for_log(session_id)}, Action: {action}")
+        
+        # Long text is streamed chunk by chunk; validate parameters up front either way
+        with timed_stage("prompt"):
+            if len(text) > settings.CHUNK_THRESHOLD_CHARS:
+                chunks = split_text(text, settings.CHUNK_MAX_CHARS)
+            else:
+                chunks = [(text, "")]
+            self._build_user_prompt(chunks[0][0], action, parameters, session_id)
+        
+        # A cached result is replayed as a single delta
+        cache_key, cached_result = None, None
+        route = self.router.match(action, parameters, len(text))
+        with timed_stage("cache"):
+            if self.result_cache is not None:
+                cache_key = ResultCache.make_key(text, action, parameters, self._cache_scope(route))
+                cached_result = self.result_cache.get(cache_key)
+        if cached_result is not None:
+            self.logger.info(f"Result cache hit - Session: {sanitize_for_log(session_id)}")
+            yield cached_result
+            return
+        
+        parts = []
+        served_by: Set[str] = set()
+        for index, (chunk_text, separator) in enumerate(chunks):
+            if chunk_text.strip():
+                with timed_stage("prompt"):
+                    if len(chunks) > 1:
+                        user_prompt = self._build_chunk_prompt(chunk_text, index, len(chunks),
+                                                               action, parameters, session_id)
+                    else:
+                        user_prompt = self._build_user_prompt(chunk_text, action, parameters, session_id)
+                    max_tokens = plan_max_tokens(chunk_text, action, parameters)
+                    cache_prefix = self._prompt_cache_prefix(parameters)
+                deltas = self._stream_bedrock(user_prompt, session_id, max_tokens, route, cache_prefix,
+                                              served_by)
+                async with aclosing(deltas):
+                    async for delta in deltas:
+                        parts.append(delta)
+                        yield delta
+            elif chunk_text:
+                parts.append(chunk_text)
+                yield chunk_text
+            
+            if separator:
+                parts.append(separator)
+                yield separator
+        
+        self.logger.info(f"LLM stream completed - Session: {sanitize_for_log(session_id)}")
+        if self.result_cache is not None and parts and self._is_cacheable(route, served_by):
+            self.result_cache.set(cache_key, "".join(parts).strip())
+    
+    async def _stream_bedrock(self, user_prompt: str, session_id: str, max_tokens: int,
+                              route: Route, cache_prefix: Optional[str] = None,
+                              served_by: Optional[Set[str]] = None) -> AsyncIterator[str]:
+        """
+        Stream a single Bedrock generation as text deltas
+        
+        Generations cut off by max_tokens are continued transparently.
+        
+        Args:
+            user_prompt: User's request prompt
+            session_id: Session ID for logging
+            max_tokens: Output token budget per call
+            route: Model route for the request
+            cache_prefix: Static leading part of the user prompt to mark cacheable
+            served_by: Optional set that collects the model IDs that served the stream
+            
+        Yields:
+            Text deltas, stripped at both ends like the non-streaming path
+            
+        Raises:
+            LLMServiceError: For Bedrock API failures
+        """
+        started = False
+        # Trailing whitespace is held back until more text follows it
+        pending_whitespace = ""
+        output = ""
+        try:
+            for continuation in range(settings.MAX_CONTINUATIONS + 1):
+                with timed_stage("prompt"):
+                    body = self._build_request_body(user_prompt, max_tokens,
+                                                    partial_output=output or None,
+                                                    cache_prefix=cache_prefix)
+                if continuation:
+                    # The prefill drops trailing whitespace; the model regenerates it
+                    output = output.rstrip()
+                    pending_whitespace = ""
+                
+                usage = current_request_usage()
+                if usage is not None:
+                    usage.bedrock_calls += 1
+                
+                stop_reason = None
+                events = self._invoke_stream(route, body, session_id, served_by)
+                async with aclosing(events):
+                    async for event in events:
+                        event_type = event.get("type")
+                        if event_type == "message_start":
+                            if usage is not None:
+                                usage.add(event.get("message", {}).get("usage"))
+                            continue
+                        if event_type == "message_delta":
+                            stop_reason = event.get("delta", {}).get("stop_reason") or stop_reason
+                            if usage is not None:
+                                usage.add(event.get("usage"))
+                            continue
+                        if event_type != "content_block_delta":
+                            continue
+                        delta = event.get("delta", {}).get("text", "")
+                        output += delta
+                        if not started:
+                            delta = delta.lstrip()
+                        text_part = delta.rstrip()
+                        if text_part:
+                            started = True
+                            yield pending_whitespace + text_part
+                            pending_whitespace = delta[len(text_part):]
+                        else:
+                            pending_whitespace += delta
+                
+                if stop_reason != "max_tokens" or not output.strip():
+                    break
+                self.logger.info(
+                    f"Streamed output truncated at max_tokens={max_tokens}, continuing - "
+                    f"Session: {sanitize_for_log(session_id)}"
+                )
+        except ServiceUnavailableError:
+            self.logger.warning(f"No Bedrock target available, failing fast - Session: {sanitize_for_log(session_id)}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Bedrock streaming call failed - Session: {sanitize_for_log(session_id)}: {type(e).__name__}")
+            raise LLMServiceError(f"LLM processing failed: {str(e)}")
+    
+    def _build_user_prompt(self, text: str, action: str, parameters: Dict[str, str],
+                           session_id: str) -> str:
+        """
+        Validate parameters and build the user prompt for an action
+        
+        Args:
+            text: Text to process
+            action: Action type (grammar_fix, rephrase)
+            parameters: Action parameters
+            session_id: Session ID for logging
+            
+        Returns:
+            User prompt for the LLM
+        """
+        if action == "grammar_fix":
+            return self._grammar_fix_prompt(text)
+        elif action == "rephrase":
+            return self._rephrase_prompt(text, parameters or {}, session_id)
+        else:
+            raise ValidationError(f"Unsupported action: {action}")
+    
+    def _build_chunk_prompt(self, chunk_text: str, index: int, total: int, action: str,
+                            parameters: Dict[str, str], session_id: str) -> str:
+        """
+        Build user prompt for one chunk of a longer text
+        
+        Args:
+            chunk_text: Chunk to process
+            index: Zero-based chunk position
+            total: Total number of chunks
+            action: Action type (grammar_fix, rephrase)
+            parameters: Action parameters
+            session_id: Session ID for logging
+            
+        Returns:
+            User prompt with a note that the text is part of a larger document
+        """
+        # The note goes last so the prompt keeps its cacheable prefix
+        user_prompt = self._build_user_prompt(chunk_text, action, parameters, session_id)
+        return (
+            f"{user_prompt}\n\n"
+            f"Note: the text above is part {index + 1} of {total} of a longer document. "
+            f"Process only this part, keep the same tone and style as the other parts, "
+            f"and do not add introductions or conclusions."
+        )
+    
+    def _prompt_cache_prefix(self, parameters: Optional[Dict[str, str]]) -> Optional[str]:
+        """
+        Get the static leading part of the user prompt for prompt caching
+        
+        Custom prompt templates are reused across requests, so everything
+        before the {selected_text} placeholder is a reusable prefix.
+        
+        Args:
+            parameters: Action parameters
+            
+        Returns:
+            Cacheable prefix, or None when the prompt has no reusable prefix
+        """
+        custom_prompt = (parameters or {}).get("custom_prompt")
+        if not settings.ENABLE_PROMPT_CACHING or not custom_prompt:
+            return None
+        template_prefix = custom_prompt.split('{selected_text}', 1)[0]
+        return f"{self.CUSTOM_PROMPT_PREAMBLE}{template_prefix}"
+    
+    def _grammar_fix_prompt(self, text: str) -> str:
+        """
+        Build prompt to fix grammar and spelling errors in text
+        
+        Args:
+            text: Text to fix
+            
+        Returns:
+            Grammar fix prompt
+        """
+        return f"""Action: GRAMMAR_FIX
+Text to process: "{text}" """
+    
+    def _rephrase_prompt(self, text: str, parameters: Dict[str, str], 
+                         session_id: str) -> str:
         """
         Handle rephrase logic with both built-in tones and custom prompts
         
@@ -104,7 +476,7 @@ Text to process: "{text}" """
             session_id: Session ID for logging
             
         Returns:
-            Rephrased text
+            Rephrase prompt
         """
         tone = parameters.get("tone")
         custom_prompt = parameters.get("custom_prompt")
@@ -117,14 +489,14 @@ Text to process: "{text}" """
             raise ValidationError("Must specify either tone or custom_prompt", field="parameters")
         
         if custom_prompt:
-            return await self._rephrase_with_custom_prompt(text, custom_prompt, session_id)
+            return self._custom_prompt_prompt(text, custom_prompt, session_id)
         else:
-            return await self._rephrase_with_tone(text, tone, session_id)
+            return self._tone_prompt(text, tone, session_id)
     
-    async def _rephrase_with_custom_prompt(self, text: str, custom_prompt: str, 
-                                          session_id: str) -> str:
+    def _custom_prompt_prompt(self, text: str, custom_prompt: str, 
+                              session_id: str) -> str:
         """
-        Rephrase text using custom prompt template
+        Build rephrase prompt from custom prompt template
         
         Args:
             text: Text to rephrase
@@ -132,7 +504,7 @@ Text to process: "{text}" """
             session_id: Session ID for logging
             
         Returns:
-            Rephrased text
+            Resolved custom prompt
         """
         # Validate placeholder exists
         if '{selected_text}' not in custom_prompt:
@@ -141,19 +513,16 @@ Text to process: "{text}" """
         # Replace placeholder with actual text
         resolved_prompt = custom_prompt.replace('{selected_text}', text)
         
+        self.logger.info(f"Processing custom prompt - Session: {sanitize_for_log(session_id)}")
+        
         # Use resolved prompt as direct instruction
-        user_prompt = f"""Process the following instruction:
-
-{resolved_prompt}
+        return f"""{self.CUSTOM_PROMPT_PREAMBLE}{resolved_prompt}
 
 Return only the processed text without any additional explanations or commentary."""
-        
-        self.logger.info(f"Processing custom prompt - Session: {sanitize_for_log(session_id)}")
-        return await self._call_bedrock(user_prompt, session_id)
     
-    async def _rephrase_with_tone(self, text: str, tone: str, session_id: str) -> str:
+    def _tone_prompt(self, text: str, tone: str, session_id: str) -> str:
         """
-        Rephrase text using built-in tone
+        Build rephrase prompt for a built-in tone
         
         Args:
             text: Text to rephrase
@@ -161,27 +530,98 @@ Return only the processed text without any additional explanations or commentary
             session_id: Session ID for logging
             
         Returns:
-            Rephrased text
+            Tone rephrase prompt
         """
         # Validate built-in tone
         valid_tones = {'professional', 'casual', 'academic', 'creative', 'technical'}
         if tone not in valid_tones:
             raise ValidationError(f"Invalid tone '{tone}'. Valid tones: {', '.join(valid_tones)}", field="tone")
         
-        user_prompt = f"""Action: REPHRASE
+        self.logger.info(f"Processing built-in tone '{tone}' - Session: {sanitize_for_log(session_id)}")
+        
+        return f"""Action: REPHRASE
 Tone: {tone}
 Text to process: "{text}" """
+    
+    def _build_request_body(self, user_prompt: str, max_tokens: int,
+                            partial_output: Optional[str] = None,
+                            cache_prefix: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build Bedrock request body for a user prompt
         
-        self.logger.info(f"Processing built-in tone '{tone}' - Session: {sanitize_for_log(session_id)}")
-        return await self._call_bedrock(user_prompt, session_id)
+        With prompt caching enabled the system prompt and any cache_prefix of
+        the user prompt are marked as candidate cache breakpoints; each target
+        keeps only those its model can cache (see prompt_cache.for_model).
+        
+        Args:
+            user_prompt: User's request prompt
+            max_tokens: Output token budget
+            partial_output: Output so far when continuing a truncated generation
+            cache_prefix: Static leading part of user_prompt to mark cacheable
+            
+        Returns:
+            Anthropic messages request body
+        """
+        system: Any = self.MASTER_SYSTEM_PROMPT
+        user_content: Any = user_prompt
+        
+        if settings.ENABLE_PROMPT_CACHING:
+            system = [{
+                "type": "text",
+                "text": self.MASTER_SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"}
+            }]
+            if cache_prefix and user_prompt.startswith(cache_prefix) and len(user_prompt) > len(cache_prefix):
+                user_content = [
+                    {
+                        "type": "text",
+                        "text": cache_prefix,
+                        "cache_control": {"type": "ephemeral"}
+                    },
+                    {
+                        "type": "text",
+                        "text": user_prompt[len(cache_prefix):]
+                    }
+                ]
+        
+        messages = [
+            {
+                "role": "user",
+                "content": user_content
+            }
+        ]
+        
+        # Prefill the assistant turn so the model continues where it stopped
+        # (the API rejects prefills ending in whitespace)
+        if partial_output:
+            messages.append({
+                "role": "assistant",
+                "content": partial_output.rstrip()
+            })
+        
+        return {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "system": system,
+            "messages": messages
+        }
     
-    async def _call_bedrock(self, user_prompt: str, session_id: str) -> str:
+    async def _call_bedrock(self, user_prompt: str, session_id: str, max_tokens: int,
+                            route: Route, cache_prefix: Optional[str] = None,
+                            served_by: Optional[Set[str]] = None) -> str:
         """
         Make API call to Claude via Bedrock
         
+        Responses that stop on max_tokens are continued with follow-up calls
+        (up to MAX_CONTINUATIONS) so long outputs are not returned cut off.
+        
         Args:
             user_prompt: User's request prompt
             session_id: Session ID for logging
+            max_tokens: Output token budget per call
+            route: Model route for the request
+            cache_prefix: Static leading part of the user prompt to mark cacheable
+            served_by: Optional set that collects the model IDs that served the calls
             
         Returns:
             Claude's response text
@@ -190,36 +630,306 @@ Text to process: "{text}" """
             LLMServiceError: For Bedrock API failures
         """
         try:
-            # Prepare request body
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1000,
-                "system": self.MASTER_SYSTEM_PROMPT,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ]
-            }
-            
-            # Make async call to Bedrock
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.bedrock_client.invoke_model(
-                    modelId=self.model_id,
-                    body=json.dumps(body)
+            output = ""
+            for continuation in range(settings.MAX_CONTINUATIONS + 1):
+                # Prepare request body
+                with timed_stage("prompt"):
+                    body = self._build_request_body(user_prompt, max_tokens,
+                                                    partial_output=output or None,
+                                                    cache_prefix=cache_prefix)
+                if continuation:
+                    output = output.rstrip()
+                
+                # Make async call to Bedrock (the transport records executor wait,
+                # Bedrock and body decoding time)
+                response_body, target = await self._invoke(route, body, session_id)
+                if served_by is not None:
+                    served_by.add(target.model_id)
+                
+                # Parse response
+                with timed_stage("parse"):
+                    output += "".join(
+                        block.get("text", "") for block in response_body['content']
+                        if block.get("type", "text") == "text"
+                    )
+                    stop_reason = response_body.get("stop_reason")
+                    usage = response_body.get("usage", {})
+                
+                request_usage = current_request_usage()
+                if request_usage is not None:
+                    request_usage.bedrock_calls += 1
+                    request_usage.add(usage)
+                
+                if stop_reason != "max_tokens" or not output.strip():
+                    break
+                self.logger.info(
+                    f"LLM output truncated at max_tokens={max_tokens} "
+                    f"(output_tokens={usage.get('output_tokens')}), continuing - "
+                    f"Session: {sanitize_for_log(session_id)}"
                 )
-            )
             
-            # Parse response
-            response_body = json.loads(response['body'].read())
-            result = response_body['content'][0]['text'].strip()
+            result = output.strip()
             
-            self.logger.info(f"LLM call successful - Session: {sanitize_for_log(session_id)}")
+            self.logger.info(
+                f"LLM call successful - Session: {sanitize_for_log(session_id)}, "
+                f"route: {route.name}, target: {target.key}, "
+                f"stop_reason: {stop_reason}, continuations: {continuation}"
+            )
             return result
             
+        except ServiceUnavailableError:
+            self.logger.warning(f"No Bedrock target available, failing fast - Session: {sanitize_for_log(session_id)}")
+            raise
         except Exception as e:
             self.logger.error(f"Bedrock API call failed - Session: {sanitize_for_log(session_id)}: {type(e).__name__}")
             raise LLMServiceError(f"LLM processing failed: {str(e)}")
+    
+    @staticmethod
+    def _count_retry():
+        """Count a Bedrock retry against the current request"""
+        usage = current_request_usage()
+        if usage is not None:
+            usage.bedrock_retries += 1
+    
+    async def _invoke(self, route: Route, body: Dict[str, Any],
+                      session_id: str) -> Tuple[Dict[str, Any], RouteTarget]:
+        """
+        Invoke the best available target of a route
+
+        Targets are tried in router preference order. A target whose breaker is
+        open, or that is still throttled/unavailable after its retries, hands
+        over to the next one.
+
+        Args:
+            route: Model route for the request
+            body: Request body
+            session_id: Session ID for logging
+
+        Returns:
+            Tuple of (response body, target that served it)
+
+        Raises:
+            ServiceUnavailableError: When no target is available
+        """
+        candidates = self.router.candidates(route, is_healthy=self._is_target_healthy)
+        for position, target in enumerate(candidates):
+            transport = self._get_transport(target.region)
+            target_body = self._body_for_target(body, target)
+            self.router.begin(target)
+            start_time = time.perf_counter()
+            latency_ms, success, outcome = None, None, None
+            try:
+                response_body = await self._get_resilience(target).call(
+                    lambda: transport.invoke_model(target.model_id, target_body),
+                    on_retry=self._count_retry
+                )
+                latency_ms, success, outcome = (time.perf_counter() - start_time) * 1000, True, "success"
+                return response_body, target
+            except Exception as e:
+                success = self._call_outcome(e)
+                outcome = self._metric_outcome(e)
+                if position + 1 < len(candidates) and self._can_fail_over(e):
+                    self._log_failover(target, e, session_id)
+                    continue
+                raise
+            finally:
+                self.router.end(target, latency_ms, success)
+                if outcome:
+                    BEDROCK_LATENCY.labels(target.key, "invoke", outcome).observe(
+                        time.perf_counter() - start_time)
+        raise ServiceUnavailableError("No Bedrock target available")
+
+    async def _invoke_stream(self, route: Route, body: Dict[str, Any], session_id: str,
+                             served_by: Optional[Set[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream from the best available target of a route
+
+        Fails over like _invoke, but only until the first event has arrived.
+        Stream latency depends on output length, so only outcomes are recorded.
+
+        Args:
+            route: Model route for the request
+            body: Request body
+            session_id: Session ID for logging
+            served_by: Optional set that receives the model ID of the target that streamed
+
+        Yields:
+            Decoded stream events
+        """
+        candidates = self.router.candidates(route, is_healthy=self._is_target_healthy)
+        for position, target in enumerate(candidates):
+            transport = self._get_transport(target.region)
+            target_body = self._body_for_target(body, target)
+            events = self._get_resilience(target).stream(
+                lambda: transport.invoke_model_stream(target.model_id, target_body),
+                on_retry=self._count_retry
+            )
+            started = False
+            success, outcome = None, None
+            self.router.begin(target)
+            start_time = time.perf_counter()
+            try:
+                # Close the attempt's stream (and release a breaker probe) even
+                # when the consumer stops reading, e.g. on client disconnect
+                async with aclosing(events):
+                    async for event in events:
+                        if not started and served_by is not None:
+                            served_by.add(target.model_id)
+                        started = True
+                        yield event
+                success, outcome = True, "success"
+                return
+            except Exception as e:
+                success = self._call_outcome(e)
+                outcome = self._metric_outcome(e)
+                if not started and position + 1 < len(candidates) and self._can_fail_over(e):
+                    self._log_failover(target, e, session_id)
+                    continue
+                raise
+            finally:
+                self.router.end(target, None, success)
+                if outcome:
+                    BEDROCK_LATENCY.labels(target.key, "stream", outcome).observe(
+                        time.perf_counter() - start_time)
+        raise ServiceUnavailableError("No Bedrock target available")
+
+    @staticmethod
+    def _body_for_target(body: Dict[str, Any], target: RouteTarget) -> Dict[str, Any]:
+        """Keep only the cache breakpoints the target's model would actually cache"""
+        if not settings.ENABLE_PROMPT_CACHING:
+            return body
+        return prompt_cache.for_model(body, target.model_id)
+
+    @staticmethod
+    def _call_outcome(error: Exception) -> Optional[bool]:
+        """Map a failed call to a router outcome (None: says nothing about the target)"""
+        if isinstance(error, ServiceUnavailableError) or classify_error(error) == "client":
+            return None
+        return False
+
+    @staticmethod
+    def _metric_outcome(error: Exception) -> Optional[str]:
+        """Latency metric outcome for a failed call (None: Bedrock was not called)"""
+        if isinstance(error, ServiceUnavailableError):
+            return None
+        return classify_error(error)
+
+    @staticmethod
+    def _can_fail_over(error: Exception) -> bool:
+        """Check whether another target could serve a request that failed with error"""
+        if isinstance(error, ServiceUnavailableError):
+            return True
+        return classify_error(error) in ("throttling", "transient", "timeout")
+
+    def _log_failover(self, target: RouteTarget, error: Exception, session_id: str):
+        self.logger.warning(
+            f"Bedrock target {sanitize_for_log(target.key)} failed with {type(error).__name__}, "
+            f"trying next target - Session: {sanitize_for_log(session_id)}"
+        )
+
+    def _get_transport(self, region: str) -> BedrockTransport:
+        """Get (or create) the transport for a region"""
+        transport = self.transports.get(region)
+        if transport is None:
+            transport = self.transports[region] = create_transport(region)
+        return transport
+
+    def _get_resilience(self, target: RouteTarget) -> BedrockResilience:
+        """Get (or create) the retry/breaker policy for a target"""
+        resilience = self.resilience.get(target)
+        if resilience is None:
+            resilience = self.resilience[target] = BedrockResilience(
+                max_retries=settings.BEDROCK_MAX_RETRIES,
+                max_delay=settings.RETRY_MAX_DELAY_SECONDS,
+                retry_budget=self.retry_budget,
+                breaker=CircuitBreaker(
+                    failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                    reset_seconds=settings.CIRCUIT_RESET_SECONDS
+                )
+            )
+        return resilience
+
+    def _is_target_healthy(self, target: RouteTarget) -> bool:
+        resilience = self.resilience.get(target)
+        return resilience is None or resilience.breaker.state != CircuitBreaker.OPEN
+
+    @staticmethod
+    def _cache_scope(route: Route) -> str:
+        """Cache namespace for a route (results differ between models)"""
+        return f"{route.name}:{route.targets[0].model_id}"
+    
+    @staticmethod
+    def _is_cacheable(route: Route, served_by: Set[str]) -> bool:
+        """
+        Check whether a result can be cached under the route's cache scope
+        
+        The scope names the route's primary model, so a result produced
+        (even partly) by a failover or fallback model is not cached: it would
+        keep being served after the primary recovers.
+        """
+        return served_by == {route.targets[0].model_id}
+
+    def _register_metrics(self):
+        """Expose service state as scrape-time metrics (no hot-path cost)"""
+        registry.callback(
+            "wb_executor_queue_depth",
+            "Bedrock calls waiting for an executor thread",
+            lambda: sum(transport.queue_depth() for transport in self.transports.values())
+        )
+        registry.callback(
+            "wb_bedrock_calls_in_flight",
+            "Bedrock calls currently in flight",
+            lambda: self.router.inflight
+        )
+        registry.callback(
+            "wb_circuit_breaker_open",
+            "Whether the circuit breaker for a Bedrock target is open (1) or not (0)",
+            lambda: {
+                (target.key,): 1 if resilience.breaker.state == CircuitBreaker.OPEN else 0
+                for target, resilience in self.resilience.items()
+            },
+            labelnames=("target",)
+        )
+        if self.result_cache is not None:
+            cache = self.result_cache
+            registry.callback("wb_result_cache_hit_ratio", "Result cache hit ratio",
+                              lambda: cache.stats()["hit_ratio"])
+            registry.callback("wb_result_cache_lookups_total", "Result cache lookups by result",
+                              lambda: {("hit",): cache.hits, ("miss",): cache.misses},
+                              type_name="counter", labelnames=("result",))
+            registry.callback("wb_result_cache_entries", "Result cache entries",
+                              lambda: cache.stats()["entries"])
+        if self.single_flight is not None:
+            single_flight = self.single_flight
+            registry.callback("wb_single_flight_coalesced_total",
+                              "Requests served by joining an identical in-flight request",
+                              lambda: single_flight.coalesced, type_name="counter")
+    
+    def resilience_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get retry and breaker statistics per target
+
+        Returns:
+            Dictionary keyed by region/model_id
+        """
+        return {target.key: resilience.stats() for target, resilience in self.resilience.items()}
+
+    def warm(self):
+        """
+        Create transports for every routed region ahead of the first request
+        
+        Used in the Lambda init phase so client construction is not paid by
+        the first invocation.
+        """
+        regions = {target.region for route in self.router.routes for target in route.targets}
+        regions.update(route.fallback.region for route in self.router.routes if route.fallback)
+        for region in sorted(regions):
+            try:
+                self._get_transport(region)
+            except Exception as e:
+                self.logger.warning(f"Failed to pre-warm Bedrock transport for {region}: {type(e).__name__}")
+    
+    async def close(self):
+        """Release Bedrock transport resources"""
+        for transport in self.transports.values():
+            await transport.close()
@@ -0,0 +1,267 @@
+"""
+Model routing for Writers Block Service
+Maps action/tone/text-length buckets to Bedrock model + region targets and
+prefers the fastest healthy target based on rolling latency and error rates
+"""
+
+import json
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from ..core.config import settings
+from ..core.exceptions import ConfigurationError
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RouteTarget(NamedTuple):
+    """A Bedrock model in a specific region"""
+    model_id: str
+    region: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.region}/{self.model_id}"
+
+
+class TargetStats:
+    """
+    Rolling latency and error statistics for one target
+
+    The error rate also decays toward 0 with time (halving every
+    error_half_life seconds), so a demoted target that receives no traffic
+    becomes eligible again instead of staying demoted forever.
+    """
+
+    LATENCY_ALPHA = 0.2
+    ERROR_ALPHA = 0.1
+
+    __slots__ = ("latency_ms", "_error_rate", "_error_updated_at", "error_half_life",
+                 "inflight", "calls", "errors")
+
+    def __init__(self, error_half_life: float = 30.0):
+        self.latency_ms: Optional[float] = None
+        self._error_rate = 0.0
+        self._error_updated_at = time.monotonic()
+        self.error_half_life = error_half_life
+        self.inflight = 0
+        self.calls = 0
+        self.errors = 0
+
+    @property
+    def error_rate(self) -> float:
+        return self._decayed_error_rate(time.monotonic())
+
+    def record(self, latency_ms: Optional[float], success: bool):
+        self.calls += 1
+        if not success:
+            self.errors += 1
+        now = time.monotonic()
+        error_rate = self._decayed_error_rate(now)
+        self._error_rate = error_rate + self.ERROR_ALPHA * ((0.0 if success else 1.0) - error_rate)
+        self._error_updated_at = now
+        if success and latency_ms is not None:
+            if self.latency_ms is None:
+                self.latency_ms = latency_ms
+            else:
+                self.latency_ms += self.LATENCY_ALPHA * (latency_ms - self.latency_ms)
+
+    def _decayed_error_rate(self, now: float) -> float:
+        if self.error_half_life <= 0 or not self._error_rate:
+            return self._error_rate
+        return self._error_rate * 0.5 ** ((now - self._error_updated_at) / self.error_half_life)
+
+
+class Route:
+    """
+    One routing rule: match criteria plus preferred targets and a load fallback
+    """
+
+    def __init__(self, name: str, targets: List[RouteTarget],
+                 fallback: Optional[RouteTarget] = None, action: Optional[str] = None,
+                 tone: Optional[str] = None, custom_prompt: Optional[bool] = None,
+                 min_chars: int = 0, max_chars: Optional[int] = None):
+        if not targets:
+            raise ConfigurationError(f"Route '{name}' has no targets")
+        self.name = name
+        self.targets = targets
+        self.fallback = fallback
+        self.action = action
+        self.tone = tone
+        self.custom_prompt = custom_prompt
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+
+    def matches(self, action: str, parameters: Dict[str, str], text_length: int) -> bool:
+        """Check whether a request falls into this route's bucket"""
+        if self.action and self.action != action:
+            return False
+        if self.tone and self.tone != parameters.get("tone"):
+            return False
+        if self.custom_prompt is not None and self.custom_prompt != bool(parameters.get("custom_prompt")):
+            return False
+        if text_length < self.min_chars:
+            return False
+        if self.max_chars is not None and text_length > self.max_chars:
+            return False
+        return True
+
+    @classmethod
+    def from_config(cls, index: int, config: Dict[str, Any]) -> "Route":
+        """Build route from a routing table entry"""
+        def target(entry: Dict[str, str]) -> RouteTarget:
+            return RouteTarget(entry["model_id"], entry.get("region", settings.AWS_REGION))
+
+        fallback = config.get("fallback")
+        return cls(
+            name=config.get("name", f"route-{index}"),
+            targets=[target(entry) for entry in config.get("targets", [])],
+            fallback=target(fallback) if fallback else None,
+            action=config.get("action"),
+            tone=config.get("tone"),
+            custom_prompt=config.get("custom_prompt"),
+            min_chars=config.get("min_chars", 0),
+            max_chars=config.get("max_chars")
+        )
+
+
+def load_routes(table: Optional[str]) -> List[Route]:
+    """
+    Load routing table from JSON configuration
+
+    The default route (BEDROCK_MODEL_ID in AWS_REGION) is always appended so
+    every request has a target.
+
+    Args:
+        table: JSON list of route entries, or None/empty for the default route only
+
+    Returns:
+        Ordered list of routes (first match wins)
+    """
+    routes = []
+    if table:
+        try:
+            entries = json.loads(table)
+            routes = [Route.from_config(index, entry) for index, entry in enumerate(entries)]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ConfigurationError(f"Invalid MODEL_ROUTING_TABLE: {type(e).__name__}: {e}")
+
+    routes.append(Route("default", [RouteTarget(settings.BEDROCK_MODEL_ID, settings.AWS_REGION)]))
+    return routes
+
+
+class ModelRouter:
+    """
+    Latency-aware router across Bedrock model/region targets
+    """
+
+    def __init__(self, routes: List[Route], max_error_rate: float = 0.5,
+                 load_threshold: int = 0, error_half_life: float = 30.0):
+        self.routes = routes
+        self.max_error_rate = max_error_rate
+        self.load_threshold = load_threshold
+        self.error_half_life = error_half_life
+        self.inflight = 0
+        self._stats: Dict[RouteTarget, TargetStats] = {}
+
+    def match(self, action: str, parameters: Optional[Dict[str, str]], text_length: int) -> Route:
+        """
+        Find the route for a request
+
+        Args:
+            action: Action type (grammar_fix, rephrase)
+            parameters: Action parameters
+            text_length: Length of the text to process
+
+        Returns:
+            First matching route (the default route matches everything)
+        """
+        parameters = parameters or {}
+        for route in self.routes:
+            if route.matches(action, parameters, text_length):
+                return route
+        return self.routes[-1]
+
+    def candidates(self, route: Route, is_healthy=None) -> List[RouteTarget]:
+        """
+        Order a route's targets by preference
+
+        Healthy targets come first, fastest first (unmeasured targets are tried
+        early so they get measured). Under load the fallback target leads;
+        otherwise it is used after the healthy targets.
+
+        Args:
+            route: Matched route
+            is_healthy: Optional extra health check (e.g. circuit breaker state)
+
+        Returns:
+            Targets in the order they should be tried
+        """
+        healthy, unhealthy = [], []
+        for target in route.targets:
+            stats = self._stats.get(target)
+            ok = stats is None or stats.error_rate < self.max_error_rate
+            if ok and is_healthy is not None:
+                ok = is_healthy(target)
+            (healthy if ok else unhealthy).append(target)
+
+        healthy.sort(key=self._expected_latency)
+        ordered = healthy
+        if route.fallback and route.fallback not in route.targets:
+            if self.load_threshold and self.inflight >= self.load_threshold:
+                ordered = [route.fallback] + healthy
+            else:
+                ordered = healthy + [route.fallback]
+        return ordered + unhealthy
+
+    def begin(self, target: RouteTarget):
+        """Mark a call to target as started"""
+        self.inflight += 1
+        self._get_stats(target).inflight += 1
+
+    def end(self, target: RouteTarget, latency_ms: Optional[float], success: Optional[bool]):
+        """
+        Mark a call to target as finished and update rolling statistics
+
+        Args:
+            target: Target that served the call
+            latency_ms: Call latency (None when not comparable, e.g. streams)
+            success: Whether the call succeeded (None: cancelled, rejected by
+                the breaker or a client error - not recorded)
+        """
+        self.inflight -= 1
+        stats = self._get_stats(target)
+        stats.inflight -= 1
+        if success is not None:
+            stats.record(latency_ms, success)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-target routing statistics
+
+        Returns:
+            Dictionary keyed by region/model_id
+        """
+        return {
+            target.key: {
+                "latency_ms": round(stats.latency_ms, 1) if stats.latency_ms is not None else None,
+                "error_rate": round(stats.error_rate, 3),
+                "inflight": stats.inflight,
+                "calls": stats.calls,
+                "errors": stats.errors
+            }
+            for target, stats in self._stats.items()
+        }
+
+    def _expected_latency(self, target: RouteTarget) -> float:
+        stats = self._stats.get(target)
+        if stats is None or stats.latency_ms is None:
+            return 0.0
+        return stats.latency_ms
+
+    def _get_stats(self, target: RouteTarget) -> TargetStats:
+        stats = self._stats.get(target)
+        if stats is None:
+            stats = self._stats[target] = TargetStats(self.error_half_life)
+        return stats
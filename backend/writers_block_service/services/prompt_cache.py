@@ -0,0 +1,108 @@
+"""
+Prompt caching rules for Writers Block Service
+Per-model minimum cacheable prefix lengths and cache breakpoint filtering
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .token_budget import estimate_tokens
+
+# Minimum cacheable prefix (tokens) by model family, matched against the model
+# ID. A shorter prefix is processed uncached even when marked; models not
+# listed do not support prompt caching on Bedrock. More specific families first.
+MIN_CACHEABLE_TOKENS: List[Tuple[str, int]] = [
+    ("claude-3-5-haiku", 2048),
+    ("claude-haiku-4-5", 4096),
+    ("claude-opus-4-5", 4096),
+    ("claude-3-7-sonnet", 1024),
+    ("claude-sonnet-4", 1024),
+    ("claude-opus-4", 1024)
+]
+
+
+def min_cacheable_tokens(model_id: str) -> Optional[int]:
+    """
+    Get the minimum cacheable prefix length for a model
+
+    Args:
+        model_id: Bedrock model ID or inference profile ID
+
+    Returns:
+        Minimum prefix length in tokens, or None if the model cannot cache
+    """
+    for family, minimum in MIN_CACHEABLE_TOKENS:
+        if family in model_id:
+            return minimum
+    return None
+
+
+def cache_breakpoints(body: Dict[str, Any]) -> List[Tuple[Tuple[str, ...], int]]:
+    """
+    Find the cache breakpoints of a request body
+
+    The cached prefix of a breakpoint is everything before it in system then
+    messages order, including the marked block itself.
+
+    Args:
+        body: Anthropic messages request body
+
+    Returns:
+        List of (prefix block texts, estimated prefix tokens) per marked block
+    """
+    breakpoints = []
+    prefix: List[str] = []
+    tokens = 0
+    for content in [body.get("system")] + [m["content"] for m in body.get("messages", [])]:
+        blocks = content if isinstance(content, list) else [{"text": content or ""}]
+        for block in blocks:
+            text = block.get("text", "")
+            prefix.append(text)
+            tokens += estimate_tokens(text)
+            if "cache_control" in block:
+                breakpoints.append((tuple(prefix), tokens))
+    return breakpoints
+
+
+def for_model(body: Dict[str, Any], model_id: str) -> Dict[str, Any]:
+    """
+    Drop cache breakpoints a model would not cache
+
+    Breakpoints whose estimated prefix is shorter than the model's minimum
+    (or every breakpoint, if the model cannot cache) are unmarked, so the
+    request never pays for markers that cannot produce a cache hit.
+
+    Args:
+        body: Request body with candidate cache_control markers
+        model_id: Target model ID
+
+    Returns:
+        body itself when every breakpoint qualifies, otherwise a copy
+    """
+    minimum = min_cacheable_tokens(model_id)
+    breakpoints = cache_breakpoints(body)
+    if not breakpoints or (minimum is not None and breakpoints[0][1] >= minimum):
+        return body
+
+    keep = minimum is not None
+    tokens = 0
+
+    def unmark(content: Any) -> Any:
+        nonlocal tokens
+        if not isinstance(content, list):
+            tokens += estimate_tokens(content or "")
+            return content
+        blocks = []
+        for block in content:
+            tokens += estimate_tokens(block.get("text", ""))
+            if "cache_control" in block and not (keep and tokens >= minimum):
+                block = {key: value for key, value in block.items() if key != "cache_control"}
+            blocks.append(block)
+        return blocks
+
+    filtered = dict(body)
+    if "system" in body:
+        filtered["system"] = unmark(body["system"])
+    filtered["messages"] = [
+        {**message, "content": unmark(message["content"])} for message in body.get("messages", [])
+    ]
+    return filtered
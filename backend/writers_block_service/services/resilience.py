@@ -0,0 +1,373 @@
+"""
+Resilience layer for Bedrock calls
+Jittered retries per error class, a global retry budget and a circuit breaker
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, NamedTuple
+
+from ..core.exceptions import ServiceUnavailableError
+from ..core.logging import get_logger
+from ..core.request_context import record_stage
+
+logger = get_logger(__name__)
+
+
+class RetryPolicy(NamedTuple):
+    """Retry behaviour for one class of errors"""
+    max_retries: int
+    base_delay: float
+    counts_as_failure: bool  # Whether the error indicates Bedrock is degraded
+
+
+# Error class -> policy (max_retries is further capped by BEDROCK_MAX_RETRIES)
+RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    "throttling": RetryPolicy(max_retries=3, base_delay=0.5, counts_as_failure=True),
+    "transient": RetryPolicy(max_retries=2, base_delay=0.25, counts_as_failure=True),
+    "timeout": RetryPolicy(max_retries=1, base_delay=0.25, counts_as_failure=True),
+    "client": RetryPolicy(max_retries=0, base_delay=0.0, counts_as_failure=False),
+    "unknown": RetryPolicy(max_retries=0, base_delay=0.0, counts_as_failure=True)
+}
+
+THROTTLING_CODES = {"ThrottlingException", "TooManyRequestsException", "HTTP429"}
+TRANSIENT_CODES = {
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "ModelNotReadyException",
+    "ModelTimeoutException",
+    "HTTP500",
+    "HTTP502",
+    "HTTP503",
+    "HTTP504"
+}
+TIMEOUT_ERROR_NAMES = {
+    "ReadTimeoutError",
+    "ConnectTimeoutError",
+    "EndpointConnectionError",
+    "ConnectionClosedError",
+    "TimeoutError",
+    "ReadTimeout",
+    "ConnectTimeout",
+    "PoolTimeout",
+    "ConnectError",
+    "RemoteProtocolError"
+}
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Classify a Bedrock call failure for retry and breaker decisions
+
+    Args:
+        error: Exception raised by a transport
+
+    Returns:
+        Error class name (a key of RETRY_POLICIES)
+    """
+    from botocore.exceptions import ClientError
+
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "")
+        if code in THROTTLING_CODES:
+            return "throttling"
+        if code in TRANSIENT_CODES:
+            return "transient"
+        return "client"
+
+    if isinstance(error, asyncio.TimeoutError) or type(error).__name__ in TIMEOUT_ERROR_NAMES:
+        return "timeout"
+
+    return "unknown"
+
+
+class RetryBudget:
+    """
+    Global retry budget shared by all requests
+
+    Every request deposits `ratio` tokens and every retry spends one, so retries
+    stay a bounded fraction of traffic during incidents. A small per-second
+    floor keeps retries possible at low traffic.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 20.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._last_refill = time.monotonic()
+
+    def record_request(self):
+        """Deposit tokens for a new request"""
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Withdraw a token for a retry
+
+        Returns:
+            True if the retry is allowed
+        """
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.max_tokens, self._tokens + elapsed * self.min_per_second)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for Bedrock calls
+
+    closed: calls pass; consecutive failures are counted
+    open: calls fail fast until reset_seconds have elapsed
+    half_open: a single probe call decides whether to close or re-open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed
+
+        Returns:
+            False while the breaker is open (fail fast)
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            self._transition(self.HALF_OPEN)
+
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+
+        return True
+
+    def record_success(self):
+        """Record a successful call"""
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def record_failure(self):
+        """Record a failed call that indicates Bedrock is degraded"""
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self.state != self.OPEN:
+                self.opened_count += 1
+                self._transition(self.OPEN)
+
+    def release_probe(self):
+        """Release a half-open probe slot without a verdict (e.g. client error)"""
+        self._probe_in_flight = False
+
+    def _transition(self, state: str):
+        logger.warning(
+            f"Bedrock circuit breaker {self.state} -> {state} "
+            f"(consecutive_failures={self.consecutive_failures})"
+        )
+        self.state = state
+
+
+class BedrockResilience:
+    """
+    Retry and circuit breaker policy around Bedrock transport calls
+    """
+
+    def __init__(self, max_retries: int = 3, max_delay: float = 4.0,
+                 retry_budget: RetryBudget = None, breaker: CircuitBreaker = None):
+        self.max_retries = max_retries
+        self.max_delay = max_delay
+        self.retry_budget = retry_budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+
+        self.retries = 0
+        self.retries_denied = 0
+        self.rejected = 0
+
+    async def call(self, fn: Callable[[], Awaitable[Any]],
+                   on_retry: Callable[[], None] = None) -> Any:
+        """
+        Run a Bedrock call with retries and circuit breaking
+
+        The breaker sees one outcome per call, after its retries, so a request
+        that recovers on retry never counts as a failure.
+
+        Args:
+            fn: Coroutine factory performing one attempt
+            on_retry: Optional callback invoked before each retry
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            ServiceUnavailableError: While the circuit breaker is open
+        """
+        probe = self._admit()
+        settled = False
+        try:
+            attempt = 0
+            while True:
+                try:
+                    result = await fn()
+                except Exception as e:
+                    await self._before_retry(e, attempt)
+                    attempt += 1
+                    if on_retry:
+                        on_retry()
+                    continue
+                self.breaker.record_success()
+                settled = True
+                return result
+        finally:
+            if probe and not settled:
+                # Cancelled or abandoned before a verdict: let the next call probe
+                self.breaker.release_probe()
+
+    async def stream(self, factory: Callable[[], AsyncIterator[Any]],
+                     on_retry: Callable[[], None] = None) -> AsyncIterator[Any]:
+        """
+        Run a streaming Bedrock call with retries until the first event arrives
+
+        Once output has started flowing a failure is not retried, since the
+        caller has already forwarded partial output.
+
+        Args:
+            factory: Callable returning a fresh event iterator per attempt
+            on_retry: Optional callback invoked before each retry
+
+        Yields:
+            Stream events
+        """
+        probe = self._admit()
+        settled = False
+        try:
+            attempt = 0
+            while True:
+                iterator = factory().__aiter__()
+                try:
+                    first = await iterator.__anext__()
+                except StopAsyncIteration:
+                    self.breaker.record_success()
+                    settled = True
+                    return
+                except Exception as e:
+                    await self._before_retry(e, attempt)
+                    attempt += 1
+                    if on_retry:
+                        on_retry()
+                    continue
+                break
+
+            yield first
+            try:
+                async for event in iterator:
+                    yield event
+            except Exception as e:
+                self._record_outcome(e)
+                settled = True
+                raise
+            self.breaker.record_success()
+            settled = True
+        finally:
+            if probe and not settled:
+                # Closed by the consumer (client disconnect) or cancelled mid-stream
+                self.breaker.release_probe()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get resilience statistics
+
+        Returns:
+            Breaker state and retry counters
+        """
+        return {
+            "breaker_state": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "breaker_opened": self.breaker.opened_count,
+            "retries": self.retries,
+            "retries_denied": self.retries_denied,
+            "rejected": self.rejected,
+            "retry_budget_available": round(self.retry_budget.available, 2)
+        }
+
+    def _admit(self) -> bool:
+        """
+        Fail fast while the breaker is open
+
+        Returns:
+            True if this call is the half-open probe
+        """
+        if not self.breaker.allow_request():
+            self.rejected += 1
+            raise ServiceUnavailableError("Bedrock circuit breaker is open")
+        self.retry_budget.record_request()
+        return self.breaker.state == CircuitBreaker.HALF_OPEN
+
+    def _record_outcome(self, error: Exception) -> RetryPolicy:
+        """Update breaker for a failed attempt and return the matching policy"""
+        error_class = classify_error(error)
+        policy = RETRY_POLICIES[error_class]
+        if policy.counts_as_failure:
+            self.breaker.record_failure()
+        else:
+            self.breaker.release_probe()
+        return policy
+
+    async def _before_retry(self, error: Exception, attempt: int):
+        """
+        Decide whether to retry a failed attempt; re-raise or sleep with jitter
+
+        The breaker outcome is recorded only when the call gives up, so a
+        call counts as at most one failure however many attempts it made.
+        """
+        policy = RETRY_POLICIES[classify_error(error)]
+
+        give_up = attempt >= min(policy.max_retries, self.max_retries)
+        # A half-open probe gets one attempt; an open breaker stops retries
+        give_up = give_up or self.breaker.state != CircuitBreaker.CLOSED
+        if not give_up and not self.retry_budget.try_spend():
+            self.retries_denied += 1
+            give_up = True
+        if give_up:
+            self._record_outcome(error)
+            raise error
+
+        # Full jitter: uniform in [0, min(max_delay, base * 2^attempt)]
+        delay = random.uniform(0, min(self.max_delay, policy.base_delay * (2 ** attempt)))
+        self.retries += 1
+        logger.info(
+            f"Retrying Bedrock call after {type(error).__name__} "
+            f"(attempt {attempt + 1}, delay {delay:.2f}s)"
+        )
+        record_stage("retry_backoff", delay * 1000)
+        await asyncio.sleep(delay)
@@ -0,0 +1,157 @@
+"""
+In-process result cache for LLM text processing
+Bounded LRU cache with per-entry TTL and an approximate memory cap
+"""
+
+import hashlib
+import sys
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache key computation
+
+    Only cosmetic differences are removed (unicode form, line endings and
+    surrounding whitespace) so that the cached output stays valid for the input.
+
+    Args:
+        text: Raw user text
+
+    Returns:
+        Normalized text
+    """
+    normalized = unicodedata.normalize("NFC", text)
+    normalized = normalized.replace("\r\n", "\n").replace("\r", "\n")
+    return normalized.strip()
+
+
+class ResultCache:
+    """
+    LRU + TTL cache for processed text results
+    Never stores failures - callers only cache successful LLM output
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600,
+                 max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        # key -> (value, expires_at, size_bytes)
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(text: str, action: str, parameters: Optional[Dict[str, str]],
+                 model_id: str) -> str:
+        """
+        Build cache key from everything that influences the LLM output
+
+        Args:
+            text: Text to process
+            action: Action type (grammar_fix, rephrase)
+            parameters: Action parameters (tone or custom_prompt)
+            model_id: Bedrock model identifier
+
+        Returns:
+            Hex digest cache key (user content is never kept in the key)
+        """
+        parameters = parameters or {}
+        custom_prompt = parameters.get("custom_prompt")
+        if custom_prompt:
+            variant = "prompt:" + hashlib.sha256(custom_prompt.encode()).hexdigest()
+        else:
+            variant = "tone:" + (parameters.get("tone") or "")
+
+        digest = hashlib.sha256()
+        for part in (model_id, action, variant, normalize_text(text)):
+            digest.update(part.encode())
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached text, or None on miss or expiry
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: str):
+        """
+        Store a successful result, evicting least recently used entries as needed
+
+        Args:
+            key: Cache key from make_key
+            value: Processed text
+        """
+        size = sys.getsizeof(value) + sys.getsizeof(key)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds, size)
+        self._current_bytes += size
+
+        while (len(self._entries) > self.max_entries
+               or self._current_bytes > self.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all cached entries (counters are kept)"""
+        self._entries.clear()
+        self._current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with size, memory and hit/miss counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._current_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def _remove(self, key: str):
+        """Remove entry and release its memory accounting"""
+        _, _, size = self._entries.pop(key)
+        self._current_bytes -= size
@@ -0,0 +1,116 @@
+"""
+Single-flight coalescing for identical in-flight LLM requests
+Concurrent duplicates share one invocation instead of each paying for their own
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into a single shared task
+
+    The shared task is shielded from its callers, so a cancelled caller (e.g. a
+    client that disconnected) never cancels the work other callers are awaiting.
+    Results of calls made with an idempotency key are retained for a short
+    window so client retries can attach to the original request.
+    """
+
+    def __init__(self, retain_seconds: float = 300, max_retained: int = 1024):
+        self.retain_seconds = retain_seconds
+        self.max_retained = max_retained
+
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # idempotency_key -> (request key, result, expires_at)
+        self._retained: "OrderedDict[str, Tuple[str, Any, float]]" = OrderedDict()
+
+        self.leaders = 0
+        self.coalesced = 0
+        self.replayed = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]],
+                 idempotency_key: Optional[str] = None) -> Any:
+        """
+        Run fn once per key, sharing its result with concurrent callers
+
+        Args:
+            key: Request key identifying identical work
+            fn: Coroutine factory performing the work
+            idempotency_key: Optional client-supplied key for retry replay
+
+        Returns:
+            Result of the shared call
+        """
+        if idempotency_key:
+            retained = self._get_retained(idempotency_key, key)
+            if retained is not None:
+                self.replayed += 1
+                return retained
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._on_done(key, done))
+        else:
+            self.coalesced += 1
+
+        result = await asyncio.shield(task)
+
+        if idempotency_key:
+            self._retain(idempotency_key, key, result)
+        return result
+
+    def is_inflight(self, key: str) -> bool:
+        """Check whether work for a key is currently running"""
+        return key in self._inflight
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dictionary with in-flight, leader, coalesced and replayed counts
+        """
+        return {
+            "inflight": len(self._inflight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "replayed": self.replayed,
+            "retained": len(self._retained)
+        }
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        """Forget finished task and mark its exception as retrieved"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def _get_retained(self, idempotency_key: str, key: str) -> Optional[Any]:
+        """Get retained result if it belongs to the same request and has not expired"""
+        entry = self._retained.get(idempotency_key)
+        if entry is None:
+            return None
+
+        retained_key, result, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._retained[idempotency_key]
+            return None
+        if retained_key != key:
+            # Same idempotency key reused for different content - do not replay
+            return None
+        return result
+
+    def _retain(self, idempotency_key: str, key: str, result: Any):
+        """Retain result for client retries, bounded by max_retained"""
+        if self.retain_seconds <= 0:
+            return
+        self._retained[idempotency_key] = (key, result, time.monotonic() + self.retain_seconds)
+        self._retained.move_to_end(idempotency_key)
+        while len(self._retained) > self.max_retained:
+            self._retained.popitem(last=False)
@@ -0,0 +1,63 @@
+"""
+Token budget planning for Bedrock requests
+Sizes max_tokens from the input length and action instead of a fixed reservation
+"""
+
+import math
+from typing import Dict, Optional
+
+from ..core.config import settings
+
+# Expected output/input token ratio per request kind
+OUTPUT_RATIOS = {
+    "grammar_fix": 1.2,      # Corrections stay close to the input length
+    "rephrase": 1.6,         # Tones may expand the text somewhat
+    "custom_prompt": 2.5     # Custom instructions can ask for longer output
+}
+
+# Fixed headroom for short inputs and response framing
+OUTPUT_HEADROOM_TOKENS = 64
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate token count for text
+
+    Uses ~4 characters per token for ASCII, which tracks Claude tokenization
+    for English, and 1 token per non-ASCII character. CJK text takes about one
+    token per character; accented Latin, Cyrillic and Greek take fewer, so
+    they are over-estimated (the safe direction for output budgets).
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    if text.isascii():
+        return math.ceil(len(text) / 4)
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / 4) + len(text) - ascii_chars
+
+
+def plan_max_tokens(text: str, action: str, parameters: Optional[Dict[str, str]] = None) -> int:
+    """
+    Plan max_tokens for a request
+
+    Args:
+        text: Text being processed
+        action: Action type (grammar_fix, rephrase)
+        parameters: Action parameters (custom prompts get a larger budget)
+
+    Returns:
+        max_tokens clamped to [TOKEN_BUDGET_MIN, TOKEN_BUDGET_MAX]
+    """
+    kind = action
+    if action == "rephrase" and parameters and parameters.get("custom_prompt"):
+        kind = "custom_prompt"
+
+    ratio = OUTPUT_RATIOS.get(kind, OUTPUT_RATIOS["custom_prompt"])
+    budget = math.ceil(estimate_tokens(text) * ratio) + OUTPUT_HEADROOM_TOKENS
+    return max(settings.TOKEN_BUDGET_MIN, min(budget, settings.TOKEN_BUDGET_MAX))
@@ -0,0 +1,105 @@
+"""
+Sentence-aware text chunking for long selections
+Splits text at paragraph, then sentence, then word boundaries and keeps the
+original separators so processed chunks can be reassembled in order
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+# Paragraph break: a newline followed by optional whitespace and another newline
+PARAGRAPH_SPLIT = re.compile(r'(\n\s*\n)')
+
+# Sentence end followed by whitespace (separator is captured)
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?…])(\s+)')
+
+WORD_SPLIT = re.compile(r'(\s+)')
+
+Chunk = Tuple[str, str]
+
+
+def _pairs(parts: List[str]) -> List[Chunk]:
+    """Turn re.split output with captured separators into (text, separator) pairs"""
+    pairs = []
+    for i in range(0, len(parts), 2):
+        separator = parts[i + 1] if i + 1 < len(parts) else ""
+        if parts[i] or separator:
+            pairs.append((parts[i], separator))
+    return pairs
+
+
+def _split_oversized(text: str, separator: str, max_chars: int) -> List[Chunk]:
+    """Split a single unit that is larger than max_chars into smaller units"""
+    if len(text) <= max_chars:
+        return [(text, separator)]
+
+    sentences = _pairs(SENTENCE_SPLIT.split(text))
+    if len(sentences) > 1:
+        units = []
+        for sentence, sentence_sep in sentences:
+            units.extend(_split_oversized(sentence, sentence_sep, max_chars))
+        units[-1] = (units[-1][0], units[-1][1] + separator)
+        return units
+
+    words = _pairs(WORD_SPLIT.split(text))
+    if len(words) > 1:
+        units = []
+        for word, word_sep in words:
+            units.extend(_split_oversized(word, word_sep, max_chars))
+        units[-1] = (units[-1][0], units[-1][1] + separator)
+        return units
+
+    # Single word longer than max_chars - hard cut
+    pieces = [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+    units = [(piece, "") for piece in pieces]
+    units[-1] = (units[-1][0], separator)
+    return units
+
+
+def split_text(text: str, max_chars: int) -> List[Chunk]:
+    """
+    Split text into chunks of at most max_chars at natural boundaries
+
+    Args:
+        text: Text to split
+        max_chars: Maximum characters per chunk (excluding trailing separator)
+
+    Returns:
+        List of (chunk_text, trailing_separator) tuples; joining every chunk
+        with its separator reproduces the original text
+    """
+    units: List[Chunk] = []
+    for paragraph, separator in _pairs(PARAGRAPH_SPLIT.split(text)):
+        units.extend(_split_oversized(paragraph, separator, max_chars))
+
+    chunks: List[Chunk] = []
+    current: Optional[str] = None
+    current_sep = ""
+    for unit, separator in units:
+        if current is None:
+            current, current_sep = unit, separator
+        elif len(current) + len(current_sep) + len(unit) > max_chars:
+            chunks.append((current, current_sep))
+            current, current_sep = unit, separator
+        else:
+            current = current + current_sep + unit
+            current_sep = separator
+
+    if current is not None:
+        chunks.append((current, current_sep))
+
+    return chunks
+
+
+def join_chunks(processed: List[str], separators: List[str]) -> str:
+    """
+    Reassemble processed chunks with their original separators
+
+    Args:
+        processed: Processed chunk texts, in order
+        separators: Trailing separators from split_text, in order
+
+    Returns:
+        Reassembled text
+    """
+    return "".join(chunk + separator for chunk, separator in zip(processed, separators))
@@ -0,0 +1,110 @@
+"""
+User-agent classification for Writers Block Service
+Browser, version and platform from a User-Agent string in one regex pass, memoized
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional
+
+UNKNOWN = "unknown"
+
+# Browser tokens -> browser. Chromium-based browsers also carry "Chrome/" and
+# "Safari/", so the winner is picked by BROWSER_PRECEDENCE, not by position.
+_BROWSER_TOKENS = {
+    "Edg": "Edge",
+    "EdgA": "Edge",
+    "EdgiOS": "Edge",
+    "Edge": "Edge",
+    "OPR": "Opera",
+    "Opera": "Opera",
+    "Firefox": "Firefox",
+    "FxiOS": "Firefox",
+    "Chrome": "Chrome",
+    "CriOS": "Chrome",
+    "Safari": "Safari",
+    "Version": "Version"
+}
+BROWSER_PRECEDENCE = ("Edge", "Opera", "Firefox", "Chrome", "Safari")
+
+# Platform tokens -> platform. Android UAs contain "Linux" and iOS UAs contain
+# "Mac OS X", so the more specific platform wins.
+_PLATFORM_TOKENS = {
+    "Windows": "Windows",
+    "Android": "Android",
+    "iPhone": "iOS",
+    "iPad": "iOS",
+    "iPod": "iOS",
+    "CrOS": "ChromeOS",
+    "Macintosh": "macOS",
+    "Mac OS X": "macOS",
+    "Linux": "Linux"
+}
+PLATFORM_PRECEDENCE = ("Windows", "Android", "iOS", "ChromeOS", "macOS", "Linux")
+
+# One pass over the string finds every token. Tokens follow a space, "(" or
+# ";" (the string is scanned with a leading space); a literal prefix is much
+# cheaper for the regex engine to reject than a word boundary.
+_UA_PATTERN = re.compile(
+    r"[ (;](?:"
+    r"(" + "|".join(sorted(map(re.escape, _BROWSER_TOKENS), key=len, reverse=True)) +
+    r")/(\d+(?:\.\d+)?)"
+    r"|(" + "|".join(sorted(map(re.escape, _PLATFORM_TOKENS), key=len, reverse=True)) + r")\b"
+    r")"
+)
+
+
+class UserAgentInfo(NamedTuple):
+    """Classified user agent (immutable, so cached results can be shared)"""
+    browser: str = UNKNOWN
+    version: str = UNKNOWN
+    platform: str = UNKNOWN
+
+    def as_log_fields(self) -> Dict[str, str]:
+        """Fields for structured log entries"""
+        return {"browser": self.browser, "browser_version": self.version, "platform": self.platform}
+
+
+UNKNOWN_USER_AGENT = UserAgentInfo()
+
+
+@lru_cache(maxsize=512)
+def _classify(user_agent: str) -> UserAgentInfo:
+    versions: Dict[str, str] = {}
+    platforms = set()
+    for match in _UA_PATTERN.finditer(" " + user_agent):
+        token = match.group(1)
+        if token is not None:
+            versions.setdefault(_BROWSER_TOKENS[token], match.group(2))
+        else:
+            platforms.add(_PLATFORM_TOKENS[match.group(3)])
+
+    browser, version = UNKNOWN, UNKNOWN
+    for name in BROWSER_PRECEDENCE:
+        if name in versions:
+            browser = name
+            # Safari's own version is in "Version/"; "Safari/" is the WebKit build
+            version = versions.get("Version", versions[name]) if name == "Safari" else versions[name]
+            break
+
+    platform = next((name for name in PLATFORM_PRECEDENCE if name in platforms), UNKNOWN)
+    return UserAgentInfo(browser, version, platform)
+
+
+def classify_user_agent(user_agent: Optional[str]) -> UserAgentInfo:
+    """
+    Classify a User-Agent string
+
+    Results are memoized on the full string; clients send few distinct
+    user agents, so repeated lookups are a dict hit.
+
+    Args:
+        user_agent: User-Agent header value (may be None)
+
+    Returns:
+        UserAgentInfo with browser, major.minor version and platform
+        ("unknown" for anything not recognized)
+    """
+    if not user_agent:
+        return UNKNOWN_USER_AGENT
+    return _classify(user_agent)